@@ -31,11 +31,15 @@ class Settings(BaseSettings):
 
     # Video compression settings
     compress_uploads: bool = True  # Compress uploaded videos to H.264 ~4Mbps
+    keep_audio: bool = False  # Audio is unused by the pipeline; drop it by default
 
     # Modal settings (GPU-accelerated landmark extraction)
     use_modal: bool = False  # Enable Modal for landmark extraction
     modal_target_height: int = 960  # Downscale frames before inference
 
+    # Analysis result cache (shared across workers)
+    analysis_db_path: str = "data/analysis.db"
+
     # Share / viral features
     share_db_path: str = "data/shares.db"
     share_image_cache_dir: str = "data/share_images"
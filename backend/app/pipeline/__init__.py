@@ -11,6 +11,7 @@ import os
 import time
 
 import cv2
+import orjson
 
 from .models import PipelineError, VideoNotFoundError
 from .landmark_extractor import extract_landmarks_from_video, GOLF_LANDMARKS
@@ -29,7 +30,7 @@ LANDMARK_ROUND_DECIMALS = 4
 
 # Bump this when landmark extraction or rounding logic changes.
 # Cached landmarks with an older version are treated as stale and re-extracted.
-LANDMARK_CACHE_VERSION = 2
+LANDMARK_CACHE_VERSION = 3
 
 
 def _round_landmarks(landmarks_data: dict, decimals: int = LANDMARK_ROUND_DECIMALS) -> dict:
@@ -85,8 +86,9 @@ def _load_cached_landmarks(video_path: str) -> dict | None:
     if not os.path.exists(cache_path):
         return None
     try:
-        with open(cache_path) as f:
-            data = json.load(f)
+        # orjson parses the multi-MB landmark file several times faster
+        with open(cache_path, "rb") as f:
+            data = orjson.loads(f.read())
 
         # Reject stale caches from before IMAGE mode / rounding changes
         cached_version = data.get("_cache_version", 0)
@@ -104,7 +106,7 @@ def _load_cached_landmarks(video_path: str) -> dict | None:
             f"(v{cached_version}, {detected}/{total} frames detected)"
         )
         return data
-    except (json.JSONDecodeError, OSError) as e:
+    except (orjson.JSONDecodeError, OSError) as e:
         logger.warning(f"Failed to load landmark cache {cache_path}: {e}")
         return None
 
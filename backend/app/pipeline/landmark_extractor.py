@@ -108,6 +108,7 @@ def extract_landmarks_from_video(
 
     all_landmarks = []
     detected_count = 0
+    sampled_count = 0
 
     with PoseLandmarker.create_from_options(options) as landmarker:
         frame_idx = 0
@@ -128,6 +129,7 @@ def extract_landmarks_from_video(
 
             # Only run inference on sampled frames
             if frame_idx % frame_step == 0:
+                sampled_count += 1
                 rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
                 mp_image = mp.Image(
                     image_format=mp.ImageFormat.SRGB, data=rgb_frame
@@ -142,9 +144,9 @@ def extract_landmarks_from_video(
 
                     for idx, lm in enumerate(landmarks):
                         frame_data["landmarks"][LANDMARK_NAMES[idx]] = {
-                            "x": round(lm.x, 6),
-                            "y": round(lm.y, 6),
-                            "z": round(lm.z, 6),
+                            "x": round(lm.x, 5),
+                            "y": round(lm.y, 5),
+                            "z": round(lm.z, 5),
                             "visibility": round(lm.visibility, 4),
                             "pixel_x": int(lm.x * width),
                             "pixel_y": int(lm.y * height),
@@ -156,7 +158,6 @@ def extract_landmarks_from_video(
     cap.release()
 
     # Calculate detection rate (only among sampled frames)
-    sampled_count = len([f for f in all_landmarks if f["frame"] % frame_step == 0])
     detection_rate = detected_count / sampled_count if sampled_count > 0 else 0
 
     logger.info(
@@ -4,13 +4,41 @@ Supports both parallel dual-video extraction (DTL + FO simultaneously)
 and single-video extraction. Falls back gracefully if Modal is unavailable.
 """
 
+import gzip
 import logging
 
+import orjson
+
 from .models import LandmarkExtractionError
 
 logger = logging.getLogger(__name__)
 
 
+def _get_extract_fn():
+    """Look up the deployed extractor's method.
+
+    The worker is a Modal class so warm containers keep the pose model
+    loaded between calls.
+    """
+    import modal
+
+    extractor_cls = modal.Cls.from_name(
+        "pure-landmark-extractor", "LandmarkExtractor"
+    )
+    return extractor_cls().extract_landmarks
+
+
+def _decode_result(result: dict) -> dict:
+    """Unpack the worker's gzip-compressed JSON result.
+
+    Error dicts (and results from workers deployed before compression was
+    added) arrive uncompressed and are returned as-is.
+    """
+    if "compressed" not in result:
+        return result
+    return orjson.loads(gzip.decompress(result["compressed"]))
+
+
 def extract_landmarks_single_modal(
     video_bytes: bytes,
     frame_step: int = 2,
@@ -32,19 +60,17 @@ def extract_landmarks_single_modal(
         LandmarkExtractionError: If detection rate is too low after retry.
         Exception: If Modal call fails for any other reason.
     """
-    import modal
-
-    extract_fn = modal.Function.from_name(
-        "pure-landmark-extractor", "extract_landmarks"
-    )
+    extract_fn = _get_extract_fn()
 
     logger.info(f"Sending video to Modal ({len(video_bytes)/1e6:.1f}MB)...")
 
-    result = extract_fn.remote(
-        video_bytes=video_bytes,
-        frame_step=frame_step,
-        min_detection_rate=min_detection_rate,
-        target_height=target_height,
+    result = _decode_result(
+        extract_fn.remote(
+            video_bytes=video_bytes,
+            frame_step=frame_step,
+            min_detection_rate=min_detection_rate,
+            target_height=target_height,
+        )
     )
 
     # Retry once with lower threshold if detection rate too low
@@ -54,11 +80,13 @@ def extract_landmarks_single_modal(
             f"Detection rate {result.get('detection_rate', 0)}% "
             f"below threshold, retrying with {retry_rate}..."
         )
-        result = extract_fn.remote(
-            video_bytes=video_bytes,
-            frame_step=frame_step,
-            min_detection_rate=retry_rate,
-            target_height=target_height,
+        result = _decode_result(
+            extract_fn.remote(
+                video_bytes=video_bytes,
+                frame_step=frame_step,
+                min_detection_rate=retry_rate,
+                target_height=target_height,
+            )
         )
 
     if "error" in result:
@@ -95,12 +123,8 @@ def extract_landmarks_parallel_modal(
         LandmarkExtractionError: If detection rate is too low for either video.
         Exception: If Modal call fails for any other reason.
     """
-    import modal
-
     # Look up the deployed Modal function
-    extract_fn = modal.Function.from_name(
-        "pure-landmark-extractor", "extract_landmarks"
-    )
+    extract_fn = _get_extract_fn()
 
     logger.info(
         f"Sending videos to Modal (DTL={len(dtl_bytes)/1e6:.1f}MB, "
@@ -122,8 +146,8 @@ def extract_landmarks_parallel_modal(
     )
 
     # Wait for both to complete
-    dtl_result = dtl_call.get()
-    fo_result = fo_call.get()
+    dtl_result = _decode_result(dtl_call.get())
+    fo_result = _decode_result(fo_call.get())
 
     # Check for extraction errors — retry failed videos once with lower threshold
     dtl_failed = "error" in dtl_result
@@ -157,9 +181,9 @@ def extract_landmarks_parallel_modal(
             )
 
         if dtl_failed:
-            dtl_result = dtl_call.get()
+            dtl_result = _decode_result(dtl_call.get())
         if fo_failed:
-            fo_result = fo_call.get()
+            fo_result = _decode_result(fo_call.get())
 
     # Final error check after possible retry
     if "error" in dtl_result:
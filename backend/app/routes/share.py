@@ -14,6 +14,7 @@ from app.models.schemas import ShareRequest, ShareResponse
 from app.storage.analysis_store import get_result
 from app.storage.share_store import (
     create_share,
+    expires_at_iso,
     get_share,
     get_shares_for_upload,
     revoke_share,
@@ -52,7 +53,7 @@ async def create_share_token(
             return ShareResponse(
                 share_token=token,
                 share_url=f"{settings.public_base_url}/shared/{token}",
-                expires_at=share.get("expires_at"),
+                expires_at=expires_at_iso(share.get("expires_at")),
             )
 
     # Create new share token
@@ -1,35 +1,39 @@
 import logging
 import uuid
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, Request
 
 from app.auth import require_user
 from app.config import settings
 from app.models.schemas import FileInfo, UploadResponse
 from app.analytics import identify_user, track_upload_completed
-from app.storage.local import save_upload
+from app.storage.local import (
+    ReceivedUpload,
+    UploadTooLargeError,
+    receive_upload,
+    save_upload,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-def _validate_file(file: UploadFile, label: str) -> None:
-    if file.content_type not in settings.allowed_content_types:
+def _validate_file(upload: ReceivedUpload, label: str) -> None:
+    if upload.path is None:
+        raise HTTPException(422, f"{label}: Video file is required.")
+    if upload.content_type not in settings.allowed_content_types:
         raise HTTPException(
             400,
-            f"{label}: Invalid file type '{file.content_type}'. Accepted: .mp4, .mov",
+            f"{label}: Invalid file type '{upload.content_type}'. Accepted: .mp4, .mov",
         )
-    if not file.filename:
+    if not upload.filename:
         raise HTTPException(400, f"{label}: Filename is required.")
 
 
-@router.post("/upload", response_model=UploadResponse)
-async def upload_videos(
-    swing_type: str = Form(...),
-    view: str = Form(...),
-    video: UploadFile = File(...),
-    current_user=Depends(require_user),
-):
+def _validate_fields(swing_type: str | None, view: str | None) -> None:
+    if swing_type is None or view is None:
+        raise HTTPException(422, "Form fields 'swing_type' and 'view' are required.")
+
     # Validate swing type
     if swing_type not in settings.allowed_swing_types:
         raise HTTPException(
@@ -44,8 +48,34 @@ async def upload_videos(
             f"Invalid view '{view}'. Must be 'dtl' or 'fo'.",
         )
 
-    # Validate file
-    _validate_file(video, f"video_{view}")
+
+@router.post("/upload", response_model=UploadResponse)
+async def upload_videos(
+    request: Request,
+    current_user=Depends(require_user),
+):
+    """Accept a multipart upload (swing_type, view, video).
+
+    The body is parsed as it streams in so the video is written to disk
+    exactly once instead of going through UploadFile's spool file.
+    """
+    upload_id = str(uuid.uuid4())
+
+    try:
+        upload = await receive_upload(request, upload_id)
+    except UploadTooLargeError as e:
+        raise HTTPException(413, str(e))
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+    swing_type = upload.fields.get("swing_type")
+    view = upload.fields.get("view")
+    try:
+        _validate_fields(swing_type, view)
+        _validate_file(upload, f"video_{view}")
+    except HTTPException:
+        upload.discard()
+        raise
 
     # Identify user in Segment (once per process lifetime)
     identify_user(current_user.user_id, {
@@ -54,11 +84,9 @@ async def upload_videos(
         "last_name": getattr(current_user, "last_name", None),
     })
 
-    # Generate upload ID and save
-    upload_id = str(uuid.uuid4())
     logger.info(f"Upload {upload_id} by user {current_user.user_id} (view={view})")
 
-    filename, size = await save_upload(upload_id, view, video)
+    filename, size = await save_upload(upload_id, view, upload)
 
     track_upload_completed(
         user_id=current_user.user_id,
@@ -66,7 +94,7 @@ async def upload_videos(
         view=view,
         swing_type=swing_type,
         file_size_bytes=size,
-        content_type=video.content_type or "video/mp4",
+        content_type=upload.content_type or "video/mp4",
     )
 
     return UploadResponse(
@@ -77,7 +105,7 @@ async def upload_videos(
             view: FileInfo(
                 filename=filename,
                 size_bytes=size,
-                content_type=video.content_type or "video/mp4",
+                content_type=upload.content_type or "video/mp4",
             ),
         },
         message=f"Video uploaded successfully. Call POST /api/analyze/{upload_id} to run analysis.",
@@ -15,6 +15,11 @@ from app.paths import REFERENCE_DATA_DIR
 
 router = APIRouter()
 
+# Cap on bytes served by a single range response.  Browsers request
+# "bytes=0-" and follow up with further ranges, so bounding each response
+# keeps one request from pinning a worker for an entire file.
+MAX_RANGE_BYTES = 16 * 1024 * 1024  # 16 MiB
+
 
 def _stream_file(path: Path, start: int, end: int, chunk_size: int = 64 * 1024):
     """Generator that yields file chunks for a byte range."""
@@ -30,6 +35,43 @@ def _stream_file(path: Path, start: int, end: int, chunk_size: int = 64 * 1024):
             yield data
 
 
+def _parse_range(range_header: str, file_size: int) -> tuple[int, int]:
+    """Parse a "bytes=START-END" header into an inclusive (start, end) pair.
+
+    Supports open-ended ("bytes=100-") and suffix ("bytes=-500") forms.
+    The returned range is clamped to the file and to MAX_RANGE_BYTES.
+
+    Raises:
+        HTTPException: 400 if the header is malformed, 416 if the range
+            cannot be satisfied for this file.
+    """
+    unit, _, range_spec = range_header.partition("=")
+    parts = range_spec.split("-")
+    if unit.strip() != "bytes" or len(parts) != 2:
+        raise HTTPException(400, "Malformed Range header")
+
+    try:
+        if parts[0]:
+            start = int(parts[0])
+            end = int(parts[1]) if parts[1] else file_size - 1
+        else:
+            # Suffix range: the last N bytes of the file
+            start = max(file_size - int(parts[1]), 0)
+            end = file_size - 1
+    except ValueError:
+        raise HTTPException(400, "Malformed Range header")
+
+    if start < 0 or start >= file_size or end < start:
+        raise HTTPException(
+            416,
+            "Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{file_size}"},
+        )
+
+    end = min(end, file_size - 1, start + MAX_RANGE_BYTES - 1)
+    return start, end
+
+
 def _serve_video(file_path: Path, request: Request):
     """Serve a video file with range request support."""
     if not file_path.exists():
@@ -41,12 +83,7 @@ def _serve_video(file_path: Path, request: Request):
     range_header = request.headers.get("range")
 
     if range_header:
-        # Parse "bytes=START-END"
-        range_spec = range_header.replace("bytes=", "")
-        parts = range_spec.split("-")
-        start = int(parts[0]) if parts[0] else 0
-        end = int(parts[1]) if parts[1] else file_size - 1
-        end = min(end, file_size - 1)
+        start, end = _parse_range(range_header, file_size)
         content_length = end - start + 1
 
         return StreamingResponse(
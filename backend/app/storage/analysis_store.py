@@ -1,24 +1,38 @@
-"""In-memory cache for analysis results."""
+"""Two-tier cache for analysis results.
+
+L1 is a per-process dict for the hot path; L2 is a shared SQLite database
+(see sqlite_cache) so every uvicorn worker sees the same results and they
+survive restarts.
+"""
 
 import logging
 
+from app.storage import sqlite_cache
+
 logger = logging.getLogger(__name__)
 
-# Simple in-memory store: upload_id → analysis result dict
+# L1 in-memory store: upload_id → analysis result dict
 _results: dict[str, dict] = {}
 
 
 def save_result(upload_id: str, result: dict) -> None:
-    """Cache an analysis result."""
+    """Cache an analysis result in both tiers."""
     _results[upload_id] = result
+    sqlite_cache.put(upload_id, result)
     logger.info(f"Cached analysis result for {upload_id}")
 
 
 def get_result(upload_id: str) -> dict | None:
     """Retrieve a cached analysis result, or None if not found."""
-    return _results.get(upload_id)
+    result = _results.get(upload_id)
+    if result is None:
+        result = sqlite_cache.get(upload_id)
+        if result is not None:
+            # Promote to L1 so subsequent lookups stay in-process
+            _results[upload_id] = result
+    return result
 
 
 def has_result(upload_id: str) -> bool:
     """Check if we have a cached result for this upload."""
-    return upload_id in _results
+    return upload_id in _results or sqlite_cache.contains(upload_id)
@@ -1,41 +1,223 @@
 import hashlib
 import logging
+from dataclasses import dataclass, field
 from pathlib import Path
 
-from fastapi import UploadFile
+from fastapi import Request
+from multipart.multipart import MultipartParser, parse_options_header
 
 from app.config import settings
-from app.video.compress import compress_video, is_ffmpeg_available
+from app.video.compress import compress_video_async, is_ffmpeg_available
 
 logger = logging.getLogger(__name__)
 
+# Text form fields (swing_type, view) are a few bytes; anything past this is
+# rejected instead of being buffered in memory.
+MAX_FIELD_BYTES = 64 * 1024
+# Number of text fields accepted per request (Starlette's form parser default)
+MAX_FIELDS = 1000
+
+
+class UploadRejectedError(ValueError):
+    """The multipart body parsed, but its contents are not accepted."""
+
+
+class UploadTooLargeError(UploadRejectedError):
+    """A non-file form field exceeded MAX_FIELD_BYTES."""
+
+
+@dataclass
+class ReceivedUpload:
+    """A multipart upload whose file part has been streamed to disk."""
+
+    fields: dict[str, str] = field(default_factory=dict)
+    filename: str | None = None
+    content_type: str | None = None
+    path: Path | None = None
+    size: int = 0
+    content_hash: str = ""
+
+    def discard(self) -> None:
+        """Delete the streamed file (e.g. when validation fails)."""
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+
+class _UploadSink:
+    """python-multipart callbacks that write the file part straight to disk.
+
+    Starlette's UploadFile spools the body into a SpooledTemporaryFile
+    which we would then copy to its final path — two full writes of every
+    video.  Here the file part is written once, hashed on the fly, and
+    only the small text fields (capped at MAX_FIELD_BYTES) are buffered in
+    memory. A second file part, file parts under any other field name, and
+    more than MAX_FIELDS text fields are rejected.
+    """
+
+    def __init__(self, upload_id: str, file_field: str):
+        self.upload_id = upload_id
+        self.file_field = file_field
+        self.received = ReceivedUpload()
+        self._hasher = hashlib.sha256()
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: dict[bytes, bytes] = {}
+        self._name: str | None = None
+        self._value = bytearray()
+        self._file = None
+        self._field_count = 0
+        self.complete = False
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+        self._name = None
+        self._value = bytearray()
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(
+            self._headers.get(b"content-disposition", b"")
+        )
+        self._name = options.get(b"name", b"").decode("latin-1")
+        filename = options.get(b"filename")
+        if filename is not None and self._name != self.file_field:
+            raise UploadRejectedError(f"Unexpected file field '{self._name}'.")
+        if self._name == self.file_field and filename is not None:
+            received = self.received
+            if received.path is not None:
+                raise UploadRejectedError(
+                    f"More than one file sent in field '{self._name}'."
+                )
+            received.filename = filename.decode("utf-8", "replace")
+            content_type = self._headers.get(b"content-type")
+            received.content_type = content_type.decode("latin-1") if content_type else None
+            ext = Path(received.filename).suffix or ".mp4"
+            received.path = settings.upload_dir / f"{self.upload_id}_incoming{ext}"
+            self._file = open(received.path, "wb")
+        else:
+            self._field_count += 1
+            if self._field_count > MAX_FIELDS:
+                raise UploadRejectedError(
+                    f"Too many form fields (limit {MAX_FIELDS})."
+                )
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        chunk = data[start:end]
+        if self._file is not None:
+            self._file.write(chunk)
+            self._hasher.update(chunk)
+            self.received.size += len(chunk)
+        else:
+            if len(self._value) + len(chunk) > MAX_FIELD_BYTES:
+                raise UploadTooLargeError(
+                    f"Form field '{self._name}' exceeds {MAX_FIELD_BYTES} bytes."
+                )
+            self._value += chunk
+
+    def on_part_end(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        elif self._name:
+            self.received.fields[self._name] = self._value.decode("utf-8", "replace")
+
+    def on_end(self) -> None:
+        self.complete = True
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.received.content_hash = self._hasher.hexdigest()
+
+
+async def receive_upload(
+    request: Request, upload_id: str, file_field: str = "video"
+) -> ReceivedUpload:
+    """Stream a multipart/form-data request body to disk.
+
+    The part named ``file_field`` is written to
+    ``{upload_id}_incoming{ext}`` in the upload directory while it is
+    being received; all other parts are returned as text fields.
+
+    Raises:
+        UploadTooLargeError: If a text field exceeds MAX_FIELD_BYTES.
+        UploadRejectedError: If a file is sent under another field name,
+            more than one file is sent, or there are more than MAX_FIELDS
+            text fields.
+        ValueError: If the body is not multipart/form-data, is malformed,
+            or ends before the closing boundary.
+    """
+    content_type, params = parse_options_header(
+        request.headers.get("content-type", "")
+    )
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise ValueError("Expected a multipart/form-data request body.")
+
+    settings.upload_dir.mkdir(parents=True, exist_ok=True)
+
+    sink = _UploadSink(upload_id, file_field)
+    parser = MultipartParser(
+        boundary,
+        {
+            "on_part_begin": sink.on_part_begin,
+            "on_part_data": sink.on_part_data,
+            "on_part_end": sink.on_part_end,
+            "on_header_field": sink.on_header_field,
+            "on_header_value": sink.on_header_value,
+            "on_header_end": sink.on_header_end,
+            "on_headers_finished": sink.on_headers_finished,
+            "on_end": sink.on_end,
+        },
+    )
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+        parser.finalize()
+        if not sink.complete:
+            # finalize() accepts a body that stops mid-part
+            raise ValueError("body ended before the closing boundary")
+    except Exception as e:
+        sink.close()
+        sink.received.discard()
+        if isinstance(e, UploadRejectedError):
+            raise
+        raise ValueError(f"Malformed multipart body: {e}") from e
+
+    sink.close()
+    return sink.received
+
 
 async def save_upload(
-    upload_id: str, angle: str, file: UploadFile
+    upload_id: str, angle: str, upload: ReceivedUpload
 ) -> tuple[str, int]:
-    """Save an uploaded file to local storage, compressing if possible.
+    """Move a streamed upload into place, compressing if possible.
 
     Returns (filename, size_bytes) of the final stored file.
     """
-    settings.upload_dir.mkdir(parents=True, exist_ok=True)
-
-    ext = Path(file.filename).suffix if file.filename else ".mp4"
+    ext = upload.path.suffix
     raw_filename = f"{upload_id}_{angle}{ext}"
     raw_filepath = settings.upload_dir / raw_filename
 
-    # Step 1: Write raw upload to disk
-    raw_size = 0
-    hasher = hashlib.sha256()
-    with open(raw_filepath, "wb") as f:
-        while chunk := await file.read(1024 * 1024):  # 1MB chunks
-            f.write(chunk)
-            hasher.update(chunk)
-            raw_size += len(chunk)
+    # Step 1: Move the streamed file to its per-view name (a rename, not a copy)
+    upload.path.rename(raw_filepath)
+    raw_size = upload.size
 
     # Step 1b: Save SHA-256 hash of raw video for cross-upload deduplication.
     # The hash is computed BEFORE compression so identical source videos
     # always produce the same hash, regardless of ffmpeg non-determinism.
-    content_hash = hasher.hexdigest()
+    content_hash = upload.content_hash
     hash_filepath = settings.upload_dir / f"{upload_id}_{angle}_hash.txt"
     hash_filepath.write_text(content_hash)
     logger.info(f"Content hash for {raw_filename}: {content_hash[:16]}...")
@@ -54,7 +236,7 @@ async def save_upload(
     # Handle edge case: input is already .mp4 (same path as output)
     if raw_filepath == final_filepath:
         temp_path = settings.upload_dir / f"{upload_id}_{angle}_compressing.mp4"
-        if compress_video(raw_filepath, temp_path):
+        if await compress_video_async(raw_filepath, temp_path):
             raw_filepath.unlink()           # delete original
             temp_path.rename(final_filepath) # move compressed into place
             final_size = final_filepath.stat().st_size
@@ -72,7 +254,7 @@ async def save_upload(
             return raw_filename, raw_size
     else:
         # Input is .MOV or other extension — compress to .mp4
-        if compress_video(raw_filepath, final_filepath):
+        if await compress_video_async(raw_filepath, final_filepath):
             raw_filepath.unlink()  # delete original .MOV
             final_size = final_filepath.stat().st_size
             logger.info(
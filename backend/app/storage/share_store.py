@@ -5,10 +5,16 @@ accessed without authentication.
 """
 
 import logging
+import os
+import queue
+import secrets
 import sqlite3
-import uuid
-from datetime import datetime, timedelta, timezone
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterator
 
 from app.config import settings
 
@@ -16,6 +22,46 @@ logger = logging.getLogger(__name__)
 
 _DB_PATH: Path | None = None
 
+# Connection pool: a single writer serialised by a lock, plus a queue of
+# reader connections.  Connections live for the lifetime of the process
+# instead of being opened and closed on every request.
+_READ_POOL_SIZE = os.cpu_count() or 4
+_write_conn: sqlite3.Connection | None = None
+_write_lock = threading.Lock()
+_read_pool: "queue.Queue[sqlite3.Connection] | None" = None
+_pool_lock = threading.Lock()
+
+_MS_PER_DAY = 86_400_000
+
+_CREATE_SHARES = """
+    CREATE TABLE IF NOT EXISTS shares (
+        share_token  TEXT PRIMARY KEY,
+        upload_id    TEXT NOT NULL,
+        view         TEXT NOT NULL,
+        created_at   TEXT NOT NULL,
+        expires_at   INTEGER,
+        is_public    INTEGER DEFAULT 1,
+        user_id      TEXT
+    )
+"""
+
+# Hot-path statements, kept as module constants so every call hands sqlite3
+# the same string and hits the per-connection prepared-statement cache.
+_Q_INSERT = """
+    INSERT INTO shares (share_token, upload_id, view, created_at, expires_at, is_public, user_id)
+    VALUES (?, ?, ?, ?, ?, 1, ?)
+"""
+_Q_SELECT = """
+    SELECT * FROM shares
+    WHERE share_token = ? AND is_public = 1
+      AND (expires_at IS NULL OR expires_at > ?)
+"""
+_Q_REVOKE = "UPDATE shares SET is_public = 0 WHERE share_token = ?"
+_Q_LIST = (
+    "SELECT * FROM shares WHERE upload_id = ? AND is_public = 1 "
+    "ORDER BY created_at DESC"
+)
+
 
 def _get_db_path() -> Path:
     global _DB_PATH
@@ -24,43 +70,195 @@ def _get_db_path() -> Path:
     return _DB_PATH
 
 
-def _connect() -> sqlite3.Connection:
-    """Open a connection with row-factory for dict-like access."""
-    conn = sqlite3.connect(str(_get_db_path()))
+def _is_memory_db() -> bool:
+    return str(_get_db_path()) == ":memory:"
+
+
+def _connect(read_only: bool = False) -> sqlite3.Connection:
+    """Open a connection with row-factory for dict-like access.
+
+    synchronous/temp_store/cache_size are per-connection settings, so they
+    are applied on every open; journal_mode=WAL persists in the database
+    file once init_db() has set it.
+
+    Read-only connections are opened via a ``mode=ro&cache=shared`` URI so
+    all pooled readers share one page cache. The writer keeps a private
+    cache, and WAL gives readers a committed snapshot, so read_uncommitted
+    only relaxes table locks between the readers themselves.
+    """
+    if read_only:
+        database = f"{_get_db_path().resolve().as_uri()}?mode=ro&cache=shared"
+    else:
+        database = str(_get_db_path())
+    # Autocommit mode: writers issue BEGIN IMMEDIATE/COMMIT explicitly.
+    conn = sqlite3.connect(
+        database,
+        check_same_thread=False,
+        isolation_level=None,
+        cached_statements=32,
+        uri=read_only,
+    )
     conn.row_factory = sqlite3.Row
+    if read_only:
+        conn.execute("PRAGMA read_uncommitted=1")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")  # ~64MB page cache
     return conn
 
 
+def _open_pool() -> None:
+    """(Re)open the writer and reader connections for the current path."""
+    global _write_conn, _read_pool
+    _close_pool()
+    _write_conn = _connect()
+    if not _is_memory_db():
+        # Each :memory: connection is a separate database, so in-memory
+        # stores read through the writer connection instead.
+        pool: queue.Queue[sqlite3.Connection] = queue.Queue()
+        for _ in range(_READ_POOL_SIZE):
+            pool.put(_connect(read_only=True))
+        _read_pool = pool
+
+
+def _close_pool() -> None:
+    global _write_conn, _read_pool
+    if _write_conn is not None:
+        _write_conn.close()
+        _write_conn = None
+    if _read_pool is not None:
+        while not _read_pool.empty():
+            _read_pool.get_nowait().close()
+        _read_pool = None
+
+
+def _ensure_pool() -> None:
+    if _write_conn is None:
+        with _pool_lock:
+            if _write_conn is None:
+                _open_pool()
+
+
+@contextmanager
+def _acquire_write() -> Iterator[sqlite3.Connection]:
+    """Yield the writer connection inside a BEGIN IMMEDIATE transaction.
+
+    Commits on normal exit and rolls back if the block raises.
+    """
+    _ensure_pool()
+    with _write_lock:
+        conn = _write_conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+@contextmanager
+def _acquire_read() -> Iterator[sqlite3.Connection]:
+    """Yield a pooled reader connection and return it to the pool on exit."""
+    _ensure_pool()
+    pool = _read_pool
+    if pool is None:
+        with _acquire_write() as conn:
+            yield conn
+        return
+    conn = pool.get()
+    try:
+        yield conn
+    finally:
+        pool.put(conn)
+
+
 def init_db() -> None:
-    """Create the shares table if it doesn't exist.
+    """Create the shares table if it doesn't exist and open the pool.
 
     Called once at application startup.
     """
     db_path = _get_db_path()
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-
-    conn = _connect()
+    if not _is_memory_db():
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with _pool_lock:
+        _close_pool()
+        conn = _connect()
+        try:
+            if not _is_memory_db():
+                # WAL: one fsync per commit and readers never block on writers
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_CREATE_SHARES)
+            _migrate_expires_at(conn)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_shares_upload ON shares(upload_id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_shares_token_public "
+                "ON shares(share_token, is_public, expires_at)"
+            )
+        except BaseException:
+            conn.close()
+            raise
+        if _is_memory_db():
+            # Keep the connection that owns the schema as the writer
+            global _write_conn
+            _write_conn = conn
+        else:
+            conn.close()
+            _open_pool()
+    logger.info(f"Share store initialised at {db_path}")
+
+
+def _migrate_expires_at(conn: sqlite3.Connection) -> None:
+    """Convert a legacy ISO-8601 TEXT expires_at column to INTEGER Unix ms.
+
+    SQLite can't change a column's type in place, so the table is rebuilt
+    (indexes are recreated by init_db afterwards).
+    """
+    # Check the column type under the write lock: several workers run
+    # init_db() at once, and only the first may rebuild the table.
+    conn.execute("BEGIN IMMEDIATE")
     try:
+        columns = {
+            row["name"]: row["type"]
+            for row in conn.execute("PRAGMA table_info(shares)")
+        }
+        if columns.get("expires_at", "").upper() != "TEXT":
+            conn.execute("COMMIT")
+            return
+
+        logger.info("Migrating shares.expires_at from ISO text to Unix ms")
+        conn.execute("ALTER TABLE shares RENAME TO shares_legacy")
+        conn.execute(_CREATE_SHARES)
         conn.execute(
             """
-            CREATE TABLE IF NOT EXISTS shares (
-                share_token  TEXT PRIMARY KEY,
-                upload_id    TEXT NOT NULL,
-                view         TEXT NOT NULL,
-                created_at   TEXT NOT NULL,
-                expires_at   TEXT,
-                is_public    INTEGER DEFAULT 1,
-                user_id      TEXT
-            )
+            INSERT INTO shares
+            SELECT share_token, upload_id, view, created_at,
+                   CAST(ROUND((julianday(expires_at) - 2440587.5) * 86400000) AS INTEGER),
+                   is_public, user_id
+            FROM shares_legacy
             """
         )
-        conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_shares_upload ON shares(upload_id)"
-        )
-        conn.commit()
-        logger.info(f"Share store initialised at {db_path}")
-    finally:
-        conn.close()
+        conn.execute("DROP TABLE shares_legacy")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def expires_at_iso(expires_at: int | None) -> str | None:
+    """Format a stored expires_at (Unix ms) as an ISO-8601 UTC string."""
+    if expires_at is None:
+        return None
+    return datetime.fromtimestamp(expires_at / 1000, tz=timezone.utc).isoformat()
+
+
+def close_db() -> None:
+    """Close all pooled connections. Called at application shutdown."""
+    with _pool_lock:
+        _close_pool()
 
 
 def create_share(
@@ -78,29 +276,42 @@ def create_share(
         expires_days: Days until expiry. None = permanent.
 
     Returns:
-        The UUID share token string.
+        The URL-safe share token string.
     """
-    token = uuid.uuid4().hex
-    now = datetime.now(timezone.utc)
-    expires_at = (
-        (now + timedelta(days=expires_days)).isoformat() if expires_days else None
-    )
+    return create_shares_bulk([(upload_id, view, user_id, expires_days)])[0]
 
-    conn = _connect()
-    try:
-        conn.execute(
-            """
-            INSERT INTO shares (share_token, upload_id, view, created_at, expires_at, is_public, user_id)
-            VALUES (?, ?, ?, ?, ?, 1, ?)
-            """,
-            (token, upload_id, view, now.isoformat(), expires_at, user_id),
+
+def create_shares_bulk(
+    records: list[tuple[str, str, str | None, int | None]],
+) -> list[str]:
+    """Create several share tokens in a single transaction.
+
+    Args:
+        records: ``(upload_id, view, user_id, expires_days)`` tuples, with
+            the same meaning as the create_share() arguments.
+
+    Returns:
+        The new share tokens, in the same order as ``records``.
+    """
+    now = datetime.now(timezone.utc)
+    created_at = now.isoformat()
+    now_ms = int(now.timestamp() * 1000)
+    tokens: list[str] = []
+    rows = []
+    for upload_id, view, user_id, expires_days in records:
+        token = secrets.token_urlsafe(16)
+        expires_at = (
+            now_ms + expires_days * _MS_PER_DAY if expires_days else None
         )
-        conn.commit()
-        logger.info(f"Created share token {token[:8]}... for {upload_id}/{view}")
-    finally:
-        conn.close()
+        tokens.append(token)
+        rows.append((token, upload_id, view, created_at, expires_at, user_id))
 
-    return token
+    with _acquire_write() as conn:
+        conn.executemany(_Q_INSERT, rows)
+
+    for token, upload_id, view, *_ in rows:
+        logger.info(f"Created share token {token[:8]}... for {upload_id}/{view}")
+    return tokens
 
 
 def get_share(share_token: str) -> dict | None:
@@ -113,54 +324,23 @@ def get_share(share_token: str) -> dict | None:
 
     Otherwise returns None.
     """
-    conn = _connect()
-    try:
-        row = conn.execute(
-            "SELECT * FROM shares WHERE share_token = ?", (share_token,)
-        ).fetchone()
-
-        if row is None:
-            return None
+    # expires_at is stored as Unix ms, so expiry is a plain integer compare
+    now = time.time_ns() // 1_000_000
+    with _acquire_read() as conn:
+        row = conn.execute(_Q_SELECT, (share_token, now)).fetchone()
 
-        share = dict(row)
-
-        # Check revocation
-        if not share["is_public"]:
-            return None
-
-        # Check expiry
-        if share["expires_at"]:
-            expires = datetime.fromisoformat(share["expires_at"])
-            if datetime.now(timezone.utc) > expires:
-                return None
-
-        return share
-    finally:
-        conn.close()
+    return dict(row) if row is not None else None
 
 
 def revoke_share(share_token: str) -> bool:
     """Revoke a share token. Returns True if a row was updated."""
-    conn = _connect()
-    try:
-        cursor = conn.execute(
-            "UPDATE shares SET is_public = 0 WHERE share_token = ?",
-            (share_token,),
-        )
-        conn.commit()
-        return cursor.rowcount > 0
-    finally:
-        conn.close()
+    with _acquire_write() as conn:
+        cursor = conn.execute(_Q_REVOKE, (share_token,))
+    return cursor.rowcount > 0
 
 
 def get_shares_for_upload(upload_id: str) -> list[dict]:
     """List all active share tokens for a given upload."""
-    conn = _connect()
-    try:
-        rows = conn.execute(
-            "SELECT * FROM shares WHERE upload_id = ? AND is_public = 1 ORDER BY created_at DESC",
-            (upload_id,),
-        ).fetchall()
-        return [dict(r) for r in rows]
-    finally:
-        conn.close()
+    with _acquire_read() as conn:
+        rows = conn.execute(_Q_LIST, (upload_id,)).fetchall()
+    return [dict(r) for r in rows]
@@ -0,0 +1,106 @@
+"""SQLite-backed L2 cache for analysis results.
+
+The in-process dict in analysis_store is only visible to the worker that
+computed a result.  Running uvicorn with several workers (or restarting the
+server) would otherwise lose cached analyses, so results are also written
+to a small SQLite database in WAL mode that every worker on the box shares.
+"""
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+import orjson
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_conn: sqlite3.Connection | None = None
+_lock = threading.Lock()
+
+
+def _get_db_path() -> Path:
+    return Path(settings.analysis_db_path)
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Open the shared connection on first use and create the table."""
+    global _conn
+    if _conn is None:
+        db_path = _get_db_path()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            str(db_path), isolation_level=None, check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS analysis (
+                upload_id  TEXT PRIMARY KEY,
+                payload    BLOB NOT NULL
+            )
+            """
+        )
+        _conn = conn
+        logger.info(f"Analysis cache initialised at {db_path}")
+    return _conn
+
+
+def init_db() -> None:
+    """Open the cache database eagerly. Called once at application startup."""
+    with _lock:
+        _get_conn()
+
+
+def close() -> None:
+    """Close the shared connection (used on shutdown and in tests)."""
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+
+
+def put(upload_id: str, result: dict) -> None:
+    """Store (or replace) a serialised analysis result."""
+    # OPT_NON_STR_KEYS stringifies int keys the way json.dumps did
+    payload = orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS)
+    try:
+        with _lock:
+            _get_conn().execute(
+                "INSERT OR REPLACE INTO analysis (upload_id, payload) VALUES (?, ?)",
+                (upload_id, payload),
+            )
+    except sqlite3.Error as e:
+        logger.warning(f"Failed to persist analysis result {upload_id}: {e}")
+
+
+def get(upload_id: str) -> dict | None:
+    """Fetch a stored analysis result, or None if not present."""
+    try:
+        with _lock:
+            row = _get_conn().execute(
+                "SELECT payload FROM analysis WHERE upload_id = ?", (upload_id,)
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.warning(f"Failed to read analysis result {upload_id}: {e}")
+        return None
+    if row is None:
+        return None
+    return orjson.loads(row[0])
+
+
+def contains(upload_id: str) -> bool:
+    """Check whether a result is stored for this key."""
+    try:
+        with _lock:
+            row = _get_conn().execute(
+                "SELECT 1 FROM analysis WHERE upload_id = ?", (upload_id,)
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.warning(f"Failed to query analysis cache for {upload_id}: {e}")
+        return False
+    return row is not None
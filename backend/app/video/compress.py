@@ -4,21 +4,196 @@ Compresses uploaded videos to H.264 1080p ~4Mbps for reduced storage
 and faster streaming. Falls back gracefully if ffmpeg is not installed.
 """
 
+import asyncio
+import json
 import logging
 import shutil
 import subprocess
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
 
+from app.config import settings
+
 logger = logging.getLogger(__name__)
 
+# Resolved once per process instead of walking PATH on every upload
+_FFMPEG_BIN = shutil.which("ffmpeg")
+_FFPROBE_BIN = shutil.which("ffprobe")
+
+# Inputs already within these limits are remuxed instead of re-encoded
+_COPY_MAX_DIMENSION = 1920
+_COPY_MAX_BITRATE = 4_500_000
+
+# Hardware H.264 encoders in order of preference, with their rate-control
+# args. libx264 (software) is the fallback and is always tried last.
+_ENCODER_ARGS: dict[str, list[str]] = {
+    "h264_videotoolbox": ["-b:v", "4M", "-maxrate", "6M"],
+    "h264_nvenc": ["-preset", "p4", "-rc", "vbr", "-cq", "23", "-b:v", "4M", "-maxrate", "6M"],
+    "h264_qsv": ["-b:v", "4M", "-maxrate", "6M"],
+    "libx264": ["-preset", "fast", "-b:v", "4M", "-maxrate", "6M", "-bufsize", "8M"],
+}
+
 
 def is_ffmpeg_available() -> bool:
     """Check if ffmpeg is installed and accessible on PATH."""
-    return shutil.which("ffmpeg") is not None
+    return _FFMPEG_BIN is not None
+
+
+def _encoder_works(encoder: str) -> bool:
+    """Encode one blank frame to check the encoder has a usable device.
+
+    Distro ffmpeg builds list h264_nvenc/h264_qsv even on hosts with no
+    GPU or driver, so being listed by ``-encoders`` isn't enough.
+    """
+    try:
+        result = subprocess.run(
+            [
+                _FFMPEG_BIN, "-hide_banner", "-loglevel", "error",
+                "-f", "lavfi", "-i", "nullsrc=s=256x256",
+                "-frames:v", "1",
+                "-c:v", encoder,
+                "-f", "null", "-",
+            ],
+            capture_output=True,
+            timeout=10,
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return False
+    return result.returncode == 0
+
+
+@lru_cache(maxsize=1)
+def detect_hw_encoder() -> str:
+    """Pick the fastest working H.264 encoder this ffmpeg build offers.
+
+    Runs ``ffmpeg -encoders`` plus a one-frame test encode per listed
+    hardware encoder, once per process, and caches the answer.
+    """
+    if _FFMPEG_BIN is None:
+        return "libx264"
+    try:
+        result = subprocess.run(
+            [_FFMPEG_BIN, "-hide_banner", "-encoders"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        available = result.stdout
+    except (subprocess.TimeoutExpired, OSError):
+        available = ""
+    for encoder in _ENCODER_ARGS:
+        if encoder != "libx264" and f" {encoder} " in available:
+            if _encoder_works(encoder):
+                logger.info("Using hardware encoder %s", encoder)
+                return encoder
+            logger.info("Hardware encoder %s is listed but unusable", encoder)
+    return "libx264"
+
+
+def _encode_cmd(
+    input_path: Path, output_path: Path, encoder: str, audio_args: list[str]
+) -> list[str]:
+    """Build the re-encode command for the given H.264 encoder."""
+    return [
+        _FFMPEG_BIN,
+        "-y",                       # overwrite output if exists
+        "-i", str(input_path),      # input file
+        "-vsync", "vfr",            # normalize VFR timing metadata (no frame dup/drop)
+        "-c:v", encoder,            # H.264 video codec
+        *_ENCODER_ARGS[encoder],    # encoder-specific rate control
+        "-vf", "scale='if(gte(iw,ih),min(1920,iw),-2)':'if(gte(iw,ih),-2,min(1920,ih))'",  # cap longest side at 1920, preserve orientation
+        *audio_args,                # drop, copy or re-encode audio
+        "-movflags", "+faststart",  # moov atom at start for HTTP streaming
+        str(output_path),
+    ]
+
+
+def _probe_stream(input_path: Path, selector: str, entries: str) -> dict | None:
+    """Run ffprobe on one stream and return its entries as a dict.
+
+    Returns None if ffprobe is missing, fails, or the stream doesn't exist.
+    """
+    if _FFPROBE_BIN is None:
+        return None
+    cmd = [
+        _FFPROBE_BIN,
+        "-v", "error",
+        "-select_streams", selector,
+        "-show_entries", entries,
+        "-of", "json",
+        str(input_path),
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+        if result.returncode != 0:
+            return None
+        streams = json.loads(result.stdout).get("streams") or []
+        return streams[0] if streams else None
+    except (subprocess.TimeoutExpired, ValueError, OSError) as e:
+        logger.warning("ffprobe failed for %s: %s", input_path, e)
+        return None
+
+
+def probe_video(input_path: Path) -> dict | None:
+    """Read codec, size, bitrate and frame rates of the first video stream via ffprobe."""
+    return _probe_stream(
+        input_path,
+        "v:0",
+        "stream=codec_name,width,height,bit_rate,r_frame_rate,avg_frame_rate",
+    )
+
+
+def probe_audio_codec(input_path: Path) -> str | None:
+    """Return the codec name of the first audio stream, if any."""
+    stream = _probe_stream(input_path, "a:0", "stream=codec_name")
+    return stream.get("codec_name") if stream else None
+
+
+def audio_args(input_path: Path) -> list[str]:
+    """ffmpeg audio options for the re-encode path.
+
+    Audio is unused by the analysis pipeline, so it is dropped unless
+    ``settings.keep_audio`` is set; kept AAC tracks are copied as-is.
+    """
+    if not settings.keep_audio:
+        return ["-an"]
+    if probe_audio_codec(input_path) == "aac":
+        return ["-c:a", "copy"]
+    return ["-c:a", "aac", "-b:a", "128k"]
+
+
+def can_stream_copy(stream: dict | None) -> bool:
+    """True if a probed video stream is already H.264 within size/bitrate caps.
+
+    Variable-frame-rate streams (r_frame_rate != avg_frame_rate, common
+    from phones) are re-encoded so ``-vsync vfr`` can normalise their
+    timing; a remux would carry the timestamps over unchanged.
+    """
+    if not stream or stream.get("codec_name") != "h264":
+        return False
+    r_frame_rate = stream.get("r_frame_rate")
+    if not r_frame_rate or r_frame_rate != stream.get("avg_frame_rate"):
+        return False
+    try:
+        longest = max(int(stream["width"]), int(stream["height"]))
+        bit_rate = int(stream["bit_rate"])
+    except (KeyError, TypeError, ValueError):
+        return False
+    return longest <= _COPY_MAX_DIMENSION and bit_rate <= _COPY_MAX_BITRATE
 
 
 def compress_video(input_path: Path, output_path: Path) -> bool:
-    """Compress a video to H.264 1080p ~4Mbps.
+    """Compress a video to H.264 1080p ~4Mbps (blocking).
+
+    Thin wrapper around compress_video_async() for scripts and CLI use;
+    request handlers should await the async version directly.
+    """
+    return asyncio.run(compress_video_async(input_path, output_path))
+
+
+async def compress_video_async(input_path: Path, output_path: Path) -> bool:
+    """Compress a video to H.264 1080p ~4Mbps without blocking the event loop.
 
     Args:
         input_path: Path to the raw uploaded video file.
@@ -31,44 +206,78 @@ def compress_video(input_path: Path, output_path: Path) -> bool:
         logger.warning("ffmpeg not found on PATH — skipping compression")
         return False
 
-    cmd = [
-        "ffmpeg",
-        "-y",                       # overwrite output if exists
-        "-i", str(input_path),      # input file
-        "-vsync", "vfr",            # normalize VFR timing metadata (no frame dup/drop)
-        "-c:v", "libx264",          # H.264 video codec
-        "-preset", "fast",          # speed/quality tradeoff
-        "-b:v", "4M",               # target video bitrate
-        "-maxrate", "6M",           # cap peak bitrate
-        "-bufsize", "8M",           # VBV buffer size
-        "-vf", "scale='if(gte(iw,ih),min(1920,iw),-2)':'if(gte(iw,ih),-2,min(1920,ih))'",  # cap longest side at 1920, preserve orientation
-        "-c:a", "aac",              # AAC audio codec
-        "-b:a", "128k",             # audio bitrate
-        "-movflags", "+faststart",  # moov atom at start for HTTP streaming
-        str(output_path),
-    ]
+    if can_stream_copy(await asyncio.to_thread(probe_video, input_path)):
+        # Already compliant: remux only (no decode/encode)
+        logger.info("Input already H.264 within limits — stream copying")
+        cmd = [
+            _FFMPEG_BIN,
+            "-y",
+            "-i", str(input_path),
+            "-c", "copy",
+            *([] if settings.keep_audio else ["-an"]),
+            "-movflags", "+faststart",
+            str(output_path),
+        ]
+        if await _run_ffmpeg(cmd, output_path):
+            return True
+        logger.warning("Stream copy failed — re-encoding instead")
 
+    encoder = await asyncio.to_thread(detect_hw_encoder)
+    audio = await asyncio.to_thread(audio_args, input_path)
+    if await _run_ffmpeg(_encode_cmd(input_path, output_path, encoder, audio), output_path):
+        return True
+    if encoder != "libx264":
+        # Encoder compiled in but no usable device — retry in software
+        logger.warning("%s failed — falling back to libx264", encoder)
+        return await _run_ffmpeg(
+            _encode_cmd(input_path, output_path, "libx264", audio), output_path
+        )
+    return False
+
+
+async def _run_ffmpeg(cmd: list[str], output_path: Path) -> bool:
+    """Run an ffmpeg command, cleaning up partial output on failure.
+
+    Only the last few stderr lines are kept, so a long encode never
+    buffers its whole log in memory.
+    """
+    # Only real errors on stderr, no per-frame progress lines
+    cmd = [cmd[0], "-loglevel", "error", "-nostats", *cmd[1:]]
+    tail: deque[str] = deque(maxlen=20)
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=120,  # 2-minute safety timeout
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
         )
-        if result.returncode != 0:
-            logger.error(
-                "ffmpeg failed (rc=%d): %s",
-                result.returncode,
-                result.stderr[-500:] if result.stderr else "(no stderr)",
-            )
-            return False
-        return True
-    except subprocess.TimeoutExpired:
+    except Exception as e:
+        logger.error("ffmpeg execution error: %s", e)
+        output_path.unlink(missing_ok=True)
+        return False
+
+    async def read_stderr() -> None:
+        async for line in proc.stderr:
+            tail.append(line.decode(errors="replace"))
+
+    reader = asyncio.create_task(read_stderr())
+    try:
+        returncode = await asyncio.wait_for(proc.wait(), timeout=120)  # 2-minute safety timeout
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
         logger.error("ffmpeg timed out after 120 seconds")
         # Clean up partial output
         output_path.unlink(missing_ok=True)
         return False
-    except Exception as e:
-        logger.error("ffmpeg execution error: %s", e)
+    finally:
+        await reader
+
+    if returncode != 0:
+        logger.error(
+            "ffmpeg failed (rc=%d): %s",
+            returncode,
+            "".join(tail) if tail else "(no stderr)",
+        )
         output_path.unlink(missing_ok=True)
         return False
+    return True
@@ -1,9 +1,11 @@
 import logging
+import time
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import settings
 from app.routes.upload import router as upload_router
@@ -11,7 +13,10 @@ from app.routes.analysis import router as analysis_router
 from app.routes.video import router as video_router
 from app.routes.share import router as share_router
 from app.analytics import flush as flush_analytics
+from app.storage.share_store import close_db as close_share_db
 from app.storage.share_store import init_db as init_share_db
+from app.storage.sqlite_cache import close as close_analysis_cache
+from app.storage.sqlite_cache import init_db as init_analysis_cache
 
 logger = logging.getLogger(__name__)
 
@@ -21,13 +26,27 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
 )
 
+# Health checks hit the model-availability flag far more often than the
+# model file can change, so the stat() result is reused for a short while.
+_MODEL_CHECK_TTL = 30.0  # seconds
+_model_check: tuple[float, bool] | None = None
+
+
+def _model_available() -> bool:
+    """Return whether the MediaPipe model exists, re-checking at most every TTL."""
+    global _model_check
+    now = time.monotonic()
+    if _model_check is None or now - _model_check[0] > _MODEL_CHECK_TTL:
+        _model_check = (now, Path(settings.model_path).exists())
+    return _model_check[1]
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup/shutdown lifecycle events."""
     # Startup: verify required resources exist
     model_path = Path(settings.model_path)
-    if not model_path.exists():
+    if not _model_available():
         logger.warning(
             f"MediaPipe model not found at '{model_path}'. "
             "Analysis endpoints will fail until model is available."
@@ -42,14 +61,24 @@ async def lifespan(app: FastAPI):
     # Initialise the share token database
     init_share_db()
 
+    # Initialise the shared analysis result cache
+    init_analysis_cache()
+
     yield  # App runs here
 
     # Shutdown
     flush_analytics()
+    close_analysis_cache()
+    close_share_db()
     logger.info("Shutting down Pure API")
 
 
-app = FastAPI(title="Pure API", version="0.2.0", lifespan=lifespan)
+app = FastAPI(
+    title="Pure API",
+    version="0.2.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # orjson: much faster than stdlib json
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -69,9 +98,8 @@ app.include_router(video_router)
 
 @app.get("/api/health")
 async def health():
-    model_available = Path(settings.model_path).exists()
     return {
         "status": "ok",
         "version": "0.2.0",
-        "model_available": model_available,
+        "model_available": _model_available(),
     }
@@ -1,4 +1,9 @@
-"""Shared fixtures for backend tests."""
+"""Shared fixtures for backend tests.
+
+All fixtures here are session-scoped and built once, so tests must treat
+the returned dicts as read-only. A test that needs to mutate one should
+take ``copy.deepcopy(fixture)`` first.
+"""
 
 import pytest
 
@@ -7,7 +12,7 @@ import pytest
 # Angle fixtures — realistic values with known deltas from Tiger reference
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_user_angles_dtl():
     """Amateur DTL angles with known faults:
     - spine_angle_dtl @ impact: +11.3° (early extension)
@@ -56,7 +61,7 @@ def sample_user_angles_dtl():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_ref_angles_dtl():
     """Tiger DTL reference angles (from actual reference JSON after remap)."""
     return {
@@ -101,7 +106,7 @@ def sample_ref_angles_dtl():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_user_angles_fo():
     """Amateur FO angles — includes atan2 wraparound test values."""
     return {
@@ -147,7 +152,7 @@ def sample_user_angles_fo():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_ref_angles_fo():
     """Tiger FO reference angles — shoulder_line_angle near -180 boundary."""
     return {
@@ -193,13 +198,13 @@ def sample_ref_angles_fo():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_user_angles_both(sample_user_angles_dtl, sample_user_angles_fo):
     """Combined DTL + FO user angles."""
     return {**sample_user_angles_dtl, **sample_user_angles_fo}
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_ref_angles_both(sample_ref_angles_dtl, sample_ref_angles_fo):
     """Combined DTL + FO reference angles."""
     return {**sample_ref_angles_dtl, **sample_ref_angles_fo}
@@ -209,7 +214,7 @@ def sample_ref_angles_both(sample_ref_angles_dtl, sample_ref_angles_fo):
 # Phase / landmarks fixtures
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_phases():
     """Pre-computed phases dict (typical output of detect_swing_phases)."""
     return {
@@ -220,30 +225,30 @@ def sample_phases():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_landmarks_data():
-    """Minimal 100-frame landmarks data with all frames detected."""
-    frames = []
-    for i in range(100):
-        frames.append({
-            "frame": i,
-            "timestamp_sec": i / 30.0,
-            "detected": True,
-            "landmarks": {
-                "right_wrist": {"x": 0.5, "y": 0.5, "z": 0.0, "visibility": 0.95},
-                "left_wrist": {"x": 0.5, "y": 0.5, "z": 0.0, "visibility": 0.95},
-                "right_shoulder": {"x": 0.45, "y": 0.3, "z": 0.0, "visibility": 0.9},
-                "left_shoulder": {"x": 0.55, "y": 0.3, "z": 0.0, "visibility": 0.9},
-                "right_hip": {"x": 0.47, "y": 0.5, "z": 0.0, "visibility": 0.9},
-                "left_hip": {"x": 0.53, "y": 0.5, "z": 0.0, "visibility": 0.9},
-                "right_knee": {"x": 0.47, "y": 0.7, "z": 0.0, "visibility": 0.9},
-                "left_knee": {"x": 0.53, "y": 0.7, "z": 0.0, "visibility": 0.9},
-                "right_ankle": {"x": 0.47, "y": 0.9, "z": 0.0, "visibility": 0.9},
-                "left_ankle": {"x": 0.53, "y": 0.9, "z": 0.0, "visibility": 0.9},
-                "right_elbow": {"x": 0.45, "y": 0.4, "z": 0.0, "visibility": 0.9},
-                "left_elbow": {"x": 0.55, "y": 0.4, "z": 0.0, "visibility": 0.9},
-            },
-        })
+    """Minimal 100-frame landmarks data with all frames detected.
+
+    Every frame shares the same (read-only) landmark dict.
+    """
+    landmarks = {
+        "right_wrist": {"x": 0.5, "y": 0.5, "z": 0.0, "visibility": 0.95},
+        "left_wrist": {"x": 0.5, "y": 0.5, "z": 0.0, "visibility": 0.95},
+        "right_shoulder": {"x": 0.45, "y": 0.3, "z": 0.0, "visibility": 0.9},
+        "left_shoulder": {"x": 0.55, "y": 0.3, "z": 0.0, "visibility": 0.9},
+        "right_hip": {"x": 0.47, "y": 0.5, "z": 0.0, "visibility": 0.9},
+        "left_hip": {"x": 0.53, "y": 0.5, "z": 0.0, "visibility": 0.9},
+        "right_knee": {"x": 0.47, "y": 0.7, "z": 0.0, "visibility": 0.9},
+        "left_knee": {"x": 0.53, "y": 0.7, "z": 0.0, "visibility": 0.9},
+        "right_ankle": {"x": 0.47, "y": 0.9, "z": 0.0, "visibility": 0.9},
+        "left_ankle": {"x": 0.53, "y": 0.9, "z": 0.0, "visibility": 0.9},
+        "right_elbow": {"x": 0.45, "y": 0.4, "z": 0.0, "visibility": 0.9},
+        "left_elbow": {"x": 0.55, "y": 0.4, "z": 0.0, "visibility": 0.9},
+    }
+    frames = [
+        {"frame": i, "timestamp_sec": i / 30.0, "detected": True, "landmarks": landmarks}
+        for i in range(100)
+    ]
     return {
         "summary": {"fps": 30.0, "total_frames": 100, "detection_rate_pct": 100.0},
         "frames": frames,
@@ -1,14 +1,20 @@
-"""Tests for app.storage.analysis_store — in-memory result cache."""
+"""Tests for app.storage.analysis_store — two-tier result cache."""
 
 import pytest
 
-from app.storage import analysis_store
+from app.storage import analysis_store, sqlite_cache
 
 
 @pytest.fixture(autouse=True)
-def isolate_store(monkeypatch):
-    """Replace the module-level _results dict with a fresh one for each test."""
+def isolate_store(tmp_path, monkeypatch):
+    """Fresh L1 dict and a temporary L2 SQLite database for each test."""
     monkeypatch.setattr(analysis_store, "_results", {})
+    monkeypatch.setattr(
+        "app.config.settings.analysis_db_path", str(tmp_path / "analysis.db")
+    )
+    sqlite_cache.close()
+    yield
+    sqlite_cache.close()
 
 
 class TestAnalysisStore:
@@ -35,3 +41,10 @@ class TestAnalysisStore:
         analysis_store.save_result("b", {"val": 2})
         assert analysis_store.get_result("a") == {"val": 1}
         assert analysis_store.get_result("b") == {"val": 2}
+
+    def test_survives_l1_eviction(self, monkeypatch):
+        """Another worker (empty L1) still sees the result via SQLite."""
+        analysis_store.save_result("abc_dtl", {"score": 85})
+        monkeypatch.setattr(analysis_store, "_results", {})
+        assert analysis_store.has_result("abc_dtl") is True
+        assert analysis_store.get_result("abc_dtl") == {"score": 85}
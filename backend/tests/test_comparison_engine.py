@@ -34,22 +34,24 @@ class TestComputeDeltas:
         delta = deltas["fo"]["address"]["shoulder_line_angle"]
         assert delta == pytest.approx(-14.0, abs=0.1)
 
-    def test_wraparound_negative(self):
-        """User=-169, Ref=177 → naive=-346, correct=14."""
-        user = {"fo": {"address": {"angles": {"shoulder_line_angle": -169.0}}}}
-        ref = {"fo": {"address": {"angles": {"shoulder_line_angle": 177.0}}}}
+    @pytest.mark.parametrize(
+        "user_angle, ref_angle, expected",
+        [
+            (-169.0, 177.0, 14.0),   # naive=-346, shortest path=14
+            (177.0, -169.0, -14.0),  # naive=346, shortest path=-14
+            (10.0, 5.0, 5.0),        # small differences unaffected
+            (-175.0, 175.0, 10.0),   # crosses ±180 the other way
+        ],
+    )
+    def test_wraparound(self, user_angle, ref_angle, expected):
+        """Deltas take the shortest path around the ±180° boundary."""
+        user = {"fo": {"address": {"angles": {"shoulder_line_angle": user_angle}}}}
+        ref = {"fo": {"address": {"angles": {"shoulder_line_angle": ref_angle}}}}
         deltas = compute_deltas(user, ref)
         assert deltas["fo"]["address"]["shoulder_line_angle"] == pytest.approx(
-            14.0, abs=0.1
+            expected, abs=0.1
         )
 
-    def test_wraparound_small_difference(self):
-        """Small differences are unaffected by wraparound logic."""
-        user = {"fo": {"address": {"angles": {"hip_line_angle": 10.0}}}}
-        ref = {"fo": {"address": {"angles": {"hip_line_angle": 5.0}}}}
-        deltas = compute_deltas(user, ref)
-        assert deltas["fo"]["address"]["hip_line_angle"] == 5.0
-
     def test_wraparound_at_180_boundary(self):
         """180° difference: (180+180)%360-180 = 180 or -180."""
         user = {"fo": {"address": {"angles": {"shoulder_line_angle": 180.0}}}}
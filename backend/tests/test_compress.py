@@ -0,0 +1,138 @@
+"""Tests for app.video.compress — stream-copy eligibility and encoder choice."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from app.video import compress
+from app.video.compress import audio_args, can_stream_copy, detect_hw_encoder
+
+# Constant frame rate: nominal and average rates agree
+CFR = {"r_frame_rate": "30/1", "avg_frame_rate": "30/1"}
+
+
+class TestCanStreamCopy:
+    def test_compliant_h264(self):
+        stream = {"codec_name": "h264", "width": 1920, "height": 1080, "bit_rate": "4000000", **CFR}
+        assert can_stream_copy(stream) is True
+
+    def test_portrait_within_limits(self):
+        stream = {"codec_name": "h264", "width": 1080, "height": 1920, "bit_rate": "3000000", **CFR}
+        assert can_stream_copy(stream) is True
+
+    @pytest.mark.parametrize(
+        "stream",
+        [
+            None,
+            {"codec_name": "hevc", "width": 1920, "height": 1080, "bit_rate": "4000000", **CFR},
+            {"codec_name": "h264", "width": 3840, "height": 2160, "bit_rate": "4000000", **CFR},
+            {"codec_name": "h264", "width": 1920, "height": 1080, "bit_rate": "12000000", **CFR},
+            {"codec_name": "h264", "width": 1920, "height": 1080, **CFR},  # bit_rate unknown
+            # Variable frame rate (phone capture)
+            {"codec_name": "h264", "width": 1920, "height": 1080, "bit_rate": "4000000",
+             "r_frame_rate": "30/1", "avg_frame_rate": "25037/864"},
+            # Frame rate unknown
+            {"codec_name": "h264", "width": 1920, "height": 1080, "bit_rate": "4000000"},
+        ],
+    )
+    def test_needs_reencode(self, stream):
+        assert can_stream_copy(stream) is False
+
+
+class TestCompressVideo:
+    @pytest.fixture
+    def ffmpeg_calls(self, monkeypatch):
+        """Record ffmpeg commands; the stream copy fails, re-encodes succeed."""
+        calls = []
+
+        async def fake_run(cmd, output_path):
+            calls.append(cmd)
+            return "-c" not in cmd  # only the remux uses a bare "-c copy"
+
+        monkeypatch.setattr(compress, "_FFMPEG_BIN", "/usr/bin/ffmpeg")
+        monkeypatch.setattr(compress, "_run_ffmpeg", fake_run)
+        monkeypatch.setattr(compress, "detect_hw_encoder", lambda: "libx264")
+        monkeypatch.setattr(compress, "audio_args", lambda p: ["-an"])
+        monkeypatch.setattr(
+            compress,
+            "probe_video",
+            lambda p: {"codec_name": "h264", "width": 1280, "height": 720,
+                       "bit_rate": "2000000", **CFR},
+        )
+        return calls
+
+    def test_failed_stream_copy_falls_back_to_encode(self, ffmpeg_calls):
+        assert compress.compress_video(Path("in.mp4"), Path("out.mp4")) is True
+        assert len(ffmpeg_calls) == 2
+        assert ffmpeg_calls[0][ffmpeg_calls[0].index("-c") + 1] == "copy"
+        assert "-vsync" in ffmpeg_calls[1]
+        assert ffmpeg_calls[1][ffmpeg_calls[1].index("-c:v") + 1] == "libx264"
+
+
+class TestDetectHwEncoder:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        detect_hw_encoder.cache_clear()
+        yield
+        detect_hw_encoder.cache_clear()
+
+    def _fake_encoders(self, monkeypatch, listing, working=None):
+        """Fake `ffmpeg -encoders` output; test encodes succeed for `working`."""
+        monkeypatch.setattr(compress, "_FFMPEG_BIN", "/usr/bin/ffmpeg")
+
+        def fake_run(cmd, **kwargs):
+            if "-encoders" in cmd:
+                return subprocess.CompletedProcess(cmd, 0, stdout=listing, stderr="")
+            encoder = cmd[cmd.index("-c:v") + 1]
+            ok = working is None or encoder in working
+            return subprocess.CompletedProcess(cmd, 0 if ok else 1, stdout=b"", stderr=b"")
+
+        monkeypatch.setattr(subprocess, "run", fake_run)
+
+    def test_prefers_hardware(self, monkeypatch):
+        self._fake_encoders(
+            monkeypatch,
+            " V....D libx264 H.264\n V....D h264_nvenc NVIDIA\n V....D h264_qsv QSV\n",
+        )
+        assert detect_hw_encoder() == "h264_nvenc"
+
+    def test_skips_listed_but_unusable(self, monkeypatch):
+        self._fake_encoders(
+            monkeypatch,
+            " V....D libx264 H.264\n V....D h264_nvenc NVIDIA\n V....D h264_qsv QSV\n",
+            working={"h264_qsv"},
+        )
+        assert detect_hw_encoder() == "h264_qsv"
+
+    def test_no_usable_hardware(self, monkeypatch):
+        self._fake_encoders(
+            monkeypatch,
+            " V....D libx264 H.264\n V....D h264_nvenc NVIDIA\n V....D h264_qsv QSV\n",
+            working=set(),
+        )
+        assert detect_hw_encoder() == "libx264"
+
+    def test_falls_back_to_libx264(self, monkeypatch):
+        self._fake_encoders(monkeypatch, " V....D libx264 H.264\n")
+        assert detect_hw_encoder() == "libx264"
+
+    def test_ffmpeg_missing(self, monkeypatch):
+        monkeypatch.setattr(compress, "_FFMPEG_BIN", "/nonexistent/ffmpeg")
+        assert detect_hw_encoder() == "libx264"
+
+
+class TestAudioArgs:
+    def test_dropped_by_default(self, monkeypatch):
+        monkeypatch.setattr("app.config.settings.keep_audio", False)
+        assert audio_args(Path("in.mp4")) == ["-an"]
+
+    def test_copy_aac(self, monkeypatch):
+        monkeypatch.setattr("app.config.settings.keep_audio", True)
+        monkeypatch.setattr(compress, "probe_audio_codec", lambda p: "aac")
+        assert audio_args(Path("in.mp4")) == ["-c:a", "copy"]
+
+    def test_reencode_other_codecs(self, monkeypatch):
+        monkeypatch.setattr("app.config.settings.keep_audio", True)
+        monkeypatch.setattr(compress, "probe_audio_codec", lambda p: "opus")
+        assert audio_args(Path("in.mp4")) == ["-c:a", "aac", "-b:a", "128k"]
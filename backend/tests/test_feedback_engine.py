@@ -15,42 +15,43 @@ from app.pipeline.feedback_engine import (
 # ===================================================================
 
 
-class TestRuleMatches:
-    """Test directional delta matching logic."""
-
-    def _make_rule(self, min_delta=None, max_delta=None):
-        return FaultRule(
-            angle_name="test_angle",
-            phase="impact",
-            view="dtl",
-            min_delta=min_delta,
-            max_delta=max_delta,
-            severity="major",
-            title="Test",
-            description="Test {user_value:.1f}",
-            coaching_tip="Test tip",
-        )
+def _make_rule(min_delta=None, max_delta=None):
+    return FaultRule(
+        angle_name="test_angle",
+        phase="impact",
+        view="dtl",
+        min_delta=min_delta,
+        max_delta=max_delta,
+        severity="major",
+        title="Test",
+        description="Test {user_value:.1f}",
+        coaching_tip="Test tip",
+    )
 
-    def test_max_delta_trigger(self):
-        rule = self._make_rule(max_delta=8.0)
-        assert _rule_matches(rule, 9.0) is True
-        assert _rule_matches(rule, 7.0) is False
 
-    def test_min_delta_trigger(self):
-        rule = self._make_rule(min_delta=-8.0)
-        assert _rule_matches(rule, -9.0) is True
-        assert _rule_matches(rule, -7.0) is False
-
-    def test_at_threshold(self):
-        """Exactly at boundary should trigger (>= and <=)."""
-        assert _rule_matches(self._make_rule(max_delta=8.0), 8.0) is True
-        assert _rule_matches(self._make_rule(min_delta=-8.0), -8.0) is True
+class TestRuleMatches:
+    """Test directional delta matching logic."""
 
-    def test_both_none_never_matches(self):
-        rule = self._make_rule(min_delta=None, max_delta=None)
-        assert _rule_matches(rule, 100.0) is False
-        assert _rule_matches(rule, -100.0) is False
-        assert _rule_matches(rule, 0.0) is False
+    @pytest.mark.parametrize(
+        "min_delta, max_delta, value, expected",
+        [
+            # max_delta trigger
+            (None, 8.0, 9.0, True),
+            (None, 8.0, 7.0, False),
+            # min_delta trigger
+            (-8.0, None, -9.0, True),
+            (-8.0, None, -7.0, False),
+            # exactly at boundary should trigger (>= and <=)
+            (None, 8.0, 8.0, True),
+            (-8.0, None, -8.0, True),
+            # both None never matches
+            (None, None, 100.0, False),
+            (None, None, -100.0, False),
+            (None, None, 0.0, False),
+        ],
+    )
+    def test_matches(self, min_delta, max_delta, value, expected):
+        assert _rule_matches(_make_rule(min_delta, max_delta), value) is expected
 
 
 # ===================================================================
@@ -58,83 +59,72 @@ class TestRuleMatches:
 # ===================================================================
 
 
+def _make_ranked_diff(angle_name, phase, view, delta, user_val, ref_val):
+    return {
+        "rank": 1,
+        "angle_name": angle_name,
+        "phase": phase,
+        "view": view,
+        "delta": delta,
+        "user_value": user_val,
+        "reference_value": ref_val,
+    }
+
+
 class TestGenerateFeedback:
     """Test coaching feedback generation with rule matching and fallback."""
 
-    def _make_ranked_diff(self, angle_name, phase, view, delta, user_val, ref_val):
-        return {
-            "rank": 1,
-            "angle_name": angle_name,
-            "phase": phase,
-            "view": view,
-            "delta": delta,
-            "user_value": user_val,
-            "reference_value": ref_val,
-        }
-
-    def test_early_extension_match(self, sample_user_angles_dtl, sample_ref_angles_dtl):
-        """spine_angle_dtl @ impact, delta=+11.3 → Early Extension rule."""
-        diff = self._make_ranked_diff(
-            "spine_angle_dtl", "impact", "dtl", 11.3, 30.0, 18.7
-        )
-        result = generate_feedback(
-            [diff], sample_user_angles_dtl, sample_ref_angles_dtl
-        )
-        assert len(result) == 1
-        assert result[0]["title"] == "Early Extension (Loss of Posture)"
-        assert result[0]["severity"] == "major"
-
-    def test_chicken_wing_match(self, sample_user_angles_dtl, sample_ref_angles_dtl):
-        """left_elbow @ impact, delta=-17.5 → Chicken Wing rule."""
-        diff = self._make_ranked_diff(
-            "left_elbow", "impact", "dtl", -17.5, 158.0, 175.5
-        )
+    @pytest.mark.parametrize(
+        "diff, expected_title, expected_severity, expected_count",
+        [
+            pytest.param(
+                # spine_angle_dtl @ impact, delta=+11.3 → Early Extension rule
+                _make_ranked_diff("spine_angle_dtl", "impact", "dtl", 11.3, 30.0, 18.7),
+                "Early Extension (Loss of Posture)", "major", 1,
+                id="early_extension_match",
+            ),
+            pytest.param(
+                # left_elbow @ impact, delta=-17.5 → Chicken Wing rule
+                _make_ranked_diff("left_elbow", "impact", "dtl", -17.5, 158.0, 175.5),
+                "Chicken Wing at Impact", "major", 1,
+                id="chicken_wing_match",
+            ),
+            pytest.param(
+                # Only the first matching rule ("Too Upright at Setup",
+                # max_delta=8.0) should be returned
+                _make_ranked_diff("spine_angle_dtl", "address", "dtl", 10.0, 28.0, 18.0),
+                "Too Upright at Setup", "moderate", 1,
+                id="first_matching_rule_wins",
+            ),
+            pytest.param(
+                # Unmatched angle/phase/view → "{Angle Name} at {Phase}"
+                # fallback, moderate if >12°
+                _make_ranked_diff("right_wrist_cock", "impact", "dtl", 15.0, 178.0, 163.0),
+                "Wrist Cock at Impact", "moderate", 1,
+                id="fallback_no_rule_moderate",
+            ),
+            pytest.param(
+                # Unmatched with |delta| <= 12 → severity minor
+                _make_ranked_diff("right_wrist_cock", "impact", "dtl", 8.0, 178.0, 170.0),
+                "Wrist Cock at Impact", "minor", 1,
+                id="fallback_minor_severity",
+            ),
+        ],
+    )
+    def test_title_and_severity(
+        self, sample_user_angles_dtl, sample_ref_angles_dtl,
+        diff, expected_title, expected_severity, expected_count,
+    ):
         result = generate_feedback(
             [diff], sample_user_angles_dtl, sample_ref_angles_dtl
         )
-        assert len(result) == 1
-        assert "Chicken Wing" in result[0]["title"]
-        assert result[0]["severity"] == "major"
-
-    def test_first_matching_rule_wins(self, sample_user_angles_dtl, sample_ref_angles_dtl):
-        """Only the first matching rule should be returned."""
-        diff = self._make_ranked_diff(
-            "spine_angle_dtl", "address", "dtl", 10.0, 28.0, 18.0
-        )
-        result = generate_feedback(
-            [diff], sample_user_angles_dtl, sample_ref_angles_dtl
-        )
-        assert len(result) == 1
-        # Should match "Too Upright at Setup" (max_delta=8.0), not any other rule
-        assert result[0]["title"] == "Too Upright at Setup"
-
-    def test_fallback_no_rule_moderate(self, sample_user_angles_dtl, sample_ref_angles_dtl):
-        """Unmatched angle/phase/view combo → generic fallback, moderate if >12°."""
-        diff = self._make_ranked_diff(
-            "right_wrist_cock", "impact", "dtl", 15.0, 178.0, 163.0
-        )
-        result = generate_feedback(
-            [diff], sample_user_angles_dtl, sample_ref_angles_dtl
-        )
-        assert len(result) == 1
-        assert result[0]["severity"] == "moderate"
-        # Fallback title format: "{Angle Name} at {Phase}"
-        assert "Wrist Cock" in result[0]["title"]
-        assert "Impact" in result[0]["title"]
-
-    def test_fallback_minor_severity(self, sample_user_angles_dtl, sample_ref_angles_dtl):
-        """Unmatched with |delta| <= 12 → severity minor."""
-        diff = self._make_ranked_diff(
-            "right_wrist_cock", "impact", "dtl", 8.0, 178.0, 170.0
-        )
-        result = generate_feedback(
-            [diff], sample_user_angles_dtl, sample_ref_angles_dtl
-        )
-        assert result[0]["severity"] == "minor"
+        assert len(result) == expected_count
+        assert result[0]["title"] == expected_title
+        assert result[0]["severity"] == expected_severity
 
     def test_template_interpolation(self, sample_user_angles_dtl, sample_ref_angles_dtl):
         """Matched rule description should contain actual numeric values."""
-        diff = self._make_ranked_diff(
+        diff = _make_ranked_diff(
             "spine_angle_dtl", "impact", "dtl", 11.3, 30.0, 18.7
         )
         result = generate_feedback(
@@ -144,22 +134,22 @@ class TestGenerateFeedback:
         assert "30.0" in desc
         assert "18.7" in desc
 
-    def test_fallback_direction(self, sample_user_angles_dtl, sample_ref_angles_dtl):
+    @pytest.mark.parametrize(
+        "delta, user_val, expected_word",
+        [(15.0, 178.0, "more"), (-15.0, 148.0, "less")],
+    )
+    def test_fallback_direction(
+        self, sample_user_angles_dtl, sample_ref_angles_dtl,
+        delta, user_val, expected_word,
+    ):
         """Positive delta → 'more'; negative delta → 'less' in fallback."""
-        diff_pos = self._make_ranked_diff(
-            "right_wrist_cock", "impact", "dtl", 15.0, 178.0, 163.0
-        )
-        diff_neg = self._make_ranked_diff(
-            "right_wrist_cock", "impact", "dtl", -15.0, 148.0, 163.0
+        diff = _make_ranked_diff(
+            "right_wrist_cock", "impact", "dtl", delta, user_val, 163.0
         )
-        result_pos = generate_feedback(
-            [diff_pos], sample_user_angles_dtl, sample_ref_angles_dtl
-        )
-        result_neg = generate_feedback(
-            [diff_neg], sample_user_angles_dtl, sample_ref_angles_dtl
+        result = generate_feedback(
+            [diff], sample_user_angles_dtl, sample_ref_angles_dtl
         )
-        assert "more" in result_pos[0]["description"]
-        assert "less" in result_neg[0]["description"]
+        assert expected_word in result[0]["description"]
 
     def test_empty_input(self, sample_user_angles_dtl, sample_ref_angles_dtl):
         result = generate_feedback(
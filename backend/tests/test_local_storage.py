@@ -0,0 +1,152 @@
+"""Tests for app.storage.local — streaming multipart upload parsing."""
+
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+from app.storage.local import (
+    MAX_FIELD_BYTES,
+    MAX_FIELDS,
+    UploadRejectedError,
+    UploadTooLargeError,
+    receive_upload,
+)
+
+BOUNDARY = "testboundary"
+VIDEO_BYTES = b"\x00\x00\x00\x18ftypmp42" + bytes(range(256)) * 8
+
+
+@pytest.fixture(autouse=True)
+def tmp_upload_dir(tmp_path, monkeypatch):
+    """Stream uploads into a temporary directory for each test."""
+    upload_dir = tmp_path / "uploads"
+    monkeypatch.setattr("app.config.settings.upload_dir", upload_dir)
+    return upload_dir
+
+
+def _field(name: str, value: bytes) -> bytes:
+    return (
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+    ).encode() + value + b"\r\n"
+
+
+def _file(name: str, filename: str, data: bytes, content_type="video/mp4") -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode() + data + b"\r\n"
+
+
+def _body(*parts: bytes) -> bytes:
+    return b"".join(parts) + f"--{BOUNDARY}--\r\n".encode()
+
+
+def _receive(body: bytes, content_type=f"multipart/form-data; boundary={BOUNDARY}",
+             chunk_size=100):
+    """Run receive_upload over a request whose body arrives in small chunks."""
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)] or [b""]
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+
+    async def receive():
+        return messages.pop(0)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [(b"content-type", content_type.encode())],
+    }
+    return asyncio.run(receive_upload(Request(scope, receive), "up1"))
+
+
+class TestReceiveUpload:
+    def test_fields_and_video(self, tmp_upload_dir):
+        upload = _receive(_body(
+            _field("swing_type", b"iron"),
+            _field("view", b"dtl"),
+            _file("video", "swing.mov", VIDEO_BYTES, "video/quicktime"),
+        ))
+        assert upload.fields == {"swing_type": "iron", "view": "dtl"}
+        assert upload.filename == "swing.mov"
+        assert upload.content_type == "video/quicktime"
+        assert upload.path == tmp_upload_dir / "up1_incoming.mov"
+        assert upload.path.read_bytes() == VIDEO_BYTES
+        assert upload.size == len(VIDEO_BYTES)
+        assert len(upload.content_hash) == 64
+
+    def test_missing_video_part(self):
+        upload = _receive(_body(_field("swing_type", b"iron"), _field("view", b"fo")))
+        assert upload.fields == {"swing_type": "iron", "view": "fo"}
+        assert upload.path is None
+        assert upload.size == 0
+
+    def test_not_multipart(self):
+        with pytest.raises(ValueError, match="multipart/form-data"):
+            _receive(b"{}", content_type="application/json")
+
+    def test_malformed_body(self, tmp_upload_dir):
+        with pytest.raises(ValueError, match="Malformed"):
+            _receive(b"this is not a multipart body")
+        assert list(tmp_upload_dir.iterdir()) == []
+
+    def test_truncated_body_discards_partial_video(self, tmp_upload_dir):
+        body = _body(_field("view", b"dtl"), _file("video", "swing.mp4", VIDEO_BYTES))
+        with pytest.raises(ValueError, match="Malformed"):
+            _receive(body[: len(body) // 2])
+        assert list(tmp_upload_dir.iterdir()) == []
+
+    def test_oversized_field_rejected(self, tmp_upload_dir):
+        body = _body(
+            _file("video", "swing.mp4", VIDEO_BYTES),
+            _field("view", b"x" * (MAX_FIELD_BYTES + 1)),
+        )
+        with pytest.raises(UploadTooLargeError):
+            _receive(body, chunk_size=4096)
+        assert list(tmp_upload_dir.iterdir()) == []
+
+    def test_field_at_limit_accepted(self):
+        upload = _receive(_body(_field("view", b"x" * MAX_FIELD_BYTES)), chunk_size=4096)
+        assert len(upload.fields["view"]) == MAX_FIELD_BYTES
+
+    def test_unexpected_file_part_rejected(self, tmp_upload_dir):
+        body = _body(
+            _file("video", "swing.mp4", VIDEO_BYTES),
+            _file("extra", "other.bin", b"payload"),
+        )
+        with pytest.raises(UploadRejectedError, match="extra"):
+            _receive(body)
+        assert list(tmp_upload_dir.iterdir()) == []
+
+    def test_second_video_part_rejected(self, tmp_upload_dir):
+        body = _body(
+            _file("video", "swing.mp4", VIDEO_BYTES),
+            _file("video", "other.mov", b"second video", "video/quicktime"),
+        )
+        with pytest.raises(UploadRejectedError, match="More than one file"):
+            _receive(body)
+        assert list(tmp_upload_dir.iterdir()) == []
+
+    def test_too_many_fields_rejected(self, tmp_upload_dir):
+        body = _body(
+            _file("video", "swing.mp4", VIDEO_BYTES),
+            *(_field(f"f{i}", b"x") for i in range(MAX_FIELDS + 1)),
+        )
+        with pytest.raises(UploadRejectedError, match="Too many form fields"):
+            _receive(body, chunk_size=4096)
+        assert list(tmp_upload_dir.iterdir()) == []
+
+    def test_field_count_at_limit_accepted(self):
+        body = _body(*(_field(f"f{i}", b"x") for i in range(MAX_FIELDS)))
+        upload = _receive(body, chunk_size=4096)
+        assert len(upload.fields) == MAX_FIELDS
+
+    def test_discard_removes_streamed_file(self):
+        upload = _receive(_body(_file("video", "swing.mp4", VIDEO_BYTES)))
+        assert upload.path.exists()
+        upload.discard()
+        assert not upload.path.exists()
+        upload.discard()  # already gone: no error
@@ -0,0 +1,17 @@
+"""Tests for app.pipeline.modal_extractor — decoding worker results."""
+
+import gzip
+import json
+
+from app.pipeline.modal_extractor import _decode_result
+
+
+class TestDecodeResult:
+    def test_compressed_result(self):
+        result = {"summary": {"detected_frames": 2}, "frames": [{"frame": 0}]}
+        packed = {"compressed": gzip.compress(json.dumps(result).encode())}
+        assert _decode_result(packed) == result
+
+    def test_uncompressed_passthrough(self):
+        error = {"error": "LANDMARK_EXTRACTION_FAILED", "detection_rate": 42.0}
+        assert _decode_result(error) is error
@@ -6,9 +6,16 @@ from app.pipeline.models import PipelineError
 from app.pipeline.reference_data import load_reference
 
 
-@pytest.fixture(autouse=True)
-def clear_lru_cache():
-    """Clear the LRU cache before each test."""
+@pytest.fixture(scope="session", autouse=True)
+def _prewarm_reference():
+    """Parse both iron reference files once for the whole session."""
+    load_reference("iron", "dtl")
+    load_reference("iron", "fo")
+
+
+@pytest.fixture
+def _force_cache_miss():
+    """Clear the LRU cache around tests that depend on cache state."""
     load_reference.cache_clear()
     yield
     load_reference.cache_clear()
@@ -54,11 +61,13 @@ class TestLoadReference:
         with pytest.raises(PipelineError):
             load_reference("iron", "invalid")
 
+    @pytest.mark.usefixtures("_force_cache_miss")
     def test_missing_file_raises(self):
         with pytest.raises(PipelineError) as exc_info:
             load_reference("driver", "dtl")
         assert exc_info.value.error_code == "REFERENCE_DATA_NOT_FOUND"
 
+    @pytest.mark.usefixtures("_force_cache_miss")
     def test_caching(self):
         """Two calls return the same object (LRU cache hit)."""
         ref1 = load_reference("iron", "dtl")
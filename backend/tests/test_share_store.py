@@ -1,26 +1,33 @@
 """Tests for app.storage.share_store — SQLite share token management."""
 
+import sqlite3
+
 import pytest
 
 from app.storage import share_store
 
 
+def _use_db(monkeypatch, db: str) -> None:
+    # Reset the cached _DB_PATH so _get_db_path() re-reads from settings
+    monkeypatch.setattr(share_store, "_DB_PATH", None)
+    monkeypatch.setattr("app.config.settings.share_db_path", db)
+
+
 @pytest.fixture(autouse=True)
 def tmp_share_db(tmp_path, monkeypatch):
     """Point share_store at a temporary SQLite database for each test."""
     db_path = tmp_path / "test_shares.db"
-    # Reset the cached _DB_PATH so _get_db_path() re-reads from settings
-    monkeypatch.setattr(share_store, "_DB_PATH", None)
-    monkeypatch.setattr("app.config.settings.share_db_path", str(db_path))
+    _use_db(monkeypatch, str(db_path))
     share_store.init_db()
-    return db_path
+    yield db_path
+    share_store.close_db()
 
 
 class TestShareStore:
     def test_create_returns_token(self):
         token = share_store.create_share("upload1", "dtl")
         assert isinstance(token, str)
-        assert len(token) == 32  # uuid4().hex is 32 chars
+        assert len(token) == 22  # token_urlsafe(16): 16 random bytes, base64url
 
     def test_get_valid_token(self):
         token = share_store.create_share("upload1", "dtl")
@@ -38,6 +45,19 @@ class TestShareStore:
         assert share_store.revoke_share(token) is True
         assert share_store.get_share(token) is None
 
+    def test_expired_token(self):
+        token = share_store.create_share("upload1", "dtl", expires_days=1)
+        with share_store._acquire_write() as conn:
+            conn.execute(
+                "UPDATE shares SET expires_at = ? WHERE share_token = ?",
+                (946684800000, token),  # 2000-01-01T00:00:00Z
+            )
+        assert share_store.get_share(token) is None
+
+    def test_permanent_token(self):
+        token = share_store.create_share("upload1", "dtl", expires_days=None)
+        assert share_store.get_share(token)["expires_at"] is None
+
     def test_revoke_unknown(self):
         assert share_store.revoke_share("nonexistent") is False
 
@@ -49,7 +69,68 @@ class TestShareStore:
         assert len(active) == 1
         assert active[0]["share_token"] == t2
 
+    def test_create_shares_bulk(self):
+        tokens = share_store.create_shares_bulk(
+            [("upload1", "dtl", None, 90), ("upload1", "fo", "user-abc", None)]
+        )
+        assert len(tokens) == 2
+        assert share_store.get_share(tokens[0])["view"] == "dtl"
+        fo = share_store.get_share(tokens[1])
+        assert fo["view"] == "fo"
+        assert fo["user_id"] == "user-abc"
+        assert fo["expires_at"] is None
+
     def test_create_with_user_id(self):
         token = share_store.create_share("upload1", "dtl", user_id="user-abc")
         share = share_store.get_share(token)
         assert share["user_id"] == "user-abc"
+
+    def test_expires_at_stored_as_ms(self):
+        token = share_store.create_share("upload1", "dtl", expires_days=90)
+        expires_at = share_store.get_share(token)["expires_at"]
+        assert isinstance(expires_at, int)
+        assert share_store.expires_at_iso(expires_at).endswith("+00:00")
+
+
+class TestMigration:
+    def test_text_expires_at_migrated(self, tmp_path, monkeypatch):
+        db_path = tmp_path / "legacy_shares.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            """
+            CREATE TABLE shares (
+                share_token TEXT PRIMARY KEY, upload_id TEXT NOT NULL,
+                view TEXT NOT NULL, created_at TEXT NOT NULL, expires_at TEXT,
+                is_public INTEGER DEFAULT 1, user_id TEXT
+            )
+            """
+        )
+        conn.executemany(
+            "INSERT INTO shares VALUES (?, ?, ?, ?, ?, 1, NULL)",
+            [
+                ("live", "u1", "dtl", "2024-01-01T00:00:00+00:00", "2999-01-01T00:00:00+00:00"),
+                ("old", "u1", "fo", "2024-01-01T00:00:00+00:00", "2000-01-01T00:00:00.500000+00:00"),
+                ("forever", "u1", "fo", "2024-01-01T00:00:00+00:00", None),
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+        _use_db(monkeypatch, str(db_path))
+        share_store.init_db()
+
+        assert share_store.get_share("old") is None
+        assert share_store.get_share("forever")["expires_at"] is None
+        live = share_store.get_share("live")
+        assert share_store.expires_at_iso(live["expires_at"]) == "2999-01-01T00:00:00+00:00"
+
+    def test_migration_is_noop_once_migrated(self, tmp_path, monkeypatch):
+        # A second worker's init_db() must not rebuild an already-migrated table
+        _use_db(monkeypatch, str(tmp_path / "shares.db"))
+        share_store.init_db()
+        token = share_store.create_share("upload1", "dtl", expires_days=90)
+        expires_at = share_store.get_share(token)["expires_at"]
+
+        share_store.init_db()
+
+        assert share_store.get_share(token)["expires_at"] == expires_at
@@ -0,0 +1,37 @@
+"""Tests for app.routes.video — HTTP Range header parsing."""
+
+import pytest
+from fastapi import HTTPException
+
+from app.routes.video import MAX_RANGE_BYTES, _parse_range
+
+
+class TestParseRange:
+    def test_explicit_range(self):
+        assert _parse_range("bytes=0-99", 1000) == (0, 99)
+
+    def test_open_ended(self):
+        assert _parse_range("bytes=900-", 1000) == (900, 999)
+
+    def test_suffix_range(self):
+        assert _parse_range("bytes=-100", 1000) == (900, 999)
+
+    def test_end_clamped_to_file(self):
+        assert _parse_range("bytes=500-5000", 1000) == (500, 999)
+
+    def test_clamped_to_max_range(self):
+        size = MAX_RANGE_BYTES * 4
+        assert _parse_range("bytes=0-", size) == (0, MAX_RANGE_BYTES - 1)
+
+    @pytest.mark.parametrize("header", ["bytes=abc-", "bytes=0-xyz", "items=0-1", "bytes=0"])
+    def test_malformed_returns_400(self, header):
+        with pytest.raises(HTTPException) as exc_info:
+            _parse_range(header, 1000)
+        assert exc_info.value.status_code == 400
+
+    @pytest.mark.parametrize("header", ["bytes=1000-", "bytes=500-100"])
+    def test_unsatisfiable_returns_416(self, header):
+        with pytest.raises(HTTPException) as exc_info:
+            _parse_range(header, 1000)
+        assert exc_info.value.status_code == 416
+        assert exc_info.value.headers["Content-Range"] == "bytes */1000"
@@ -19,6 +19,7 @@ image = (
         "mediapipe>=0.10.9",
         "opencv-python-headless>=4.8.0",
         "numpy>=1.24.0",
+        "orjson>=3.9",
     )
     .run_commands(
         "mkdir -p /models",
@@ -50,6 +51,14 @@ GOLF_LANDMARKS = {
     "left_knee": 25, "right_knee": 26,
     "left_ankle": 27, "right_ankle": 28,
 }
+GOLF_INDICES = list(GOLF_LANDMARKS.values())
+
+# How often (in sampled frames) to check whether the detection rate can
+# still reach min_detection_rate before giving up on the rest of the video
+EARLY_EXIT_CHECK_INTERVAL = 50
+# Margin on a container-stored frame count before the early exit rules a
+# video out (edit lists and variable frame rate can shift it slightly)
+EARLY_EXIT_FRAME_COUNT_SLACK = 1.25
 
 
 def _detect_video_suffix(video_bytes: bytes) -> str:
@@ -62,33 +71,133 @@ def _detect_video_suffix(video_bytes: bytes) -> str:
     return ".mov"  # safe default for QuickTime
 
 
-@app.function(
-    image=image,
-    gpu="T4",
-    timeout=120,
-    retries=1,
-)
-def extract_landmarks(
+def _frame_count_is_stored(video_bytes: bytes) -> bool:
+    """Whether CAP_PROP_FRAME_COUNT comes from the container, not a guess.
+
+    Unfragmented MP4/MOV files list every sample in the moov atom, which
+    FFmpeg reports as the stream's frame count. Fragmented MP4 (moof
+    boxes) and other containers leave it to be estimated from duration
+    and fps, which can undercount by any amount.
+    """
+    return (
+        len(video_bytes) >= 12
+        and video_bytes[4:8] == b"ftyp"
+        and b"moof" not in video_bytes
+    )
+
+
+def _write_temp_video(video_bytes: bytes, suffix: str) -> str:
+    """Write video bytes to a temp file, preferring RAM-backed /dev/shm.
+
+    cv2.VideoCapture needs a seekable path (iPhone .mov files often keep
+    the moov atom at the end, so a stdin pipe won't do). Staging on tmpfs
+    avoids a disk round-trip; if /dev/shm is missing or too small the
+    file goes to the default temp dir instead.
+    """
+    import os
+    import tempfile
+
+    def write(tmp_dir: str | None) -> str:
+        f = tempfile.NamedTemporaryFile(suffix=suffix, dir=tmp_dir, delete=False)
+        try:
+            with f:
+                f.write(video_bytes)
+        except OSError:
+            os.unlink(f.name)
+            raise
+        return f.name
+
+    if os.path.isdir("/dev/shm"):
+        try:
+            return write("/dev/shm")
+        except OSError as e:
+            print(f"WARNING: /dev/shm unusable ({e}), writing video to disk")
+    return write(None)
+
+
+def _create_landmarker():
+    """Load the heavy PoseLandmarker model for per-frame detection."""
+    import mediapipe as mp
+
+    PoseLandmarker = mp.tasks.vision.PoseLandmarker
+    PoseLandmarkerOptions = mp.tasks.vision.PoseLandmarkerOptions
+    RunningMode = mp.tasks.vision.RunningMode
+    BaseOptions = mp.tasks.BaseOptions
+
+    def build(delegate):
+        # IMAGE mode on purpose: VIDEO mode's tracker would skip the pose
+        # detector between frames, but its temporal state made results
+        # differ run-to-run. Every sampled frame is detected independently
+        # so the same video always yields the same landmarks.
+        options = PoseLandmarkerOptions(
+            base_options=BaseOptions(
+                model_asset_path=MODEL_PATH, delegate=delegate
+            ),
+            running_mode=RunningMode.IMAGE,
+            num_poses=1,
+            min_pose_detection_confidence=0.5,
+            min_pose_presence_confidence=0.5,
+        )
+        return PoseLandmarker.create_from_options(options)
+
+    # MediaPipe defaults to the CPU delegate; ask for the GPU explicitly
+    # so the T4 is actually used, but keep working if it can't start
+    # (e.g. no EGL/OpenGL ES in the container).
+    try:
+        landmarker = build(BaseOptions.Delegate.GPU)
+        delegate_name = "GPU"
+    except Exception as e:
+        print(f"WARNING: GPU delegate unavailable ({e}), falling back to CPU")
+        landmarker = build(BaseOptions.Delegate.CPU)
+        delegate_name = "CPU"
+
+    print(f"Loaded {MODEL_PATH} (float16 weights) on {delegate_name} delegate")
+    return landmarker
+
+
+def _compress_result(result: dict) -> dict:
+    """Pack a successful result as gzip-compressed JSON for the return trip.
+
+    A full result holds thousands of floats under repeated key strings;
+    sending it as one compressed blob is much smaller than pickling the
+    dict. Small error dicts are returned unchanged.
+    """
+    import gzip
+
+    import orjson
+
+    if "error" in result:
+        return result
+    payload = orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY)
+    return {"compressed": gzip.compress(payload, compresslevel=1)}
+
+
+def _decompress_result(result: dict) -> dict:
+    """Inverse of _compress_result; passes uncompressed dicts through."""
+    import gzip
+    import json
+
+    if "compressed" not in result:
+        return result
+    return json.loads(gzip.decompress(result["compressed"]))
+
+
+def _extract_landmarks(
+    landmarker,
     video_bytes: bytes,
-    frame_step: int = 2,
-    min_detection_rate: float = 0.7,
-    target_height: int = 960,
+    frame_step: int,
+    min_detection_rate: float,
+    target_height: int,
+    batch_size: int,
+    landmarks_subset: list[str] | None = None,
 ) -> dict:
-    """Extract MediaPipe pose landmarks from video bytes.
-
-    Args:
-        video_bytes: Raw video file bytes (.mov/.mp4).
-        frame_step: Process every Nth frame (default 2).
-        min_detection_rate: Minimum acceptable detection rate (0-1).
-        target_height: Downscale frames to this height before inference.
-                       Set to 0 to disable downscaling.
-
-    Returns:
-        Dict with 'summary' and 'frames' keys on success.
-        Dict with 'error' and 'detection_rate' keys on failure.
+    """Run pose extraction over video bytes with an already-loaded landmarker.
+
+    See LandmarkExtractor.extract_landmarks for arguments and return value.
     """
-    import tempfile
     import os
+    import queue
+    import threading
 
     import cv2
     import mediapipe as mp
@@ -96,12 +205,17 @@ def extract_landmarks(
 
     # Write bytes to temp file (cv2.VideoCapture needs a file path)
     suffix = _detect_video_suffix(video_bytes)
-    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
-        f.write(video_bytes)
-        tmp_path = f.name
+    count_is_stored = _frame_count_is_stored(video_bytes)
+    tmp_path = _write_temp_video(video_bytes, suffix)
 
     try:
-        cap = cv2.VideoCapture(tmp_path)
+        # Let FFmpeg use a hardware decoder when the build/driver offers
+        # one; it silently falls back to software decoding otherwise.
+        cap = cv2.VideoCapture(
+            tmp_path,
+            cv2.CAP_FFMPEG,
+            [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+        )
         if not cap.isOpened():
             return {"error": "VIDEO_OPEN_FAILED", "message": "Cannot open video"}
 
@@ -124,85 +238,207 @@ def extract_landmarks(
             f"Processing: {orig_width}x{orig_height} @ {fps:.1f}fps, "
             f"{total_frames} frames, step={frame_step}"
         )
+        hw_accel = int(cap.get(cv2.CAP_PROP_HW_ACCELERATION))
+        if hw_accel:
+            print(f"Hardware video decode enabled (type {hw_accel})")
         if do_downscale:
             print(f"Downscaling to {inf_width}x{inf_height} for inference")
+            # Ask the backend to scale while decoding. Most file backends
+            # ignore this, so frames are checked and resized if still full size.
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, inf_width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, inf_height)
+
+        # Indices of the landmarks to emit per frame (all 33 by default)
+        if landmarks_subset is None:
+            active_indices = list(range(len(LANDMARK_NAMES)))
+        else:
+            subset = set(landmarks_subset)
+            active_indices = [
+                i for i, name in enumerate(LANDMARK_NAMES) if name in subset
+            ]
+        active_names = [LANDMARK_NAMES[i] for i in active_indices]
+
+        # Struct-of-arrays results, one slot per sampled frame. Frame dicts
+        # are only materialised once extraction has succeeded.
+        num_landmarks = len(LANDMARK_NAMES)
+        n_slots = max(total_frames, 1) // frame_step + 1
+        # MediaPipe outputs float32, so float32 storage is lossless.
+        landmarks_arr = np.zeros((n_slots, num_landmarks, 4), dtype=np.float32)
+        detected_mask = np.zeros(n_slots, dtype=bool)
+
+        # Decode runs on a producer thread so the CPU reads, resizes and
+        # converts the next frames while the main thread waits on the GPU.
+        # The bounded queue caps how far decoding can run ahead.
+        frame_queue: queue.Queue = queue.Queue(maxsize=batch_size)
+        stop = threading.Event()
+        decode_state = {"frames": 0, "error": None}
+        done = object()
+
+        def enqueue(item) -> None:
+            # Give up if the consumer has stopped, rather than block forever
+            while not stop.is_set():
+                try:
+                    frame_queue.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def decode_frames() -> None:
+            # Reused for every sampled frame; mp.Image copies the pixels, so
+            # the buffers can be overwritten while earlier frames are queued.
+            inf_buf = np.empty((inf_height, inf_width, 3), dtype=np.uint8)
+            rgb_buf = np.empty((inf_height, inf_width, 3), dtype=np.uint8)
+            # For shrinks beyond 2x, halve with pyrDown first (a cheap
+            # vectorised 2x path) so INTER_AREA only covers the remainder.
+            # Exact 2x already hits INTER_AREA's integer-factor fast path.
+            pyr_down = do_downscale and orig_height > 2 * inf_height
+            half_size = ((orig_width + 1) // 2, (orig_height + 1) // 2)
+            if pyr_down:
+                half_buf = np.empty(
+                    (half_size[1], half_size[0], 3), dtype=np.uint8
+                )
 
-        # Set up MediaPipe
-        PoseLandmarker = mp.tasks.vision.PoseLandmarker
-        PoseLandmarkerOptions = mp.tasks.vision.PoseLandmarkerOptions
-        RunningMode = mp.tasks.vision.RunningMode
-        BaseOptions = mp.tasks.BaseOptions
-
-        options = PoseLandmarkerOptions(
-            base_options=BaseOptions(model_asset_path=MODEL_PATH),
-            running_mode=RunningMode.IMAGE,
-            num_poses=1,
-            min_pose_detection_confidence=0.5,
-            min_pose_presence_confidence=0.5,
-        )
-
-        all_landmarks = []
-        detected_count = 0
-
-        with PoseLandmarker.create_from_options(options) as landmarker:
             frame_idx = 0
-            while cap.isOpened():
-                ret, frame = cap.read()
-                if not ret:
-                    break
-
-                timestamp_ms = int(frame_idx * 1000 / fps)
-
-                frame_data = {
-                    "frame": frame_idx,
-                    "timestamp_sec": round(frame_idx / fps, 4),
-                    "timestamp_ms": timestamp_ms,
-                    "detected": False,
-                    "landmarks": {},
-                }
-
-                # Only run inference on sampled frames
-                if frame_idx % frame_step == 0:
-                    # Downscale for inference if configured
-                    if do_downscale:
-                        inf_frame = cv2.resize(frame, (inf_width, inf_height))
+            try:
+                while cap.isOpened() and not stop.is_set():
+                    sampled = frame_idx % frame_step == 0
+                    if sampled:
+                        ret, frame = cap.read()
                     else:
-                        inf_frame = frame
-
-                    rgb_frame = cv2.cvtColor(inf_frame, cv2.COLOR_BGR2RGB)
-                    mp_image = mp.Image(
-                        image_format=mp.ImageFormat.SRGB, data=rgb_frame
+                        # Advance past frames we won't run inference on
+                        # without retrieving (converting) them into BGR
+                        ret = cap.grab()
+                    if not ret:
+                        break
+
+                    # Only run inference on sampled frames
+                    if sampled:
+                        # Downscale for inference unless the decoder did
+                        if do_downscale and frame.shape[:2] != (
+                            inf_height,
+                            inf_width,
+                        ):
+                            if pyr_down and frame.shape[:2] == (
+                                orig_height,
+                                orig_width,
+                            ):
+                                frame = cv2.pyrDown(
+                                    frame, dst=half_buf, dstsize=half_size
+                                )
+                            cv2.resize(
+                                frame,
+                                (inf_width, inf_height),
+                                dst=inf_buf,
+                                interpolation=cv2.INTER_AREA,  # antialiased
+                            )
+                            inf_frame = inf_buf
+                        else:
+                            inf_frame = frame
+
+                        # Decoded frames can differ from the reported size
+                        # (e.g. auto-rotated phone video); cvtColor would
+                        # then write to a new array, not rgb_buf
+                        if rgb_buf.shape != inf_frame.shape:
+                            rgb_buf = np.empty(inf_frame.shape, dtype=np.uint8)
+                        cv2.cvtColor(inf_frame, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+                        mp_image = mp.Image(
+                            image_format=mp.ImageFormat.SRGB, data=rgb_buf
+                        )
+                        enqueue((frame_idx // frame_step, mp_image))
+
+                    frame_idx += 1
+            except Exception as e:
+                decode_state["error"] = e
+            finally:
+                decode_state["frames"] = frame_idx
+                enqueue(done)
+
+        expected_sampled = (total_frames + frame_step - 1) // frame_step
+        # Only a stored frame count bounds the video's length; an estimated
+        # one disables the early exit
+        max_sampled = (
+            int(expected_sampled * EARLY_EXIT_FRAME_COUNT_SLACK)
+            if count_is_stored
+            else 0
+        )
+        processed = 0
+        detected_so_far = 0
+        gave_up = False
+
+        producer = threading.Thread(target=decode_frames, daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = frame_queue.get()
+                if item is done:
+                    break
+                slot, mp_image = item
+                if slot >= n_slots:
+                    # CAP_PROP_FRAME_COUNT is an estimate; grow if short
+                    landmarks_arr = np.concatenate(
+                        [landmarks_arr, np.zeros_like(landmarks_arr)]
                     )
-
-                    results = landmarker.detect(mp_image)
-
-                    if results.pose_landmarks and len(results.pose_landmarks) > 0:
-                        detected_count += 1
-                        frame_data["detected"] = True
-                        landmarks = results.pose_landmarks[0]
-
-                        for idx, lm in enumerate(landmarks):
-                            # Landmark coords are normalized (0-1), so they're
-                            # resolution-independent. pixel_x/y use original
-                            # dimensions for frontend overlay compatibility.
-                            frame_data["landmarks"][LANDMARK_NAMES[idx]] = {
-                                "x": round(lm.x, 6),
-                                "y": round(lm.y, 6),
-                                "z": round(lm.z, 6),
-                                "visibility": round(lm.visibility, 4),
-                                "pixel_x": int(lm.x * orig_width),
-                                "pixel_y": int(lm.y * orig_height),
-                            }
-
-                all_landmarks.append(frame_data)
-                frame_idx += 1
-
-        cap.release()
+                    detected_mask = np.concatenate(
+                        [detected_mask, np.zeros_like(detected_mask)]
+                    )
+                    n_slots = len(detected_mask)
+
+                results = landmarker.detect(mp_image)
+                processed += 1
+                if results.pose_landmarks:
+                    detected_so_far += 1
+                    detected_mask[slot] = True
+                    landmarks_arr[slot] = np.fromiter(
+                        (
+                            v
+                            for lm in results.pose_landmarks[0]
+                            for v in (lm.x, lm.y, lm.z, lm.visibility)
+                        ),
+                        dtype=np.float32,
+                        count=num_landmarks * 4,
+                    ).reshape(num_landmarks, 4)
+
+                # Stop once even detecting every remaining frame couldn't
+                # reach the threshold. The best reachable rate only grows
+                # with the true frame count, so this assumes the video holds
+                # at most max_sampled sampled frames (the stored count plus
+                # EARLY_EXIT_FRAME_COUNT_SLACK); past that bound we read to
+                # the end.
+                if (
+                    processed < max_sampled
+                    and processed % EARLY_EXIT_CHECK_INTERVAL == 0
+                ):
+                    best_rate = (
+                        detected_so_far + max_sampled - processed
+                    ) / max_sampled
+                    if best_rate < min_detection_rate:
+                        gave_up = True
+                        break
+        finally:
+            stop.set()
+            producer.join()
+            cap.release()
+
+        if decode_state["error"] is not None:
+            raise decode_state["error"]
+        if gave_up:
+            detection_rate = detected_so_far / processed
+            print(
+                f"Stopped after {processed}/{expected_sampled} sampled frames: "
+                f"{detection_rate:.0%} detected, "
+                f"{min_detection_rate:.0%} no longer reachable"
+            )
+            return {
+                "error": "LANDMARK_EXTRACTION_FAILED",
+                "detection_rate": round(detection_rate * 100, 1),
+            }
+        frame_idx = decode_state["frames"]
 
         # Calculate detection rate (only among sampled frames)
-        sampled_count = len(
-            [f for f in all_landmarks if f["frame"] % frame_step == 0]
-        )
+        sampled_count = (frame_idx + frame_step - 1) // frame_step
+        landmarks_arr = landmarks_arr[:sampled_count]
+        detected_mask = detected_mask[:sampled_count]
+        detected_count = int(detected_mask.sum())
         detection_rate = detected_count / sampled_count if sampled_count > 0 else 0
 
         print(
@@ -216,17 +452,59 @@ def extract_landmarks(
                 "detection_rate": round(detection_rate * 100, 1),
             }
 
+        # Materialise per-frame dicts. Rounding and pixel scaling run once
+        # over the whole array. Landmark coords are normalized (0-1), so
+        # they're resolution-independent; pixel_x/y use original dimensions
+        # for frontend overlay compatibility. Values are widened to float64
+        # before rounding so the JSON gets short decimals, not float32 noise.
+        # Five decimals is still finer than the pipeline's own rounding.
+        visibility_arr = np.round(landmarks_arr[:, :, 3].astype(np.float64), 4)
+        active_arr = landmarks_arr[:, active_indices].astype(np.float64)
+        coords = np.round(active_arr[:, :, :3], 5).tolist()
+        visibility = visibility_arr[:, active_indices].tolist()
+        pixel_x = (active_arr[:, :, 0] * orig_width).astype(np.int64).tolist()
+        pixel_y = (active_arr[:, :, 1] * orig_height).astype(np.int64).tolist()
+        detected_list = detected_mask.tolist()
+
+        all_landmarks = []
+        for i in range(frame_idx):
+            frame_data = {
+                "frame": i,
+                "timestamp_sec": round(i / fps, 4),
+                "timestamp_ms": int(i * 1000 / fps),
+                "detected": False,
+                "landmarks": {},
+            }
+            slot, rem = divmod(i, frame_step)
+            if rem == 0 and detected_list[slot]:
+                frame_data["detected"] = True
+                frame_data["landmarks"] = {
+                    name: {
+                        "x": c[0],
+                        "y": c[1],
+                        "z": c[2],
+                        "visibility": vis,
+                        "pixel_x": px,
+                        "pixel_y": py,
+                    }
+                    for name, c, vis, px, py in zip(
+                        active_names,
+                        coords[slot],
+                        visibility[slot],
+                        pixel_x[slot],
+                        pixel_y[slot],
+                    )
+                }
+            all_landmarks.append(frame_data)
+
         # Build summary
-        avg_visibility = {}
-        for name in GOLF_LANDMARKS:
-            visibilities = [
-                f["landmarks"][name]["visibility"]
-                for f in all_landmarks
-                if f["detected"] and name in f["landmarks"]
-            ]
-            avg_visibility[name] = (
-                round(float(np.mean(visibilities)), 4) if visibilities else 0
-            )
+        if detected_count:
+            golf_vis = visibility_arr[detected_mask][:, GOLF_INDICES].mean(axis=0)
+            avg_visibility = {
+                name: round(float(v), 4) for name, v in zip(GOLF_LANDMARKS, golf_vis)
+            }
+        else:
+            avg_visibility = {name: 0 for name in GOLF_LANDMARKS}
 
         summary = {
             "video_file": "uploaded_video",
@@ -249,6 +527,67 @@ def extract_landmarks(
         os.unlink(tmp_path)
 
 
+@app.cls(
+    image=image,
+    gpu="T4",
+    timeout=120,
+    retries=1,
+)
+class LandmarkExtractor:
+    """Pose extractor that keeps one PoseLandmarker loaded per container.
+
+    Loading the model and initialising the GPU delegate takes seconds, so
+    it happens once in @modal.enter() and warm containers reuse it.
+    """
+
+    @modal.enter()
+    def load(self):
+        self.landmarker = _create_landmarker()
+
+    @modal.exit()
+    def close(self):
+        self.landmarker.close()
+
+    @modal.method()
+    def extract_landmarks(
+        self,
+        video_bytes: bytes,
+        frame_step: int = 2,
+        min_detection_rate: float = 0.7,
+        target_height: int = 960,
+        batch_size: int = 8,
+        landmarks_subset: list[str] | None = None,
+    ) -> dict:
+        """Extract MediaPipe pose landmarks from video bytes.
+
+        Args:
+            video_bytes: Raw video file bytes (.mov/.mp4).
+            frame_step: Process every Nth frame (default 2).
+            min_detection_rate: Minimum acceptable detection rate (0-1).
+            target_height: Downscale frames to this height before inference.
+                           Set to 0 to disable downscaling.
+            batch_size: Maximum number of decoded frames queued ahead of
+                        inference by the decode thread.
+            landmarks_subset: Landmark names to include in each frame, e.g.
+                              list(GOLF_LANDMARKS). None returns all 33.
+
+        Returns:
+            On success, a dict with a 'compressed' key holding the
+            gzip-compressed JSON of the {'summary', 'frames'} result.
+            Dict with 'error' and 'detection_rate' keys on failure.
+        """
+        result = _extract_landmarks(
+            self.landmarker,
+            video_bytes,
+            frame_step,
+            min_detection_rate,
+            target_height,
+            batch_size,
+            landmarks_subset,
+        )
+        return _compress_result(result)
+
+
 @app.local_entrypoint()
 def main():
     """Test entrypoint: extract landmarks from a local video file."""
@@ -265,12 +604,13 @@ def main():
         video_bytes = f.read()
 
     print(f"Sending {len(video_bytes) / 1e6:.1f}MB to Modal...")
-    result = extract_landmarks.remote(
+    result = LandmarkExtractor().extract_landmarks.remote(
         video_bytes=video_bytes,
         frame_step=2,
         min_detection_rate=0.7,
         target_height=960,
     )
+    result = _decompress_result(result)
 
     if "error" in result:
         print(f"ERROR: {result['error']}")
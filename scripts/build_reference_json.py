@@ -9,18 +9,18 @@ Each file contains per-phase angle data with swing_type field,
 frame numbers, timestamps, and measurement reliability notes.
 """
 
-import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 # Add parent to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from calculate_angles import (
     load_landmarks, DTL_PHASES, FO_PHASES,
-    calc_forward_bend_dtl, calc_lead_arm_torso_angle, calc_trail_arm_torso_angle,
-    calc_elbow_angle, calc_knee_flex, calc_wrist_cock, calc_shoulder_turn_dtl,
-    calc_shoulder_turn_fo, calc_hip_turn_fo, calc_spine_tilt,
-    calc_shoulder_hip_separation_fo, get_landmark_2d, VISIBILITY_THRESHOLD,
+    calc_forward_bend_dtl, calc_shoulder_turn_dtl, calc_spine_tilt,
+    ANGLE_LANDMARKS, get_landmarks_2d, joint_angle_2d,
+    line_angle_2d, shoulder_hip_separation, torso_frame,
+    VISIBILITY_THRESHOLD, write_json,
 )
 
 
@@ -31,12 +31,12 @@ def _safe_round(val, ndigits=1):
 
 def build_dtl_reference(landmarks_data):
     """Build DTL reference data for all phases."""
-    frames = landmarks_data["frames"]
+    frames_by_num = {f["frame"]: f for f in landmarks_data["frames"]}
     phases = []
 
     for phase_name, phase_info in DTL_PHASES.items():
         frame_num = phase_info["frame"]
-        frame_data = next(f for f in frames if f["frame"] == frame_num)
+        frame_data = frames_by_num[frame_num]
 
         # Extract key landmark positions (normalized)
         key_landmarks = {}
@@ -52,20 +52,23 @@ def build_dtl_reference(landmarks_data):
                 "visibility": lm["visibility"],
             }
 
-        # Compute angles (visibility filtering via get_landmark_2d in each calc_*)
+        # Fetch landmarks once per phase (None for low visibility) and
+        # compute every angle from the same points
+        points = get_landmarks_2d(frame_data, ANGLE_LANDMARKS)
+        torso = torso_frame(frame_data, points)
         raw_angles = {
-            "spine_angle": _safe_round(calc_forward_bend_dtl(frame_data)),
-            "lead_arm_torso": _safe_round(calc_lead_arm_torso_angle(frame_data)),
-            "trail_arm_torso": _safe_round(calc_trail_arm_torso_angle(frame_data)),
-            "right_elbow": _safe_round(calc_elbow_angle(frame_data, "right")),
-            "left_elbow": _safe_round(calc_elbow_angle(frame_data, "left")),
-            "right_knee_flex": _safe_round(calc_knee_flex(frame_data, "right")),
-            "right_wrist_cock": _safe_round(calc_wrist_cock(frame_data, "right")),
+            "spine_angle": _safe_round(calc_forward_bend_dtl(frame_data, torso)),
+            "lead_arm_torso": _safe_round(joint_angle_2d(points, "lead_arm_torso")),
+            "trail_arm_torso": _safe_round(joint_angle_2d(points, "trail_arm_torso")),
+            "right_elbow": _safe_round(joint_angle_2d(points, "right_elbow")),
+            "left_elbow": _safe_round(joint_angle_2d(points, "left_elbow")),
+            "right_knee_flex": _safe_round(joint_angle_2d(points, "right_knee_flex")),
+            "right_wrist_cock": _safe_round(joint_angle_2d(points, "right_wrist_cock")),
         }
         # Filter out None values (low-visibility landmarks)
         angles = {k: v for k, v in raw_angles.items() if v is not None}
 
-        sh_info = calc_shoulder_turn_dtl(frame_data)
+        sh_info = calc_shoulder_turn_dtl(frame_data, torso)
 
         phase_entry = {
             "swing_type": "iron",
@@ -75,7 +78,10 @@ def build_dtl_reference(landmarks_data):
             "timestamp_sec": frame_data["timestamp_sec"],
             "description": phase_info["description"],
             "angles": angles,
-            "shoulder_hip_geometry": sh_info,
+            "shoulder_hip_geometry": (
+                {k: round(v, 4) for k, v in sh_info.items()}
+                if sh_info is not None else None
+            ),
             "key_landmarks": key_landmarks,
         }
 
@@ -106,12 +112,12 @@ def build_dtl_reference(landmarks_data):
 
 def build_fo_reference(landmarks_data):
     """Build face-on reference data for all phases."""
-    frames = landmarks_data["frames"]
+    frames_by_num = {f["frame"]: f for f in landmarks_data["frames"]}
     phases = []
 
     for phase_name, phase_info in FO_PHASES.items():
         frame_num = phase_info["frame"]
-        frame_data = next(f for f in frames if f["frame"] == frame_num)
+        frame_data = frames_by_num[frame_num]
 
         # Extract key landmark positions
         key_landmarks = {}
@@ -127,17 +133,22 @@ def build_fo_reference(landmarks_data):
                 "visibility": lm["visibility"],
             }
 
-        # Compute angles (visibility filtering via get_landmark_2d in each calc_*)
+        # Fetch landmarks once per phase (None for low visibility) and
+        # compute every angle from the same points
+        points = get_landmarks_2d(frame_data, ANGLE_LANDMARKS)
+        torso = torso_frame(frame_data, points)
+        shoulder_line = line_angle_2d(points["left_shoulder"], points["right_shoulder"])
+        hip_line = line_angle_2d(points["left_hip"], points["right_hip"])
         raw_angles = {
-            "shoulder_line_angle": _safe_round(calc_shoulder_turn_fo(frame_data)),
-            "hip_line_angle": _safe_round(calc_hip_turn_fo(frame_data)),
-            "x_factor": _safe_round(calc_shoulder_hip_separation_fo(frame_data)),
-            "spine_tilt": _safe_round(calc_spine_tilt(frame_data)),
-            "lead_arm_torso": _safe_round(calc_lead_arm_torso_angle(frame_data)),
-            "right_knee_flex": _safe_round(calc_knee_flex(frame_data, "right")),
-            "left_knee_flex": _safe_round(calc_knee_flex(frame_data, "left")),
-            "right_elbow": _safe_round(calc_elbow_angle(frame_data, "right")),
-            "left_elbow": _safe_round(calc_elbow_angle(frame_data, "left")),
+            "shoulder_line_angle": _safe_round(shoulder_line),
+            "hip_line_angle": _safe_round(hip_line),
+            "x_factor": _safe_round(shoulder_hip_separation(shoulder_line, hip_line)),
+            "spine_tilt": _safe_round(calc_spine_tilt(frame_data, torso)),
+            "lead_arm_torso": _safe_round(joint_angle_2d(points, "lead_arm_torso")),
+            "right_knee_flex": _safe_round(joint_angle_2d(points, "right_knee_flex")),
+            "left_knee_flex": _safe_round(joint_angle_2d(points, "left_knee_flex")),
+            "right_elbow": _safe_round(joint_angle_2d(points, "right_elbow")),
+            "left_elbow": _safe_round(joint_angle_2d(points, "left_elbow")),
         }
         # Filter out None values (low-visibility landmarks)
         angles = {k: v for k, v in raw_angles.items() if v is not None}
@@ -178,30 +189,38 @@ def build_fo_reference(landmarks_data):
     }
 
 
+def _build_view(builder, landmarks_path):
+    """Load one view's landmarks and build its reference data."""
+    return builder(load_landmarks(landmarks_path))
+
+
 def main():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     output_dir = os.path.join(base_dir, "output")
     ref_dir = os.path.join(base_dir, "reference_data", "iron")
     os.makedirs(ref_dir, exist_ok=True)
 
-    # Load landmark data
-    dtl_data = load_landmarks(os.path.join(output_dir, "dtl_landmarks.json"))
-    fo_data = load_landmarks(os.path.join(output_dir, "fo_landmarks.json"))
-
-    # Build reference JSONs
-    dtl_ref = build_dtl_reference(dtl_data)
-    fo_ref = build_fo_reference(fo_data)
+    # Load landmark data and build reference JSONs, one process per view
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        dtl_future = pool.submit(
+            _build_view, build_dtl_reference,
+            os.path.join(output_dir, "dtl_landmarks.json"),
+        )
+        fo_future = pool.submit(
+            _build_view, build_fo_reference,
+            os.path.join(output_dir, "fo_landmarks.json"),
+        )
+        dtl_ref = dtl_future.result()
+        fo_ref = fo_future.result()
 
     # Save
     dtl_path = os.path.join(ref_dir, "tiger_2000_iron_dtl_reference.json")
     fo_path = os.path.join(ref_dir, "tiger_2000_iron_face_on_reference.json")
 
-    with open(dtl_path, "w") as f:
-        json.dump(dtl_ref, f, indent=2)
+    write_json(dtl_path, dtl_ref)
     print(f"Saved DTL reference: {dtl_path}")
 
-    with open(fo_path, "w") as f:
-        json.dump(fo_ref, f, indent=2)
+    write_json(fo_path, fo_ref)
     print(f"Saved FO reference: {fo_path}")
 
     # Print summary
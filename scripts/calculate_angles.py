@@ -13,10 +13,15 @@ Works with both DTL (down-the-line) and FO (face-on) views.
 Some angles are only meaningful from specific views.
 """
 
+import io
 import json
 import math
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from typing import NamedTuple, Optional
+
 import numpy as np
 
 
@@ -39,10 +44,32 @@ FO_PHASES = {
 
 
 def load_landmarks(json_path):
-    """Load landmark data from JSON file."""
-    with open(json_path) as f:
-        data = json.load(f)
-    return data
+    """Load landmark data from JSON file, using orjson when installed."""
+    try:
+        import orjson
+    except ImportError:
+        with open(json_path) as f:
+            return json.load(f)
+    with open(json_path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def write_json(path, data, indent=True):
+    """Write data as 2-space-indented (or compact) JSON, using orjson when installed."""
+    try:
+        import orjson
+    except ImportError:
+        with open(path, "w") as f:
+            if indent:
+                json.dump(data, f, indent=2)
+            else:
+                json.dump(data, f, separators=(",", ":"))
+        return
+    option = orjson.OPT_SERIALIZE_NUMPY
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(data, option=option))
 
 
 def get_landmark(frame_data, name):
@@ -64,6 +91,11 @@ def get_landmark_2d(frame_data, name):
     return np.array([lm["x"], lm["y"]])
 
 
+def get_landmarks_2d(frame_data, names):
+    """Fetch several landmarks at once: {name: (x, y) array, or None if low visibility}."""
+    return {name: get_landmark_2d(frame_data, name) for name in names}
+
+
 def angle_between_vectors(v1, v2):
     """Calculate angle in degrees between two 2D or 3D vectors."""
     cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2) + 1e-8)
@@ -81,13 +113,254 @@ def angle_at_joint(a, b, c):
     return angle_between_vectors(ba, bc)
 
 
+def angle_from_vertical(v):
+    """
+    Angle in degrees between 2D vector v and image-up (0, -1).
+    Closed form of angle_between_vectors(v, (0, -1)): the dot product is
+    just -v[1] and the vertical has unit length.
+    """
+    cos_angle = -v[1] / (math.hypot(v[0], v[1]) + 1e-8)
+    cos_angle = min(max(cos_angle, -1.0), 1.0)
+    return math.degrees(math.acos(cos_angle))
+
+
 def signed_angle_2d(v1, v2):
     """Signed angle from v1 to v2 in degrees (positive = counterclockwise)."""
     angle = math.atan2(v2[1], v2[0]) - math.atan2(v1[1], v1[0])
     return math.degrees(angle)
 
 
+# ─── Vectorised helpers (one row per phase frame) ───
+
+def vector_angles(v1, v2):
+    """Row-wise angle_between_vectors for (N, D) arrays; returns (N,) degrees."""
+    dot = np.einsum("ij,ij->i", v1, v2)
+    norms = np.linalg.norm(v1, axis=1) * np.linalg.norm(v2, axis=1)
+    cos_angle = np.clip(dot / (norms + 1e-8), -1.0, 1.0)
+    return np.degrees(np.arccos(cos_angle))
+
+
+def vertical_angles(v):
+    """Row-wise angle_from_vertical for an (N, 2) array; returns (N,) degrees."""
+    cos_angle = -v[:, 1] / (np.hypot(v[:, 0], v[:, 1]) + 1e-8)
+    return np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0)))
+
+
+def joint_angles(a, b, c):
+    """Row-wise angle_at_joint for (N, D) point arrays; returns (N,) degrees."""
+    return vector_angles(a - b, c - b)
+
+
+# Landmarks read by the angle functions, packed in this column order
+ANGLE_LANDMARKS = [
+    "left_shoulder", "right_shoulder", "left_elbow", "right_elbow",
+    "left_wrist", "right_wrist", "left_index", "right_index",
+    "left_hip", "right_hip", "left_knee", "right_knee",
+    "left_ankle", "right_ankle",
+]
+ANGLE_LANDMARK_IDX = {name: i for i, name in enumerate(ANGLE_LANDMARKS)}
+# Column indices of the torso landmarks in packed coords
+LS, RS = ANGLE_LANDMARK_IDX["left_shoulder"], ANGLE_LANDMARK_IDX["right_shoulder"]
+LH, RH = ANGLE_LANDMARK_IDX["left_hip"], ANGLE_LANDMARK_IDX["right_hip"]
+
+_MISSING_LANDMARK = {"x": math.nan, "y": math.nan, "visibility": 0.0}
+
+
+def pack_landmarks_2d(frames, names=ANGLE_LANDMARKS):
+    """
+    Pack (x, y) and visibility of the named landmarks into arrays.
+    Returns (coords, visible): coords is (N, L, 2) and visible is an (N, L)
+    mask using the same VISIBILITY_THRESHOLD rule as get_landmark_2d.
+    """
+    lms = [
+        [f["landmarks"].get(name, _MISSING_LANDMARK) for name in names]
+        for f in frames
+    ]
+    coords = np.array(
+        [[(lm["x"], lm["y"]) for lm in row] for row in lms], dtype=np.float64
+    ).reshape(len(frames), len(names), 2)
+    vis = np.array(
+        [[lm.get("visibility", 1.0) for lm in row] for row in lms],
+        dtype=np.float64,
+    ).reshape(len(frames), len(names))
+    return coords, vis >= VISIBILITY_THRESHOLD
+
+
+# Decimal places kept in analyze_video's results: angles in degrees, and
+# the DTL shoulder/hip geometry (normalized distances, not angles)
+ANGLE_DECIMALS = 1
+GEOMETRY_DECIMALS = 4
+
+DTL_GEOMETRY_KEYS = (
+    "shoulder_width_apparent", "hip_width_apparent", "shoulder_hip_offset_x",
+)
+
+# Joint angles as (point_a, vertex, point_c) landmark triples
+JOINT_ANGLES = {
+    "lead_arm_torso": ("left_elbow", "left_shoulder", "left_hip"),
+    "trail_arm_torso": ("right_elbow", "right_shoulder", "right_hip"),
+    "right_elbow": ("right_shoulder", "right_elbow", "right_wrist"),
+    "left_elbow": ("left_shoulder", "left_elbow", "left_wrist"),
+    "right_knee_flex": ("right_hip", "right_knee", "right_ankle"),
+    "left_knee_flex": ("left_hip", "left_knee", "left_ankle"),
+    "right_wrist_cock": ("right_elbow", "right_wrist", "right_index"),
+    "left_wrist_cock": ("left_elbow", "left_wrist", "left_index"),
+}
+# JOINT_ANGLES as packed column indices, resolved once at import
+JOINT_ANGLE_IDX = {
+    name: tuple(ANGLE_LANDMARK_IDX[lm] for lm in lms)
+    for name, lms in JOINT_ANGLES.items()
+}
+
+
+def joint_angle_2d(points, name):
+    """
+    JOINT_ANGLES[name] from pre-fetched points (see get_landmarks_2d),
+    or None if any of its landmarks is low visibility.
+    """
+    a, b, c = (points[lm] for lm in JOINT_ANGLES[name])
+    if a is None or b is None or c is None:
+        return None
+    return angle_at_joint(a, b, c)
+
+
+def line_angle_2d(a, b):
+    """Angle in degrees of the line a -> b from horizontal, or None if either is."""
+    if a is None or b is None:
+        return None
+    vec = b - a
+    return math.degrees(math.atan2(vec[1], vec[0]))
+
+
+def batch_joint_angles(coords, visible, names):
+    """
+    Compute the named JOINT_ANGLES for every packed frame at once.
+    Returns {name: [angle or None per frame]}.
+    """
+    results = {}
+    for name in names:
+        ai, bi, ci = JOINT_ANGLE_IDX[name]
+        values = joint_angles(coords[:, ai], coords[:, bi], coords[:, ci]).tolist()
+        ok = (visible[:, ai] & visible[:, bi] & visible[:, ci]).tolist()
+        results[name] = [v if is_ok else None for v, is_ok in zip(values, ok)]
+    return results
+
+
+def batch_phase_angles(coords, visible, view_label):
+    """
+    Compute all of a view's angles for every packed frame at once.
+    Returns one angles dict per frame, matching the calc_* functions
+    (None where a required landmark is low visibility).
+    """
+    n = len(coords)
+    ls, rs = coords[:, LS], coords[:, RS]
+    lh, rh = coords[:, LH], coords[:, RH]
+    shoulders_ok = (visible[:, LS] & visible[:, RS]).tolist()
+    hips_ok = (visible[:, LH] & visible[:, RH]).tolist()
+    torso_ok = [s and h for s, h in zip(shoulders_ok, hips_ok)]
+
+    shoulder_mid = (ls + rs) / 2
+    hip_mid = (lh + rh) / 2
+    spine_vec = shoulder_mid - hip_mid
+    spine_angle = vertical_angles(spine_vec).tolist()
+
+    def masked(values, ok):
+        return [v if o else None for v, o in zip(values, ok)]
+
+    if view_label == "dtl":
+        joint = batch_joint_angles(coords, visible, [
+            "lead_arm_torso", "trail_arm_torso", "right_elbow",
+            "left_elbow", "right_knee_flex", "right_wrist_cock",
+        ])
+        columns = {"spine_angle_dtl": masked(spine_angle, torso_ok), **joint}
+
+        # Shoulder/hip geometry (DTL) — only reported when all four are visible
+        shoulder_width = np.linalg.norm(rs - ls, axis=1).tolist()
+        hip_width = np.linalg.norm(rh - lh, axis=1).tolist()
+        offset_x = (shoulder_mid[:, 0] - hip_mid[:, 0]).tolist()
+        rows = [{name: values[i] for name, values in columns.items()} for i in range(n)]
+        for i, row in enumerate(rows):
+            if torso_ok[i]:
+                row["shoulder_width_apparent"] = shoulder_width[i]
+                row["hip_width_apparent"] = hip_width[i]
+                row["shoulder_hip_offset_x"] = offset_x[i]
+        return rows
+
+    if view_label == "fo":
+        # Shoulder and hip line angles from one arctan2 over stacked vectors
+        line_vecs = np.stack([rs - ls, rh - lh])  # (2, N, 2)
+        line_angles = np.degrees(
+            np.arctan2(line_vecs[..., 1], line_vecs[..., 0])
+        ).tolist()
+        shoulder_line = masked(line_angles[0], shoulders_ok)
+        hip_line = masked(line_angles[1], hips_ok)
+        # X-factor as the shortest angular distance between the line angles
+        x_factor = [
+            (s - h + 180) % 360 - 180
+            if s is not None and h is not None else None
+            for s, h in zip(shoulder_line, hip_line)
+        ]
+        # Sign: positive = tilting toward target (shoulders right of hips)
+        spine_tilt = masked(
+            [
+                -a if x < 0 else a
+                for a, x in zip(spine_angle, spine_vec[:, 0].tolist())
+            ],
+            torso_ok,
+        )
+        joint = batch_joint_angles(coords, visible, [
+            "lead_arm_torso", "right_knee_flex", "left_knee_flex",
+            "right_elbow", "left_elbow",
+        ])
+        columns = {
+            "shoulder_line_angle": shoulder_line,
+            "hip_line_angle": hip_line,
+            "x_factor": x_factor,
+            "spine_tilt_fo": spine_tilt,
+            **joint,
+        }
+        return [{name: values[i] for name, values in columns.items()} for i in range(n)]
+
+    return [{} for _ in range(n)]
+
+
 # ─── Angle calculation functions ───
+# Each calc_* takes a frame dict. Callers computing several angles for the
+# same frame can fetch landmarks once with get_landmarks_2d and use the
+# point-based joint_angle_2d / line_angle_2d / torso_frame(points=...).
+
+def _calc_joint(frame_data, name):
+    """JOINT_ANGLES[name] for a single frame dict."""
+    return joint_angle_2d(get_landmarks_2d(frame_data, JOINT_ANGLES[name]), name)
+
+
+TORSO_LANDMARKS = ("left_shoulder", "right_shoulder", "left_hip", "right_hip")
+
+
+def torso_frame(frame_data, points=None):
+    """
+    Shoulder/hip geometry shared by the torso-based angle functions.
+    Returns a dict with the four landmarks, shoulder_mid, hip_mid and
+    spine_vec (hip midpoint to shoulder midpoint), or None if any of the
+    four landmarks is low visibility. Compute it once per frame and pass
+    it as `torso=` to avoid recomputing it in each calc_* call. Landmarks
+    come from `points` (see get_landmarks_2d) when given.
+    """
+    if points is None:
+        points = get_landmarks_2d(frame_data, TORSO_LANDMARKS)
+    ls, rs, lh, rh = (points[name] for name in TORSO_LANDMARKS)
+    if ls is None or rs is None or lh is None or rh is None:
+        return None
+
+    shoulder_mid = (ls + rs) / 2
+    hip_mid = (lh + rh) / 2
+    return {
+        "ls": ls, "rs": rs, "lh": lh, "rh": rh,
+        "shoulder_mid": shoulder_mid,
+        "hip_mid": hip_mid,
+        "spine_vec": shoulder_mid - hip_mid,
+    }
+
 
 def calc_shoulder_turn_fo(frame_data):
     """
@@ -99,21 +372,14 @@ def calc_shoulder_turn_fo(frame_data):
     We measure the apparent rotation by looking at how much the shoulder
     line has compressed (foreshortened) in the face-on view.
     """
-    ls = get_landmark_2d(frame_data, "left_shoulder")
-    rs = get_landmark_2d(frame_data, "right_shoulder")
-    if ls is None or rs is None:
-        return None
+    # Angle of shoulder line (left -> right shoulder) from horizontal
+    return line_angle_2d(
+        get_landmark_2d(frame_data, "left_shoulder"),
+        get_landmark_2d(frame_data, "right_shoulder"),
+    )
 
-    # Shoulder line vector
-    shoulder_vec = rs - ls
 
-    # Angle of shoulder line from horizontal
-    angle = math.degrees(math.atan2(shoulder_vec[1], shoulder_vec[0]))
-
-    return round(angle, 1)
-
-
-def calc_shoulder_turn_dtl(frame_data):
+def calc_shoulder_turn_dtl(frame_data, torso=None):
     """
     Shoulder turn from DTL view.
     Measures how much the shoulders have rotated by looking at the
@@ -121,29 +387,23 @@ def calc_shoulder_turn_dtl(frame_data):
 
     We use the ratio of shoulder width to estimate rotation angle.
     """
-    ls = get_landmark_2d(frame_data, "left_shoulder")
-    rs = get_landmark_2d(frame_data, "right_shoulder")
-    lh = get_landmark_2d(frame_data, "left_hip")
-    rh = get_landmark_2d(frame_data, "right_hip")
-    if ls is None or rs is None or lh is None or rh is None:
+    t = torso or torso_frame(frame_data)
+    if t is None:
         return None
 
-    shoulder_mid = (ls + rs) / 2
-    hip_mid = (lh + rh) / 2
-
     # Shoulder width (apparent)
-    shoulder_width = np.linalg.norm(rs - ls)
+    shoulder_width = np.linalg.norm(t["rs"] - t["ls"])
     # Hip width (apparent)
-    hip_width = np.linalg.norm(rh - lh)
+    hip_width = np.linalg.norm(t["rh"] - t["lh"])
 
     # In DTL view, horizontal displacement of shoulder center vs hip center
     # indicates rotation
-    dx = shoulder_mid[0] - hip_mid[0]
+    dx = t["shoulder_mid"][0] - t["hip_mid"][0]
 
     return {
-        "shoulder_width": round(float(shoulder_width), 4),
-        "hip_width": round(float(hip_width), 4),
-        "shoulder_hip_offset_x": round(float(dx), 4),
+        "shoulder_width": float(shoulder_width),
+        "hip_width": float(hip_width),
+        "shoulder_hip_offset_x": float(dx),
     }
 
 
@@ -152,47 +412,34 @@ def calc_hip_turn_fo(frame_data):
     Hip turn from face-on view.
     Measures the angle of the hip line relative to horizontal.
     """
-    lh = get_landmark_2d(frame_data, "left_hip")
-    rh = get_landmark_2d(frame_data, "right_hip")
-    if lh is None or rh is None:
-        return None
-
-    hip_vec = rh - lh
-    angle = math.degrees(math.atan2(hip_vec[1], hip_vec[0]))
+    return line_angle_2d(
+        get_landmark_2d(frame_data, "left_hip"),
+        get_landmark_2d(frame_data, "right_hip"),
+    )
 
-    return round(angle, 1)
 
-
-def calc_spine_tilt(frame_data):
+def calc_spine_tilt(frame_data, torso=None):
     """
     Spine tilt angle from vertical.
     Measured as angle between the spine line (hip midpoint to shoulder midpoint)
     and the vertical axis.
     Works from both views.
     """
-    ls = get_landmark_2d(frame_data, "left_shoulder")
-    rs = get_landmark_2d(frame_data, "right_shoulder")
-    lh = get_landmark_2d(frame_data, "left_hip")
-    rh = get_landmark_2d(frame_data, "right_hip")
-    if ls is None or rs is None or lh is None or rh is None:
+    t = torso or torso_frame(frame_data)
+    if t is None:
         return None
 
-    shoulder_mid = (ls + rs) / 2
-    hip_mid = (lh + rh) / 2
-
     # Spine vector (hip to shoulder)
-    spine_vec = shoulder_mid - hip_mid
+    spine_vec = t["spine_vec"]
 
-    # Vertical vector (pointing up, i.e., negative Y in image coords)
-    vertical = np.array([0, -1])
-
-    angle = angle_between_vectors(spine_vec, vertical)
+    # Angle from vertical (pointing up, i.e., negative Y in image coords)
+    angle = angle_from_vertical(spine_vec)
 
     # Sign: positive = tilting toward target (left for right-handed)
     # In image coords, if shoulder_mid.x < hip_mid.x, tilting left
     sign = -1 if spine_vec[0] < 0 else 1
 
-    return round(sign * angle, 1)
+    return sign * angle
 
 
 def calc_lead_arm_torso_angle(frame_data, view="dtl"):
@@ -200,13 +447,7 @@ def calc_lead_arm_torso_angle(frame_data, view="dtl"):
     Angle between the lead arm (left arm for right-handed golfer) and the torso.
     Measured as angle at left shoulder between left elbow and left hip.
     """
-    ls = get_landmark_2d(frame_data, "left_shoulder")
-    le = get_landmark_2d(frame_data, "left_elbow")
-    lh = get_landmark_2d(frame_data, "left_hip")
-    if ls is None or le is None or lh is None:
-        return None
-
-    return round(angle_at_joint(le, ls, lh), 1)
+    return _calc_joint(frame_data, "lead_arm_torso")
 
 
 def calc_trail_arm_torso_angle(frame_data):
@@ -214,13 +455,7 @@ def calc_trail_arm_torso_angle(frame_data):
     Angle between the trail arm (right arm for right-handed golfer) and the torso.
     Measured as angle at right shoulder between right elbow and right hip.
     """
-    rs = get_landmark_2d(frame_data, "right_shoulder")
-    re = get_landmark_2d(frame_data, "right_elbow")
-    rh = get_landmark_2d(frame_data, "right_hip")
-    if rs is None or re is None or rh is None:
-        return None
-
-    return round(angle_at_joint(re, rs, rh), 1)
+    return _calc_joint(frame_data, "trail_arm_torso")
 
 
 def calc_wrist_cock(frame_data, side="left"):
@@ -228,18 +463,8 @@ def calc_wrist_cock(frame_data, side="left"):
     Wrist cock angle - angle at the wrist between forearm and hand.
     Measured as angle at wrist between elbow and index finger.
     """
-    if side == "left":
-        elbow = get_landmark_2d(frame_data, "left_elbow")
-        wrist = get_landmark_2d(frame_data, "left_wrist")
-        index = get_landmark_2d(frame_data, "left_index")
-    else:
-        elbow = get_landmark_2d(frame_data, "right_elbow")
-        wrist = get_landmark_2d(frame_data, "right_wrist")
-        index = get_landmark_2d(frame_data, "right_index")
-    if elbow is None or wrist is None or index is None:
-        return None
-
-    return round(angle_at_joint(elbow, wrist, index), 1)
+    name = "left_wrist_cock" if side == "left" else "right_wrist_cock"
+    return _calc_joint(frame_data, name)
 
 
 def calc_knee_flex(frame_data, side="right"):
@@ -247,18 +472,8 @@ def calc_knee_flex(frame_data, side="right"):
     Knee flex angle. Measured at the knee between hip and ankle.
     Straight leg = 180°, flexed = less.
     """
-    if side == "right":
-        hip = get_landmark_2d(frame_data, "right_hip")
-        knee = get_landmark_2d(frame_data, "right_knee")
-        ankle = get_landmark_2d(frame_data, "right_ankle")
-    else:
-        hip = get_landmark_2d(frame_data, "left_hip")
-        knee = get_landmark_2d(frame_data, "left_knee")
-        ankle = get_landmark_2d(frame_data, "left_ankle")
-    if hip is None or knee is None or ankle is None:
-        return None
-
-    return round(angle_at_joint(hip, knee, ankle), 1)
+    name = "right_knee_flex" if side == "right" else "left_knee_flex"
+    return _calc_joint(frame_data, name)
 
 
 def calc_shoulder_hip_separation_fo(frame_data):
@@ -267,36 +482,34 @@ def calc_shoulder_hip_separation_fo(frame_data):
     from face-on view. This represents the separation between upper and
     lower body rotation - a key power metric.
     """
-    shoulder_angle = calc_shoulder_turn_fo(frame_data)
-    hip_angle = calc_hip_turn_fo(frame_data)
+    return shoulder_hip_separation(
+        calc_shoulder_turn_fo(frame_data), calc_hip_turn_fo(frame_data)
+    )
+
+
+def shoulder_hip_separation(shoulder_angle, hip_angle):
+    """
+    X-Factor from already computed shoulder and hip line angles, so callers
+    that report those angles too don't recompute them. None if either is.
+    """
     if shoulder_angle is None or hip_angle is None:
         return None
     # Use shortest angular distance to handle atan2 wraparound at ±180°
     d = shoulder_angle - hip_angle
-    d = (d + 180) % 360 - 180
-    return round(d, 1)
+    return (d + 180) % 360 - 180
 
 
-def calc_forward_bend_dtl(frame_data):
+def calc_forward_bend_dtl(frame_data, torso=None):
     """
     Forward bend (spine angle from DTL view).
     Angle between the spine line and vertical, as seen from behind.
     This is the primary "spine angle" in golf instruction.
     """
-    ls = get_landmark_2d(frame_data, "left_shoulder")
-    rs = get_landmark_2d(frame_data, "right_shoulder")
-    lh = get_landmark_2d(frame_data, "left_hip")
-    rh = get_landmark_2d(frame_data, "right_hip")
-    if ls is None or rs is None or lh is None or rh is None:
+    t = torso or torso_frame(frame_data)
+    if t is None:
         return None
 
-    shoulder_mid = (ls + rs) / 2
-    hip_mid = (lh + rh) / 2
-
-    spine_vec = shoulder_mid - hip_mid
-    vertical = np.array([0, -1])
-
-    return round(angle_between_vectors(spine_vec, vertical), 1)
+    return angle_from_vertical(t["spine_vec"])
 
 
 def calc_elbow_angle(frame_data, side="right"):
@@ -304,18 +517,8 @@ def calc_elbow_angle(frame_data, side="right"):
     Elbow angle (arm straightness).
     180° = fully extended, less = bent.
     """
-    if side == "right":
-        shoulder = get_landmark_2d(frame_data, "right_shoulder")
-        elbow = get_landmark_2d(frame_data, "right_elbow")
-        wrist = get_landmark_2d(frame_data, "right_wrist")
-    else:
-        shoulder = get_landmark_2d(frame_data, "left_shoulder")
-        elbow = get_landmark_2d(frame_data, "left_elbow")
-        wrist = get_landmark_2d(frame_data, "left_wrist")
-    if shoulder is None or elbow is None or wrist is None:
-        return None
-
-    return round(angle_at_joint(shoulder, elbow, wrist), 1)
+    name = "right_elbow" if side == "right" else "left_elbow"
+    return _calc_joint(frame_data, name)
 
 
 # ─── Main analysis ───
@@ -330,63 +533,46 @@ def analyze_video(landmarks_data, phases, view_label):
     print(f"  ANGLE ANALYSIS: {view_label.upper()} VIEW")
     print(f"{'='*70}")
 
+    # Resolve each phase's frame, then compute every angle for all phases
+    # in one batch (row i = i-th resolved phase)
+    frame_by_num = {f["frame"]: f for f in frames}
+    phase_frames = {}
     for phase_name, phase_info in phases.items():
-        frame_num = phase_info["frame"]
+        f = frame_by_num.get(phase_info["frame"])
+        if f is not None and f["detected"]:
+            phase_frames[phase_name] = f
+
+    phase_rows = {name: row for row, name in enumerate(phase_frames)}
+    coords, visible = pack_landmarks_2d(list(phase_frames.values()))
+    phase_angles = batch_phase_angles(coords, visible, view_label)
 
-        # Find the frame data
-        frame_data = None
-        for f in frames:
-            if f["frame"] == frame_num:
-                frame_data = f
-                break
+    for phase_name, phase_info in phases.items():
+        frame_num = phase_info["frame"]
+        frame_data = phase_frames.get(phase_name)
 
-        if frame_data is None or not frame_data["detected"]:
+        if frame_data is None:
             print(f"\n  WARNING: Frame {frame_num} not found or no detection for phase '{phase_name}'")
             continue
 
         print(f"\n  --- {phase_name.upper()} (Frame {frame_num}, t={frame_data['timestamp_sec']:.3f}s) ---")
         print(f"  {phase_info['description']}")
 
-        angles = {}
-
-        if view_label == "dtl":
-            # DTL-specific angles
-            angles["spine_angle_dtl"] = calc_forward_bend_dtl(frame_data)
-            angles["lead_arm_torso"] = calc_lead_arm_torso_angle(frame_data)
-            angles["trail_arm_torso"] = calc_trail_arm_torso_angle(frame_data)
-            angles["right_elbow"] = calc_elbow_angle(frame_data, "right")
-            angles["left_elbow"] = calc_elbow_angle(frame_data, "left")
-            angles["right_knee_flex"] = calc_knee_flex(frame_data, "right")
-
-            # Wrist cock (visibility checked inside calc_wrist_cock via get_landmark_2d)
-            angles["right_wrist_cock"] = calc_wrist_cock(frame_data, "right")
-
-            # Shoulder/hip info from DTL
-            sh_info = calc_shoulder_turn_dtl(frame_data)
-            if sh_info is not None:
-                angles["shoulder_width_apparent"] = sh_info["shoulder_width"]
-                angles["hip_width_apparent"] = sh_info["hip_width"]
-                angles["shoulder_hip_offset_x"] = sh_info["shoulder_hip_offset_x"]
-
-        elif view_label == "fo":
-            # Face-on specific angles
-            angles["shoulder_line_angle"] = calc_shoulder_turn_fo(frame_data)
-            angles["hip_line_angle"] = calc_hip_turn_fo(frame_data)
-            angles["x_factor"] = calc_shoulder_hip_separation_fo(frame_data)
-            angles["spine_tilt_fo"] = calc_spine_tilt(frame_data)
-            angles["lead_arm_torso"] = calc_lead_arm_torso_angle(frame_data)
-            angles["right_knee_flex"] = calc_knee_flex(frame_data, "right")
-            angles["left_knee_flex"] = calc_knee_flex(frame_data, "left")
-            angles["right_elbow"] = calc_elbow_angle(frame_data, "right")
-            angles["left_elbow"] = calc_elbow_angle(frame_data, "left")
-
-        # Filter out None values (low-visibility landmarks)
+        angles = phase_angles[phase_rows[phase_name]]
+
+        # Filter out None values (low-visibility landmarks). Angles are kept
+        # unrounded through the math and only rounded here for output.
         skipped = [name for name, val in angles.items() if val is None]
-        angles = {k: v for k, v in angles.items() if v is not None}
+        angles = {
+            k: round(v, GEOMETRY_DECIMALS if k in DTL_GEOMETRY_KEYS else ANGLE_DECIMALS)
+            for k, v in angles.items() if v is not None
+        }
 
         # Print angles
         for name, value in angles.items():
-            print(f"    {name:30s}: {value}°" if isinstance(value, (int, float)) else f"    {name:30s}: {value}")
+            if name in DTL_GEOMETRY_KEYS:
+                print(f"    {name:30s}: {value:.4f}")
+            else:
+                print(f"    {name:30s}: {value:.1f}°")
         if skipped:
             print(f"    {'(skipped, low visibility)':30s}: {', '.join(skipped)}")
 
@@ -400,6 +586,66 @@ def analyze_video(landmarks_data, phases, view_label):
     return results
 
 
+# ─── Validation norms ───
+
+class ValidationNorm(NamedTuple):
+    """One validation check, listed in report order."""
+    label: str
+    view: str
+    requires: tuple   # phases that must be present for the check to run
+    phase: str
+    angle: str
+    measure: str      # "value", "change" (|angle - address angle|) or "magnitude" (|angle|)
+    op: str           # "between" (low <= x <= high), ">" (x > low) or "always"
+    low: Optional[float]
+    high: Optional[float]
+    actual_fmt: str
+    expected: str
+
+
+VALIDATION_NORMS = [
+    ValidationNorm("DTL Address: Spine angle", "dtl", ("address",), "address",
+                   "spine_angle_dtl", "value", "between", 20, 50,
+                   "{value:.1f}°", "20-50°"),
+    ValidationNorm("DTL Address: Right knee flex", "dtl", ("address",), "address",
+                   "right_knee_flex", "value", "between", 130, 175,
+                   "{value:.1f}°", "130-175°"),
+    ValidationNorm("DTL Top: Spine angle maintained", "dtl", ("top",), "top",
+                   "spine_angle_dtl", "change", "between", 0, 15,
+                   "{value:.1f}° (Δ{measured:.1f}° from address)", "within 15° of address"),
+    ValidationNorm("DTL Top: Right elbow angle", "dtl", ("top",), "top",
+                   "right_elbow", "value", "between", 70, 110,
+                   "{value:.1f}°", "70-110° (folded)"),
+    ValidationNorm("DTL Impact: Spine angle maintained", "dtl", ("impact",), "impact",
+                   "spine_angle_dtl", "change", "between", 0, 15,
+                   "{value:.1f}° (Δ{measured:.1f}° from address)", "within 15° of address"),
+    ValidationNorm("FO Top: Shoulder line angle change", "fo", ("address", "top"), "top",
+                   "shoulder_line_angle", "change", ">", 3, None,
+                   "{measured:.1f}° change", ">5° change (foreshortening)"),
+    ValidationNorm("FO Top: X-Factor", "fo", ("address", "top"), "top",
+                   "x_factor", "magnitude", ">", 1, None,
+                   "{value:.1f}°", "non-zero separation"),
+    ValidationNorm("FO Address: Right knee flex", "fo", ("address",), "address",
+                   "right_knee_flex", "value", "between", 130, 175,
+                   "{value:.1f}°", "130-175°"),
+    ValidationNorm("FO Address: Left knee flex", "fo", ("address",), "address",
+                   "left_knee_flex", "value", "between", 130, 175,
+                   "{value:.1f}°", "130-175°"),
+    ValidationNorm("FO Impact: Spine tilt", "fo", ("impact",), "impact",
+                   "spine_tilt_fo", "value", "always", None, None,
+                   "{value:.1f}°", "tilted away from target"),
+]
+
+
+def _norm_passes(norm, measured):
+    """Apply a norm's comparison to its measured value."""
+    if norm.op == "between":
+        return norm.low <= measured <= norm.high
+    if norm.op == ">":
+        return measured > norm.low
+    return True
+
+
 def validate_angles(dtl_results, fo_results):
     """
     Validate computed angles against golf instruction norms for Tiger Woods.
@@ -426,69 +672,22 @@ def validate_angles(dtl_results, fo_results):
     print(f"  VALIDATION AGAINST GOLF INSTRUCTION NORMS")
     print(f"{'='*70}")
 
+    results_by_view = {"dtl": dtl_results, "fo": fo_results}
     checks = []
-
-    # --- DTL Checks ---
-    if "address" in dtl_results:
-        addr = dtl_results["address"]["angles"]
-        spine = addr.get("spine_angle_dtl", 0)
-        knee = addr.get("right_knee_flex", 0)
-
-        ok = 20 <= spine <= 50
-        checks.append(("DTL Address: Spine angle", f"{spine}°", "20-50°", ok))
-
-        ok = 130 <= knee <= 175
-        checks.append(("DTL Address: Right knee flex", f"{knee}°", "130-175°", ok))
-
-    if "top" in dtl_results:
-        top = dtl_results["top"]["angles"]
-        spine = top.get("spine_angle_dtl", 0)
-        addr_spine = dtl_results.get("address", {}).get("angles", {}).get("spine_angle_dtl", 0)
-
-        # Spine angle should be maintained within ~10° of address
-        diff = abs(spine - addr_spine)
-        ok = diff <= 15
-        checks.append(("DTL Top: Spine angle maintained", f"{spine}° (Δ{diff:.1f}° from address)", "within 15° of address", ok))
-
-        r_elbow = top.get("right_elbow", 0)
-        ok = 70 <= r_elbow <= 110
-        checks.append(("DTL Top: Right elbow angle", f"{r_elbow}°", "70-110° (folded)", ok))
-
-    if "impact" in dtl_results:
-        imp = dtl_results["impact"]["angles"]
-        spine = imp.get("spine_angle_dtl", 0)
-        addr_spine = dtl_results.get("address", {}).get("angles", {}).get("spine_angle_dtl", 0)
-
-        diff = abs(spine - addr_spine)
-        ok = diff <= 15
-        checks.append(("DTL Impact: Spine angle maintained", f"{spine}° (Δ{diff:.1f}° from address)", "within 15° of address", ok))
-
-    # --- FO Checks ---
-    if "address" in fo_results and "top" in fo_results:
-        addr_shoulder = fo_results["address"]["angles"].get("shoulder_line_angle", 0)
-        top_shoulder = fo_results["top"]["angles"].get("shoulder_line_angle", 0)
-
-        # At top, shoulder line should tilt significantly
-        shoulder_change = abs(top_shoulder - addr_shoulder)
-        checks.append(("FO Top: Shoulder line angle change", f"{shoulder_change:.1f}° change", ">5° change (foreshortening)", shoulder_change > 3))
-
-        x_factor = fo_results["top"]["angles"].get("x_factor", 0)
-        checks.append(("FO Top: X-Factor", f"{x_factor}°", "non-zero separation", abs(x_factor) > 1))
-
-    if "address" in fo_results:
-        addr_fo = fo_results["address"]["angles"]
-        r_knee = addr_fo.get("right_knee_flex", 0)
-        l_knee = addr_fo.get("left_knee_flex", 0)
-
-        ok = 130 <= r_knee <= 175
-        checks.append(("FO Address: Right knee flex", f"{r_knee}°", "130-175°", ok))
-        ok = 130 <= l_knee <= 175
-        checks.append(("FO Address: Left knee flex", f"{l_knee}°", "130-175°", ok))
-
-    if "impact" in fo_results:
-        imp_fo = fo_results["impact"]["angles"]
-        spine_tilt = imp_fo.get("spine_tilt_fo", 0)
-        checks.append(("FO Impact: Spine tilt", f"{spine_tilt}°", "tilted away from target", True))
+    for norm in VALIDATION_NORMS:
+        results = results_by_view[norm.view]
+        if not all(p in results for p in norm.requires):
+            continue
+        value = results[norm.phase]["angles"].get(norm.angle, 0)
+        if norm.measure == "change":
+            base = results.get("address", {}).get("angles", {}).get(norm.angle, 0)
+            measured = abs(value - base)
+        elif norm.measure == "magnitude":
+            measured = abs(value)
+        else:
+            measured = value
+        actual = norm.actual_fmt.format(value=value, measured=measured)
+        checks.append((norm.label, actual, norm.expected, _norm_passes(norm, measured)))
 
     # Print validation results
     print()
@@ -514,6 +713,28 @@ def validate_angles(dtl_results, fo_results):
     return checks
 
 
+def _run_view(landmarks_path, view_label, auto_detect):
+    """
+    Load one view's landmarks, pick its phase frames and analyze it.
+    Runs in a worker process; the printed report is captured and returned
+    as (results, phases, report) so concurrent views don't interleave.
+    """
+    report = io.StringIO()
+    with redirect_stdout(report):
+        landmarks_data = load_landmarks(landmarks_path)
+        if auto_detect:
+            from detect_phases import detect_phases
+            phases = detect_phases(landmarks_data, view=view_label)
+            phases.pop("_diagnostics", None)
+        else:
+            phases = DTL_PHASES if view_label == "dtl" else FO_PHASES
+
+        results = {}
+        if landmarks_data and phases:
+            results = analyze_video(landmarks_data, phases, view_label)
+    return results, phases, report.getvalue()
+
+
 def main():
     import argparse
 
@@ -532,40 +753,34 @@ def main():
     dtl_path = args.dtl or os.path.join(output_dir, "dtl_landmarks.json")
     fo_path = args.fo or os.path.join(output_dir, "fo_landmarks.json")
 
-    dtl_data = None
-    fo_data = None
-
-    if os.path.exists(dtl_path):
-        dtl_data = load_landmarks(dtl_path)
-    if os.path.exists(fo_path):
-        fo_data = load_landmarks(fo_path)
-
-    if dtl_data is None and fo_data is None:
+    view_paths = {
+        label: path
+        for label, path in (("dtl", dtl_path), ("fo", fo_path))
+        if os.path.exists(path)
+    }
+    if not view_paths:
         print("ERROR: No landmark files found. Run extract_landmarks.py first.")
         sys.exit(1)
 
-    # Determine phase frames
-    if args.auto_detect:
-        from detect_phases import detect_phases
-        dtl_phases = None
-        fo_phases = None
-        if dtl_data:
-            dtl_phases = detect_phases(dtl_data, view="dtl")
-            dtl_phases.pop("_diagnostics", None)
-        if fo_data:
-            fo_phases = detect_phases(fo_data, view="fo")
-            fo_phases.pop("_diagnostics", None)
-    else:
-        dtl_phases = DTL_PHASES
-        fo_phases = FO_PHASES
+    # Load, detect phases and analyze each view in its own process
+    with ProcessPoolExecutor(max_workers=len(view_paths)) as pool:
+        futures = {
+            label: pool.submit(_run_view, path, label, args.auto_detect)
+            for label, path in view_paths.items()
+        }
+        outputs = {label: future.result() for label, future in futures.items()}
+
+    # Print each view's report in a fixed order once both are done
+    for results, phases, report in outputs.values():
+        print(report, end="")
 
-    # Analyze views
-    dtl_results = {}
-    fo_results = {}
-    if dtl_data and dtl_phases:
-        dtl_results = analyze_video(dtl_data, dtl_phases, "dtl")
-    if fo_data and fo_phases:
-        fo_results = analyze_video(fo_data, fo_phases, "fo")
+    # Views without a landmark file keep the default (or no) phase frames
+    dtl_results, dtl_phases, _ = outputs.get(
+        "dtl", ({}, None if args.auto_detect else DTL_PHASES, "")
+    )
+    fo_results, fo_phases, _ = outputs.get(
+        "fo", ({}, None if args.auto_detect else FO_PHASES, "")
+    )
 
     # Validate against norms
     checks = validate_angles(dtl_results, fo_results)
@@ -585,8 +800,7 @@ def main():
     }
 
     angles_path = args.output or os.path.join(output_dir, "angle_analysis.json")
-    with open(angles_path, "w") as f:
-        json.dump(combined, f, indent=2)
+    write_json(angles_path, combined)
 
     print(f"\n  Angle analysis saved to: {angles_path}")
 
@@ -17,10 +17,11 @@ Usage:
 """
 
 import argparse
-import json
 import math
 import os
 import sys
+from functools import lru_cache
+
 import numpy as np
 
 
@@ -57,6 +58,44 @@ def _argmax_hysteresis(arr, epsilon=1e-4):
     return int(candidates[0])  # earliest frame wins
 
 
+def _local_minima_mask(y, reach):
+    """Boolean mask over y[2:len(y) - 2]: True where y[i] is <= every
+    neighbour within `reach` frames (1 or 2), from shifted-slice comparisons
+    rather than a per-frame Python loop. NaN never qualifies.
+    """
+    n = len(y)
+    if n <= 4:
+        return np.zeros(0, dtype=bool)
+    core = y[2:n - 2]
+    mask = np.ones(n - 4, dtype=bool)
+    for k in range(1, reach + 1):
+        mask &= (core <= y[2 - k:n - 2 - k]) & (core <= y[2 + k:n - 2 + k])
+    return mask
+
+
+def _local_minima(y, reach):
+    """Index array of all local minima in _local_minima_mask(y, reach), in order."""
+    return np.flatnonzero(_local_minima_mask(y, reach)) + 2
+
+
+def _still_run_bounds(still_mask):
+    """(starts, ends) inclusive index arrays of every run of True in
+    still_mask, in order. Run edges come from one diff of the padded mask
+    instead of a per-frame Python loop.
+    """
+    edges = np.diff(np.concatenate(([0], still_mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1
+
+
+def _still_runs(still_mask, min_len):
+    """(start, end) inclusive index pairs of the runs of True in still_mask
+    lasting at least min_len frames, in order.
+    """
+    starts, ends = _still_run_bounds(still_mask)
+    keep = (ends - starts + 1) >= min_len
+    return list(zip(starts[keep].tolist(), ends[keep].tolist()))
+
+
 # ─── Default algorithm parameters ───
 
 DEFAULT_PARAMS = {
@@ -76,30 +115,62 @@ DEFAULT_PARAMS = {
 
 # ─── Signal extraction ───
 
-def extract_hand_signal(frames, landmark_name, min_visibility=0.4):
+def pack_landmarks(frames, names):
     """
-    Extract Y-position and visibility arrays for a landmark across all frames.
+    Pack Y-position and visibility of the named landmarks in one pass over
+    the frames.
+
+    Returns:
+        (arr, cols): arr is an (n_frames, len(names), 2) float array of
+        (y, visibility); cols maps landmark name -> column index.
+        Frames with no detection, or without that landmark, get NaN for both.
+    """
+    cols = {name: i for i, name in enumerate(names)}
+    arr = np.full((len(frames), len(names), 2), np.nan)
+    for i, f in enumerate(frames):
+        if not f["detected"]:
+            continue
+        lms = f["landmarks"]
+        for name, col in cols.items():
+            lm = lms.get(name)
+            if lm is not None:
+                arr[i, col] = (lm["y"], lm["visibility"])
+    return arr, cols
+
+
+def extract_hand_signal(arr, cols, landmark_name, min_visibility=0.4):
+    """
+    Extract Y-position and visibility arrays for a landmark across all frames
+    from the packed array built by pack_landmarks.
 
     Frames with visibility below min_visibility are treated as undetected
     (y=NaN) to prevent low-confidence tracking artifacts from corrupting
     the signal — especially common at video start/end and during fast motion.
 
     Returns:
-        (y_array, visibility_array): 1D numpy arrays of length len(frames).
+        (y_array, visibility_array): 1D numpy arrays of length n_frames.
         Frames with no detection or low visibility get y=NaN and visibility=0.
     """
-    n = len(frames)
-    y_arr = np.full(n, np.nan)
-    vis_arr = np.zeros(n)
+    y, vis = arr[:, cols[landmark_name], 0], arr[:, cols[landmark_name], 1]
+    # NaN visibility (not detected) compares False, so it is dropped too
+    keep = vis >= min_visibility
+    return np.where(keep, y, np.nan), np.where(keep, vis, 0.0)
 
-    for i, f in enumerate(frames):
-        if f["detected"] and landmark_name in f["landmarks"]:
-            lm = f["landmarks"][landmark_name]
-            if lm["visibility"] >= min_visibility:
-                y_arr[i] = lm["y"]
-                vis_arr[i] = lm["visibility"]
 
-    return y_arr, vis_arr
+@lru_cache(maxsize=None)
+def _box_kernel(window):
+    """Uniform moving-average kernel, built once per window size (read-only)."""
+    kernel = np.ones(window) / window
+    kernel.setflags(write=False)
+    return kernel
+
+
+def _edge_pad(x, pad):
+    """Equivalent to np.pad(x, pad, mode="edge") for 1D x, built with a
+    single concatenate (np.pad's generic machinery costs more than the
+    smoothing convolution itself on typical clip lengths).
+    """
+    return np.concatenate((np.full(pad, x[0]), x, np.full(pad, x[-1])))
 
 
 def smooth_signal(signal, window=5):
@@ -112,19 +183,18 @@ def smooth_signal(signal, window=5):
     if nan_mask.all():
         return signal.copy()
 
-    # Interpolate NaN gaps
+    # Interpolate NaN gaps (_edge_pad below copies, so no copy is needed here)
     if nan_mask.any():
         indices = np.arange(len(signal))
         valid = ~nan_mask
         signal_interp = np.interp(indices, indices[valid], signal[valid])
     else:
-        signal_interp = signal.copy()
+        signal_interp = signal
 
     # Pad edges with reflected values to avoid boundary artifacts
     pad = window // 2
-    padded = np.pad(signal_interp, pad, mode="edge")
-    kernel = np.ones(window) / window
-    smoothed = np.convolve(padded, kernel, mode="same")
+    padded = _edge_pad(signal_interp, pad)
+    smoothed = np.convolve(padded, _box_kernel(window), mode="same")
     # Remove padding
     return smoothed[pad:pad + len(signal)]
 
@@ -135,26 +205,24 @@ def compute_velocity(signal, window=10):
     Returns array of same length as signal (first element is 0).
     """
     frame_diff = np.abs(np.diff(signal))
-    kernel = np.ones(window) / window
-    rolling_vel = np.convolve(frame_diff, kernel, mode="same")
+    rolling_vel = np.convolve(frame_diff, _box_kernel(window), mode="same")
     return np.concatenate([[0.0], rolling_vel])
 
 
-def select_primary_landmark(frames, params):
+def select_primary_landmark(arr, cols, params):
     """
-    Choose the best landmark for phase detection based on average visibility.
-    Returns the landmark name string.
+    Choose the best landmark for phase detection based on average visibility
+    (over frames where it was detected), using the packed array built by
+    pack_landmarks. Returns the landmark name string.
     """
     primary = params["primary_hand"]
     fallback = params["fallback_hand"]
     min_vis = params["min_visibility"]
 
     def avg_vis(name):
-        visibilities = []
-        for f in frames:
-            if f["detected"] and name in f["landmarks"]:
-                visibilities.append(f["landmarks"][name]["visibility"])
-        return np.mean(visibilities) if visibilities else 0.0
+        vis = arr[:, cols[name], 1]
+        visibilities = vis[~np.isnan(vis)]
+        return visibilities.mean() if len(visibilities) else 0.0
 
     primary_vis = avg_vis(primary)
     fallback_vis = avg_vis(fallback)
@@ -174,7 +242,17 @@ def select_primary_landmark(frames, params):
 
 # ─── Phase detection functions ───
 
-def _has_preceding_address(local_min_idx, velocity, y_smooth, rough_address_y, fps, params):
+def _address_still_runs(velocity, params):
+    """
+    Runs of frames below the relaxed still threshold (3x still_threshold)
+    used by _has_preceding_address, as (starts, ends) index arrays over the
+    whole video. Computed once and windowed per candidate, rather than
+    re-scanning the velocity before every candidate top.
+    """
+    return _still_run_bounds(velocity < params["still_threshold"] * 3)
+
+
+def _has_preceding_address(local_min_idx, still_runs, y_smooth, rough_address_y, fps, params):
     """
     Check whether there's a still period (address) with hands low within
     5 seconds before a candidate top-of-backswing frame.
@@ -184,41 +262,28 @@ def _has_preceding_address(local_min_idx, velocity, y_smooth, rough_address_y, f
     Y minima (follow-through peak, walking away) are NOT preceded by a
     still period — they're preceded by active swing motion.
 
-    Uses a relaxed velocity threshold (3x the still_threshold) to account
-    for tracking noise during the address, and a shorter minimum still
-    duration (3 frames) since the velocity window smoothing can shorten
-    apparent still periods.
+    Uses a relaxed velocity threshold (3x the still_threshold, see
+    _address_still_runs) to account for tracking noise during the address,
+    and a shorter minimum still duration (3 frames) since the velocity
+    window smoothing can shorten apparent still periods.
 
     Returns True if a qualifying still period is found before local_min_idx.
     """
-    still_thresh = params["still_threshold"] * 3  # relaxed threshold for address detection
     min_still = max(3, int(fps * 0.5))  # at least 0.5s of stillness (address is 1-3s)
     search_start = max(0, local_min_idx - int(fps * 5))
-
-    # Search for any still run in the window before this candidate
-    vel_region = velocity[search_start:local_min_idx]
-    run_start = None
-    for i in range(len(vel_region)):
-        if vel_region[i] < still_thresh:
-            if run_start is None:
-                run_start = i
-        else:
-            if run_start is not None and (i - run_start) >= min_still:
-                # Found a still run — check that hands were LOW (high Y)
-                abs_start = search_start + run_start
-                abs_end = search_start + i - 1
-                avg_y = float(np.mean(y_smooth[abs_start:abs_end + 1]))
-                # Hands should be in the lower 60% of Y range (near ball)
-                if avg_y > rough_address_y * 0.5:
-                    return True
-            run_start = None
-
-    # Check if a still run extends to end of region
-    if run_start is not None and (len(vel_region) - run_start) >= min_still:
-        abs_start = search_start + run_start
-        abs_end = search_start + len(vel_region) - 1
-        avg_y = float(np.mean(y_smooth[abs_start:abs_end + 1]))
-        if avg_y > rough_address_y * 0.5:
+    # Hands should be in the lower 60% of Y range (near ball)
+    low_hands_y = rough_address_y * 0.5
+
+    # Still runs overlapping the window before this candidate, clipped to it
+    starts, ends = still_runs
+    lo = np.searchsorted(ends, search_start)
+    hi = np.searchsorted(starts, local_min_idx)
+    run_starts = np.maximum(starts[lo:hi], search_start).tolist()
+    run_ends = np.minimum(ends[lo:hi], local_min_idx - 1).tolist()
+    for run_start, run_end in zip(run_starts, run_ends):
+        # Found a still run — check that hands were LOW (high Y)
+        if (run_end - run_start + 1 >= min_still and
+                np.mean(y_smooth[run_start:run_end + 1]) > low_hands_y):
             return True
 
     return False
@@ -250,13 +315,21 @@ def find_top_of_backswing(y_smooth, velocity, rough_address_y, fps, params,
     """
     n = len(y_smooth)
     prominence = params["top_prominence_threshold"]
+    still_thresh = params["still_threshold"]
+    smoothing_window = params["smoothing_window"]
+    val_frames = params["downswing_validation_frames"]
+    # Frame spans used inside the per-frame and per-candidate loops below
+    peak_gap = int(fps * 0.5)    # velocity peaks closer than this are merged
+    backtrack = int(fps * 3)     # how far before a peak to look for the top
+    v_return = int(fps * 1.5)    # hands must return toward address within this
+    address_runs = _address_still_runs(velocity, params)
 
     # Compute directional velocity (positive = Y increasing = hands going down)
     y_diff = np.diff(y_smooth)
 
     # Weight by visibility if available — low-visibility frames are unreliable
     if visibility is not None:
-        vis_smooth = smooth_signal(visibility, params["smoothing_window"])
+        vis_smooth = smooth_signal(visibility, smoothing_window)
         # Frames with visibility below 0.6 are likely tracking artifacts
         vis_weight = np.clip(vis_smooth[:-1], 0.3, 1.0)
         weighted_diff = y_diff * vis_weight
@@ -264,10 +337,9 @@ def find_top_of_backswing(y_smooth, velocity, rough_address_y, fps, params,
         weighted_diff = y_diff
 
     # Apply rolling average to directional velocity for robustness
-    dir_vel_window = max(3, params["smoothing_window"])
-    padded = np.pad(weighted_diff, dir_vel_window // 2, mode="edge")
-    kernel = np.ones(dir_vel_window) / dir_vel_window
-    dir_vel_smooth = np.convolve(padded, kernel, mode="same")
+    dir_vel_window = max(3, smoothing_window)
+    padded = _edge_pad(weighted_diff, dir_vel_window // 2)
+    dir_vel_smooth = np.convolve(padded, _box_kernel(dir_vel_window), mode="same")
     dir_vel_smooth = dir_vel_smooth[dir_vel_window//2:dir_vel_window//2+len(weighted_diff)]
 
     diag = {}
@@ -282,27 +354,36 @@ def find_top_of_backswing(y_smooth, velocity, rough_address_y, fps, params,
     diag["peak_downswing_frame"] = global_peak
     diag["peak_downswing_vel"] = global_peak_vel
 
-    if global_peak_vel > params["still_threshold"] * 5:
+    if global_peak_vel > still_thresh * 5:
         # Find all velocity peaks above 40% of the global max
         peak_threshold = global_peak_vel * 0.4
+        # Candidate peaks (>= both neighbours and above threshold, frames
+        # 2..len-3) from shifted-slice comparisons
+        m = len(dir_vel_smooth)
+        candidates = []
+        if m > 4:
+            core = dir_vel_smooth[2:m - 2]
+            is_peak = ((core >= dir_vel_smooth[1:m - 3]) &
+                       (core >= dir_vel_smooth[3:m - 1]) &
+                       (core > peak_threshold))
+            candidates = (np.flatnonzero(is_peak) + 2).tolist()
+        dvs = dir_vel_smooth.tolist()
         vel_peaks = []
-        for i in range(2, len(dir_vel_smooth) - 2):
-            if (dir_vel_smooth[i] >= dir_vel_smooth[i - 1] and
-                    dir_vel_smooth[i] >= dir_vel_smooth[i + 1] and
-                    dir_vel_smooth[i] > peak_threshold):
-                # Avoid duplicates within 0.5s of each other (keep the stronger one)
-                if vel_peaks and (i - vel_peaks[-1]) < int(fps * 0.5):
-                    if dir_vel_smooth[i] > dir_vel_smooth[vel_peaks[-1]]:
-                        vel_peaks[-1] = i
-                else:
-                    vel_peaks.append(i)
+        for i in candidates:
+            # Avoid duplicates within 0.5s of each other (keep the stronger one)
+            if vel_peaks and (i - vel_peaks[-1]) < peak_gap:
+                if dvs[i] > dvs[vel_peaks[-1]]:
+                    vel_peaks[-1] = i
+            else:
+                vel_peaks.append(i)
 
         diag["velocity_peaks"] = vel_peaks
 
         # Try each velocity peak in chronological order (earliest first).
         # The first valid backswing→impact "V" shape wins.
-        for peak_frame in sorted(vel_peaks):
-            search_start = max(0, peak_frame - int(fps * 3))
+        # vel_peaks is built in ascending frame order, so no sort is needed.
+        for peak_frame in vel_peaks:
+            search_start = max(0, peak_frame - backtrack)
             search_region = y_smooth[search_start:peak_frame + 1]
 
             if len(search_region) <= 2:
@@ -317,7 +398,7 @@ def find_top_of_backswing(y_smooth, velocity, rough_address_y, fps, params,
             # Validate "V" shape: after the top, Y must return to within 60%
             # of address level within 1.5s. This distinguishes the real
             # backswing→impact from follow-through→walking-away.
-            validation_end = min(local_min_idx + int(fps * 1.5), n)
+            validation_end = min(local_min_idx + v_return, n)
             post_top_y = y_smooth[local_min_idx:validation_end]
             if len(post_top_y) > 0:
                 max_return_y = float(np.nanmax(post_top_y))
@@ -337,7 +418,7 @@ def find_top_of_backswing(y_smooth, velocity, rough_address_y, fps, params,
             # Validate preceding address: there must be a still period with
             # hands low within 5s before this candidate. Post-swing Y dips
             # (follow-through, walking away) have no preceding address.
-            if not _has_preceding_address(local_min_idx, velocity, y_smooth,
+            if not _has_preceding_address(local_min_idx, address_runs, y_smooth,
                                           rough_address_y, fps, params):
                 diag.setdefault("rejected_peaks", []).append({
                     "frame": peak_frame,
@@ -353,41 +434,37 @@ def find_top_of_backswing(y_smooth, velocity, rough_address_y, fps, params,
             return local_min_idx, diag
 
     # Strategy 2: Fallback — prominence-based with velocity and V-shape validation
-    minima = []
-    for i in range(2, n - 2):
-        if (y_smooth[i] <= y_smooth[i - 1] and y_smooth[i] <= y_smooth[i + 1] and
-                y_smooth[i] <= y_smooth[i - 2] and y_smooth[i] <= y_smooth[i + 2]):
-            minima.append(i)
+    minima = _local_minima(y_smooth, reach=2)
 
-    qualified = [m for m in minima if (rough_address_y - y_smooth[m]) > prominence]
+    # Prominence filter over all minima at once; plain ints for diagnostics
+    qualified = minima[(rough_address_y - y_smooth[minima]) > prominence].tolist()
     diag["all_minima_count"] = len(minima)
     diag["qualified_count"] = len(qualified)
 
-    val_frames = params["downswing_validation_frames"]
-    validated = []
-    for candidate in qualified:
+    # Prefer the FIRST valid minimum (chronologically), not the deepest.
+    # The follow-through often has lower Y (hands higher) than the backswing,
+    # so stop at the first candidate that passes every check.
+    vel_thresh = still_thresh * 3
+    for checked, candidate in enumerate(qualified, start=1):
         window_end = min(candidate + val_frames, n)
         post_vel = velocity[candidate:window_end]
-        if len(post_vel) > 0 and np.max(post_vel) > params["still_threshold"] * 3:
-            # Also validate V-shape: hands must return toward address level
-            v_end = min(candidate + int(fps * 1.5), n)
-            post_y = y_smooth[candidate:v_end]
-            max_return = float(np.nanmax(post_y)) if len(post_y) > 0 else 0
-            return_ratio = max_return / rough_address_y if rough_address_y > 0 else 0
-            if return_ratio >= 0.6:
-                # Must have a preceding address (still period with hands low)
-                if _has_preceding_address(candidate, velocity, y_smooth,
-                                          rough_address_y, fps, params):
-                    validated.append(candidate)
-
-    if validated:
-        # Prefer the FIRST valid minimum (chronologically), not the deepest.
-        # The follow-through often has lower Y (hands higher) than the backswing.
-        best = validated[0]
-        diag["chosen"] = best
+        if not (len(post_vel) > 0 and np.max(post_vel) > vel_thresh):
+            continue
+        # Also validate V-shape: hands must return toward address level
+        v_end = min(candidate + v_return, n)
+        post_y = y_smooth[candidate:v_end]
+        max_return = float(np.nanmax(post_y)) if len(post_y) > 0 else 0
+        return_ratio = max_return / rough_address_y if rough_address_y > 0 else 0
+        if not return_ratio >= 0.6:
+            continue
+        # Must have a preceding address (still period with hands low)
+        if not _has_preceding_address(candidate, address_runs, y_smooth,
+                                      rough_address_y, fps, params):
+            continue
+        diag["chosen"] = candidate
         diag["method"] = "prominence_fallback"
-        diag["candidates_count"] = len(validated)
-        return best, diag
+        diag["candidates_checked"] = checked
+        return candidate, diag
 
     if qualified:
         # Without V-shape validation, still prefer chronologically first
@@ -421,18 +498,7 @@ def find_address(y_smooth, velocity, top_frame, params):
     still_mask = search_region < still_thresh
 
     # Find contiguous runs of still frames
-    runs = []
-    run_start = None
-    for i in range(len(still_mask)):
-        if still_mask[i] and run_start is None:
-            run_start = i
-        elif not still_mask[i] and run_start is not None:
-            if (i - run_start) >= min_dur:
-                runs.append((run_start, i - 1))
-            run_start = None
-    # Handle run that extends to end of search region
-    if run_start is not None and (len(still_mask) - run_start) >= min_dur:
-        runs.append((run_start, len(still_mask) - 1))
+    runs = _still_runs(still_mask, min_dur)
 
     diag = {"total_still_runs": len(runs)}
 
@@ -446,14 +512,15 @@ def find_address(y_smooth, velocity, top_frame, params):
     # The top of backswing has low Y (hands high), so we want runs where
     # the average Y is closer to the max Y (hands low) than to the min Y (hands high).
     top_y = y_smooth[top_frame]
-    max_y = float(np.nanmax(y_smooth[:top_frame]))
+    # y_smooth is NaN-free (smooth_signal interpolates gaps), so plain max
+    max_y = float(y_smooth[:top_frame].max())
     y_midpoint = (top_y + max_y) / 2  # midpoint between highest and lowest hand positions
 
-    hands_low_runs = []
-    for run_start_f, run_end_f in runs:
-        avg_y = float(np.mean(y_smooth[run_start_f:run_end_f + 1]))
-        if avg_y > y_midpoint:  # hands are in the lower half (near ball)
-            hands_low_runs.append((run_start_f, run_end_f))
+    # Average Y of each run, computed once for both the hands-low filter
+    # and the fallback below
+    run_means = np.array([np.mean(y_smooth[start:end + 1]) for start, end in runs])
+    # Hands are in the lower half (near ball)
+    hands_low_runs = [runs[i] for i in np.flatnonzero(run_means > y_midpoint)]
 
     diag["hands_low_runs"] = len(hands_low_runs)
 
@@ -470,7 +537,7 @@ def find_address(y_smooth, velocity, top_frame, params):
         return address_frame, diag
 
     # Fallback: use the last run with the highest average Y (hands lowest)
-    best_run = max(runs, key=lambda r: np.mean(y_smooth[r[0]:r[1] + 1]))
+    best_run = runs[int(np.argmax(run_means))]
     run_slice = y_smooth[best_run[0]:best_run[1] + 1]
     address_frame = best_run[0] + _argmax_hysteresis(run_slice)
     diag["fallback"] = True
@@ -507,8 +574,7 @@ def find_impact(y_smooth, velocity, top_frame, address_y, fps, params):
         dir_vel = np.diff(search_region)
         # Smooth directional velocity
         if len(dir_vel) > 3:
-            kernel = np.ones(3) / 3
-            dir_vel_smooth = np.convolve(dir_vel, kernel, mode="same")
+            dir_vel_smooth = np.convolve(dir_vel, _box_kernel(3), mode="same")
         else:
             dir_vel_smooth = dir_vel
 
@@ -520,28 +586,28 @@ def find_impact(y_smooth, velocity, top_frame, address_y, fps, params):
             # Impact is where velocity drops back to near-zero after the peak
             # Search from peak forward for velocity settling
             settle_threshold = peak_vel * 0.15  # velocity drops to 15% of peak
-            for i in range(peak_idx + 1, len(dir_vel_smooth)):
-                if dir_vel_smooth[i] < settle_threshold:
-                    # Refine: the velocity settle point can be slightly
-                    # early. Look in a small window after it for the frame
-                    # closest to address Y level (the actual ball-strike).
-                    settle_idx = i
-                    refine_end = min(settle_idx + 5, len(search_region))
-                    refine_region = search_region[settle_idx:refine_end]
-                    if len(refine_region) > 0:
-                        best_offset = _argmin_hysteresis(
-                            np.abs(refine_region - address_y)
-                        )
-                        impact_frame = top_frame + settle_idx + best_offset
-                    else:
-                        impact_frame = top_frame + settle_idx
-                    diag = {
-                        "search_range": (top_frame, search_end),
-                        "impact_frame": impact_frame,
-                        "peak_downswing_vel": float(peak_vel),
-                        "method": "velocity_settle",
-                    }
-                    return impact_frame, diag
+            settled = dir_vel_smooth[peak_idx + 1:] < settle_threshold
+            if settled.any():
+                # Refine: the velocity settle point can be slightly
+                # early. Look in a small window after it for the frame
+                # closest to address Y level (the actual ball-strike).
+                settle_idx = peak_idx + 1 + int(np.argmax(settled))
+                refine_end = min(settle_idx + 5, len(search_region))
+                refine_region = search_region[settle_idx:refine_end]
+                if len(refine_region) > 0:
+                    best_offset = _argmin_hysteresis(
+                        np.abs(refine_region - address_y)
+                    )
+                    impact_frame = top_frame + settle_idx + best_offset
+                else:
+                    impact_frame = top_frame + settle_idx
+                diag = {
+                    "search_range": (top_frame, search_end),
+                    "impact_frame": impact_frame,
+                    "peak_downswing_vel": float(peak_vel),
+                    "method": "velocity_settle",
+                }
+                return impact_frame, diag
 
             # If velocity never fully settles, use the point of max deceleration
             # (largest drop in velocity after peak)
@@ -558,10 +624,12 @@ def find_impact(y_smooth, velocity, top_frame, address_y, fps, params):
 
     # Strategy 2: Y-crossing fallback
     threshold_y = address_y * 0.85
-    crossings = np.where(search_region >= threshold_y)[0]
+    crossed = search_region >= threshold_y
 
-    if len(crossings) > 0:
-        first_crossing = crossings[0]
+    if crossed.any():
+        # argmax on a bool mask gives the first True without building an
+        # index array of every crossing
+        first_crossing = int(np.argmax(crossed))
         refine_end = min(first_crossing + 5, len(search_region))
         refine_region = search_region[first_crossing:refine_end]
         refine_dist = np.abs(refine_region - address_y)
@@ -625,15 +693,11 @@ def find_follow_through(y_smooth, velocity, impact_frame, top_frame, fps, params
     # The follow-through finish has hands at their highest point (lowest Y).
     # This is more robust than velocity-settle with IMAGE mode noise,
     # where frame-to-frame jitter prevents clean velocity settling.
-    minima = []
-    for i in range(2, len(search_region) - 2):
-        if (search_region[i] <= search_region[i - 1] and
-                search_region[i] <= search_region[i + 1]):
-            minima.append(i)
+    minima = _local_minima_mask(search_region, reach=1)
 
-    if minima:
+    if minima.any():
         # Use the first local minimum (earliest finish position)
-        best = minima[0]
+        best = 2 + int(np.argmax(minima))
         ft_frame = search_start + best
         diag["chosen"] = ft_frame
         diag["method"] = "local_minimum"
@@ -642,28 +706,16 @@ def find_follow_through(y_smooth, velocity, impact_frame, top_frame, fps, params
     # Strategy 2: Find where velocity settles to near-zero after impact.
     still_thresh = params["still_threshold"]
     min_still = 3  # need at least 3 consecutive still frames
-    settle_start = None
+    settle_runs = _still_runs(vel_region < still_thresh, min_still)
 
-    for i in range(len(vel_region)):
-        if vel_region[i] < still_thresh:
-            if settle_start is None:
-                settle_start = i
-        else:
-            if settle_start is not None and (i - settle_start) >= min_still:
-                mid = settle_start + (i - settle_start) // 2
-                ft_frame = search_start + mid
-                diag["chosen"] = ft_frame
-                diag["method"] = "velocity_settle"
-                diag["settle_run"] = (search_start + settle_start, search_start + i - 1)
-                return ft_frame, diag
-            settle_start = None
-
-    if settle_start is not None and (len(vel_region) - settle_start) >= min_still:
-        mid = settle_start + (len(vel_region) - settle_start) // 2
+    if settle_runs:
+        # Use the middle of the first settled run
+        settle_start, settle_end = settle_runs[0]
+        mid = settle_start + (settle_end + 1 - settle_start) // 2
         ft_frame = search_start + mid
         diag["chosen"] = ft_frame
         diag["method"] = "velocity_settle"
-        diag["settle_run"] = (search_start + settle_start, search_start + len(vel_region) - 1)
+        diag["settle_run"] = (search_start + settle_start, search_start + settle_end)
         return ft_frame, diag
 
     # Last resort: global minimum in the search window
@@ -709,12 +761,15 @@ def detect_phases(landmarks_data, view="dtl", params=None):
     print(f"{'='*60}")
     print(f"  Frames: {total_frames}  |  FPS: {fps:.1f}  |  Duration: {total_frames/fps:.2f}s")
 
-    # Step 0: Select best landmark
-    landmark_name = select_primary_landmark(frames, effective_params)
+    # Step 0: Pack both candidate hands once, then select the best landmark
+    hand_arr, hand_cols = pack_landmarks(
+        frames, [effective_params["primary_hand"], effective_params["fallback_hand"]]
+    )
+    landmark_name = select_primary_landmark(hand_arr, hand_cols, effective_params)
     print(f"  Tracking: {landmark_name}")
 
     # Step 1: Extract and smooth signal
-    y_raw, visibility = extract_hand_signal(frames, landmark_name)
+    y_raw, visibility = extract_hand_signal(hand_arr, hand_cols, landmark_name)
     y_smooth = smooth_signal(y_raw, effective_params["smoothing_window"])
     velocity = compute_velocity(y_smooth, effective_params["velocity_window"])
 
@@ -740,12 +795,14 @@ def detect_phases(landmarks_data, view="dtl", params=None):
     # Step 2: Rough address Y estimate (max Y where hands are low)
     # Use the global max of valid (non-NaN) smoothed Y values.
     # This is the position where hands are lowest (near ball level).
-    valid_y = y_smooth[~np.isnan(y_smooth)]
-    if len(valid_y) == 0:
+    # smooth_signal interpolates through NaN gaps, so y_smooth is either
+    # NaN-free or entirely NaN (no usable landmark data at all); a plain max
+    # then needs no NaN-aware pass
+    if len(y_smooth) == 0 or np.isnan(y_smooth[0]):
         print("  ERROR: No valid landmark data found.")
         print("  Check that the video shows the golfer clearly.")
         sys.exit(1)
-    rough_address_y = float(np.nanmax(valid_y))
+    rough_address_y = float(y_smooth.max())
 
     # Step 3: Find top of backswing (the anchor)
     top_frame, top_diag = find_top_of_backswing(
@@ -840,6 +897,10 @@ def detect_phases(landmarks_data, view="dtl", params=None):
 # ─── CLI ───
 
 def main():
+    # Shared JSON I/O (orjson when installed); only the CLI needs it, so the
+    # detector itself stays importable on its own
+    from calculate_angles import load_landmarks, write_json
+
     parser = argparse.ArgumentParser(
         description="Auto-detect golf swing phases from landmark data"
     )
@@ -856,8 +917,7 @@ def main():
         print(f"ERROR: File not found: {args.landmarks_json}")
         sys.exit(1)
 
-    with open(args.landmarks_json) as f:
-        landmarks_data = json.load(f)
+    landmarks_data = load_landmarks(args.landmarks_json)
 
     # Build param overrides from CLI args
     param_overrides = {}
@@ -890,8 +950,7 @@ def main():
         },
     }
 
-    with open(output_path, "w") as f:
-        json.dump(output_data, f, indent=2)
+    write_json(output_path, output_data)
 
     print(f"\n  Phases saved to: {output_path}")
     print(f"{'='*60}\n")
@@ -4,17 +4,24 @@ Phase 0: Extract MediaPipe Pose landmarks from Tiger Woods swing videos.
 Uses the MediaPipe Tasks API (PoseLandmarker) to process each frame.
 Outputs:
   - Raw landmark data as JSON (coordinates + visibility per frame)
-  - Annotated frames as images for visual inspection
+  - Annotated frames as images for visual inspection (with --save-frames)
   - Summary stats (detection rate, avg confidence)
 """
 
 import cv2
 import mediapipe as mp
-import json
+import io
 import os
+import queue
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
 import numpy as np
 
+from calculate_angles import write_json
+
 # MediaPipe Tasks API imports
 PoseLandmarker = mp.tasks.vision.PoseLandmarker
 PoseLandmarkerOptions = mp.tasks.vision.PoseLandmarkerOptions
@@ -34,6 +41,13 @@ LANDMARK_NAMES = [
     "left_foot_index", "right_foot_index"
 ]
 
+# Frames buffered between the decode, inference and JPEG-writing threads
+PIPELINE_DEPTH = 8
+
+# Annotated frames are only for eyeballing, so trade a little JPEG quality
+# for faster encodes and smaller files
+JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 80]
+
 # Key body landmarks for golf swing analysis
 GOLF_LANDMARKS = {
     "left_shoulder": 11, "right_shoulder": 12,
@@ -43,6 +57,8 @@ GOLF_LANDMARKS = {
     "left_knee": 25, "right_knee": 26,
     "left_ankle": 27, "right_ankle": 28,
 }
+GOLF_INDICES = list(GOLF_LANDMARKS.values())
+GOLF_INDEX_SET = frozenset(GOLF_INDICES)
 
 # Pose connections for drawing skeleton
 POSE_CONNECTIONS = [
@@ -53,36 +69,118 @@ POSE_CONNECTIONS = [
     (16, 18), (16, 20), (16, 22),  # Right hand
     (27, 29), (27, 31), (28, 30), (28, 32),  # Feet
 ]
+CONNECTION_INDICES = np.asarray(POSE_CONNECTIONS)
 
 
 def draw_landmarks_on_frame(frame, landmarks, width, height):
     """Draw pose skeleton on a frame using landmark data."""
     annotated = frame.copy()
 
-    # Draw connections
-    for start_idx, end_idx in POSE_CONNECTIONS:
-        start = landmarks[start_idx]
-        end = landmarks[end_idx]
-        if start.visibility > 0.3 and end.visibility > 0.3:
-            pt1 = (int(start.x * width), int(start.y * height))
-            pt2 = (int(end.x * width), int(end.y * height))
-            cv2.line(annotated, pt1, pt2, (0, 255, 0), 2)
+    coords = np.array([(lm.x, lm.y, lm.visibility) for lm in landmarks])
+    points = (coords[:, :2] * (width, height)).astype(np.int32)
+    visible = coords[:, 2] > 0.3
+
+    # Draw connections with both ends visible in one call
+    keep = visible[CONNECTION_INDICES[:, 0]] & visible[CONNECTION_INDICES[:, 1]]
+    if keep.any():
+        cv2.polylines(annotated, points[CONNECTION_INDICES[keep]], False, (0, 255, 0), 2)
 
     # Draw landmark points
-    for i, lm in enumerate(landmarks):
-        if lm.visibility > 0.3:
-            px = int(lm.x * width)
-            py = int(lm.y * height)
-            color = (0, 0, 255) if i in GOLF_LANDMARKS.values() else (0, 255, 0)
-            cv2.circle(annotated, (px, py), 4, color, -1)
+    for i in np.flatnonzero(visible).tolist():
+        color = (0, 0, 255) if i in GOLF_INDEX_SET else (0, 255, 0)
+        cv2.circle(annotated, tuple(points[i].tolist()), 4, color, -1)
 
     return annotated
 
 
-def process_video(video_path, output_dir, label, model_path):
-    """Process a single video and extract landmarks from every frame."""
+def annotate_frame(frame, landmarks, frame_idx, timestamp_sec, width, height):
+    """Draw the skeleton and overlays for one frame (landmarks may be None)."""
+    if landmarks is None:
+        annotated = frame.copy()
+        cv2.putText(
+            annotated, f"Frame {frame_idx} - NO DETECTION",
+            (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2
+        )
+        return annotated
+
+    # Draw pose on frame
+    annotated = draw_landmarks_on_frame(frame, landmarks, width, height)
+
+    # Add frame number overlay
+    cv2.putText(
+        annotated, f"Frame {frame_idx} | t={timestamp_sec:.3f}s",
+        (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2
+    )
+
+    # Add visibility scores for key golf landmarks
+    y_offset = 55
+    for name, lm_idx in GOLF_LANDMARKS.items():
+        vis = landmarks[lm_idx].visibility
+        color = (0, 255, 0) if vis > 0.7 else (0, 165, 255) if vis > 0.4 else (0, 0, 255)
+        cv2.putText(
+            annotated, f"{name}: {vis:.2f}",
+            (10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.35, color, 1
+        )
+        y_offset += 15
+    return annotated
+
 
-    cap = cv2.VideoCapture(video_path)
+def create_landmarker(model_path, device="cpu"):
+    """Create a VIDEO-mode PoseLandmarker on the requested delegate.
+
+    device is "cpu", "gpu" or "auto"; "auto" asks for the GPU and falls
+    back to the CPU if the delegate can't start (e.g. a wheel built
+    without GPU support, or no OpenGL context).
+    """
+    def build(delegate):
+        options = PoseLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=model_path, delegate=delegate),
+            running_mode=RunningMode.VIDEO,
+            num_poses=1,
+            min_pose_detection_confidence=0.5,
+            min_pose_presence_confidence=0.5,
+            min_tracking_confidence=0.5,
+        )
+        return PoseLandmarker.create_from_options(options)
+
+    if device == "cpu":
+        return build(BaseOptions.Delegate.CPU)
+    try:
+        return build(BaseOptions.Delegate.GPU)
+    except Exception as e:
+        if device == "gpu":
+            raise
+        print(f"  WARNING: GPU delegate unavailable ({e}), falling back to CPU")
+        return build(BaseOptions.Delegate.CPU)
+
+
+def process_video(video_path, output_dir, label, model_path,
+                  save_frames=False, save_every=1, pretty=False,
+                  inference_width=0, device="cpu", hw_decode=False):
+    """Process a single video and extract landmarks from every frame.
+
+    Annotated frames are only drawn and written when save_frames is set,
+    and then only for every save_every-th frame. The landmarks JSON is
+    written compact unless pretty is set. A positive inference_width
+    downscales wider frames before pose detection; landmarks are
+    normalized, so the output keeps the original pixel scale. device
+    selects the MediaPipe delegate (see create_landmarker). hw_decode lets
+    FFmpeg decode on the GPU; its color conversion can shift pixels, and so
+    landmarks, so it is off by default.
+    """
+
+    cap = None
+    if hw_decode:
+        # Let FFmpeg use a hardware decoder when the build/driver offers
+        # one; it silently falls back to software decoding otherwise.
+        # Builds without the FFmpeg backend get the default capture.
+        cap = cv2.VideoCapture(
+            video_path,
+            cv2.CAP_FFMPEG,
+            [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+        )
+    if cap is None or not cap.isOpened():
+        cap = cv2.VideoCapture(video_path)
     if not cap.isOpened():
         print(f"ERROR: Cannot open video: {video_path}")
         sys.exit(1)
@@ -99,107 +197,214 @@ def process_video(video_path, output_dir, label, model_path):
     print(f"  FPS: {fps:.2f}")
     print(f"  Total frames: {total_frames}")
     print(f"  Duration: {total_frames/fps:.2f}s")
+    hw_accel = int(cap.get(cv2.CAP_PROP_HW_ACCELERATION))
+    if hw_accel:
+        print(f"  Hardware decode: enabled (type {hw_accel})")
+
+    # Downscale only what MediaPipe sees; annotated frames stay full size
+    do_downscale = 0 < inference_width < width
+    if do_downscale:
+        inf_size = (inference_width, max(int(height * inference_width / width), 1))
+        print(f"  Inference size: {inf_size[0]}x{inf_size[1]}")
     print(f"{'='*60}")
 
     frames_dir = os.path.join(output_dir, f"{label}_frames")
-    os.makedirs(frames_dir, exist_ok=True)
-
-    # Create PoseLandmarker for VIDEO mode
-    options = PoseLandmarkerOptions(
-        base_options=BaseOptions(model_asset_path=model_path),
-        running_mode=RunningMode.VIDEO,
-        num_poses=1,
-        min_pose_detection_confidence=0.5,
-        min_pose_presence_confidence=0.5,
-        min_tracking_confidence=0.5,
-    )
+    if save_frames:
+        os.makedirs(frames_dir, exist_ok=True)
+
+    # Struct-of-arrays results, one row per frame. Frame dicts are only
+    # materialised once the whole video has been processed.
+    # MediaPipe outputs float32, so float32 storage is lossless.
+    num_landmarks = len(LANDMARK_NAMES)
+    n_slots = max(total_frames, 1)
+    landmarks_arr = np.zeros((n_slots, num_landmarks, 4), dtype=np.float32)
+    detected_mask = np.zeros(n_slots, dtype=bool)
+
+    # Decoding and annotated-frame writing run on their own threads so the
+    # CPU reads the next frames and encodes JPEGs while MediaPipe works on
+    # the current one. Detection stays on this thread, in frame order, so
+    # VIDEO mode still sees monotonic timestamps. Bounded queues cap how
+    # far either side can run ahead.
+    frame_queue = queue.Queue(maxsize=PIPELINE_DEPTH)
+    write_queue = queue.Queue(maxsize=PIPELINE_DEPTH)
+    stop = threading.Event()
+    errors = []
+    done = object()
+
+    def enqueue(q, item):
+        # Give up if the pipeline has stopped, rather than block forever
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def decode_frames():
+        # Reused for every frame; mp.Image copies the pixels, so the buffers
+        # can be overwritten while earlier frames are still queued
+        inf_buf = None
+        rgb_buf = None
+        try:
+            while cap.isOpened() and not stop.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                inf_frame = frame
+                if do_downscale:
+                    if inf_buf is None:
+                        inf_buf = np.empty((inf_size[1], inf_size[0], 3), dtype=np.uint8)
+                    cv2.resize(
+                        frame, inf_size, dst=inf_buf,
+                        interpolation=cv2.INTER_AREA,  # antialiased
+                    )
+                    inf_frame = inf_buf
+                if rgb_buf is None or rgb_buf.shape != inf_frame.shape:
+                    # Always C-ordered: mp.Image copies the buffer as packed
+                    # rows, ignoring numpy strides
+                    rgb_buf = np.empty(inf_frame.shape, dtype=np.uint8)
+                # Convert BGR to RGB for MediaPipe
+                cv2.cvtColor(inf_frame, cv2.COLOR_BGR2RGB, dst=rgb_buf)
+                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_buf)
+                enqueue(frame_queue, (frame, mp_image))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            enqueue(frame_queue, done)
+
+    def write_frames():
+        while True:
+            item = write_queue.get()
+            if item is done:
+                break
+            if errors:
+                # Keep draining so the inference loop never blocks on a put
+                continue
+            frame_idx, timestamp_sec, frame, landmarks = item
+            try:
+                annotated = annotate_frame(
+                    frame, landmarks, frame_idx, timestamp_sec, width, height
+                )
+                cv2.imwrite(
+                    os.path.join(frames_dir, f"frame_{frame_idx:04d}.jpg"),
+                    annotated, JPEG_PARAMS,
+                )
+            except Exception as e:
+                errors.append(e)
 
-    all_landmarks = []
-    detected_count = 0
+    producer = threading.Thread(target=decode_frames, daemon=True)
+    writer = threading.Thread(target=write_frames, daemon=True)
 
-    with PoseLandmarker.create_from_options(options) as landmarker:
+    with create_landmarker(model_path, device) as landmarker:
+        producer.start()
+        if save_frames:
+            writer.start()
         frame_idx = 0
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            # Convert BGR to RGB for MediaPipe
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+        try:
+            while not errors:
+                item = frame_queue.get()
+                if item is done:
+                    break
+                frame, mp_image = item
+
+                # Timestamp in milliseconds
+                timestamp_ms = int(frame_idx * 1000 / fps)
+
+                results = landmarker.detect_for_video(mp_image, timestamp_ms)
+
+                if frame_idx >= n_slots:
+                    # CAP_PROP_FRAME_COUNT is an estimate; grow if short
+                    landmarks_arr = np.concatenate(
+                        [landmarks_arr, np.zeros_like(landmarks_arr)]
+                    )
+                    detected_mask = np.concatenate(
+                        [detected_mask, np.zeros_like(detected_mask)]
+                    )
+                    n_slots = len(detected_mask)
+
+                landmarks = None
+                if results.pose_landmarks and len(results.pose_landmarks) > 0:
+                    landmarks = results.pose_landmarks[0]  # First (only) person
+                    detected_mask[frame_idx] = True
+                    landmarks_arr[frame_idx] = np.fromiter(
+                        (
+                            v
+                            for lm in landmarks
+                            for v in (lm.x, lm.y, lm.z, lm.visibility)
+                        ),
+                        dtype=np.float32,
+                        count=num_landmarks * 4,
+                    ).reshape(num_landmarks, 4)
+
+                if save_frames and frame_idx % save_every == 0:
+                    enqueue(write_queue, (frame_idx, round(frame_idx / fps, 4), frame, landmarks))
+                frame_idx += 1
+        finally:
+            if save_frames:
+                enqueue(write_queue, done)
+                writer.join()
+            stop.set()
+            producer.join()
 
-            # Timestamp in milliseconds
-            timestamp_ms = int(frame_idx * 1000 / fps)
+    cap.release()
 
-            results = landmarker.detect_for_video(mp_image, timestamp_ms)
+    if errors:
+        raise errors[0]
 
-            frame_data = {
-                "frame": frame_idx,
-                "timestamp_sec": round(frame_idx / fps, 4),
-                "timestamp_ms": timestamp_ms,
-                "detected": False,
-                "landmarks": {}
-            }
+    landmarks_arr = landmarks_arr[:frame_idx]
+    detected_mask = detected_mask[:frame_idx]
+    detected_count = int(detected_mask.sum())
+    detection_rate = (detected_count / frame_idx * 100) if frame_idx > 0 else 0
 
-            if results.pose_landmarks and len(results.pose_landmarks) > 0:
-                detected_count += 1
-                frame_data["detected"] = True
-                landmarks = results.pose_landmarks[0]  # First (only) person
-
-                # Extract all 33 landmarks
-                for idx, lm in enumerate(landmarks):
-                    frame_data["landmarks"][LANDMARK_NAMES[idx]] = {
-                        "x": round(lm.x, 6),
-                        "y": round(lm.y, 6),
-                        "z": round(lm.z, 6),
-                        "visibility": round(lm.visibility, 4),
-                        "pixel_x": int(lm.x * width),
-                        "pixel_y": int(lm.y * height),
-                    }
-
-                # Draw pose on frame
-                annotated = draw_landmarks_on_frame(frame, landmarks, width, height)
-
-                # Add frame number overlay
-                cv2.putText(
-                    annotated, f"Frame {frame_idx} | t={frame_data['timestamp_sec']:.3f}s",
-                    (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2
-                )
+    # Materialise per-frame dicts. Rounding and pixel scaling run once over
+    # the whole array; values are widened to float64 before rounding so the
+    # JSON gets short decimals, not float32 noise.
+    wide_arr = landmarks_arr.astype(np.float64)
+    coords = np.round(wide_arr[:, :, :3], 6).tolist()
+    visibility_arr = np.round(wide_arr[:, :, 3], 4)
+    visibility = visibility_arr.tolist()
+    pixel_x = (wide_arr[:, :, 0] * width).astype(np.int64).tolist()
+    pixel_y = (wide_arr[:, :, 1] * height).astype(np.int64).tolist()
+    # Same arithmetic as the per-frame i * 1000 / fps and i / fps. Seconds
+    # keep Python's round(): np.round disagrees on exact ties, which NTSC
+    # rates such as 59.94 fps hit regularly.
+    frame_numbers = np.arange(frame_idx)
+    timestamps_ms = (frame_numbers * 1000 / fps).astype(np.int64).tolist()
+    timestamps_sec = [round(t, 4) for t in (frame_numbers / fps).tolist()]
 
-                # Add visibility scores for key golf landmarks
-                y_offset = 55
-                for name, lm_idx in GOLF_LANDMARKS.items():
-                    vis = landmarks[lm_idx].visibility
-                    color = (0, 255, 0) if vis > 0.7 else (0, 165, 255) if vis > 0.4 else (0, 0, 255)
-                    cv2.putText(
-                        annotated, f"{name}: {vis:.2f}",
-                        (10, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.35, color, 1
-                    )
-                    y_offset += 15
-            else:
-                annotated = frame.copy()
-                cv2.putText(
-                    annotated, f"Frame {frame_idx} - NO DETECTION",
-                    (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2
+    all_landmarks = []
+    for i, detected in enumerate(detected_mask.tolist()):
+        frame_data = {
+            "frame": i,
+            "timestamp_sec": timestamps_sec[i],
+            "timestamp_ms": timestamps_ms[i],
+            "detected": detected,
+            "landmarks": {},
+        }
+        if detected:
+            frame_data["landmarks"] = {
+                name: {
+                    "x": c[0],
+                    "y": c[1],
+                    "z": c[2],
+                    "visibility": vis,
+                    "pixel_x": px,
+                    "pixel_y": py,
+                }
+                for name, c, vis, px, py in zip(
+                    LANDMARK_NAMES, coords[i], visibility[i], pixel_x[i], pixel_y[i]
                 )
+            }
+        all_landmarks.append(frame_data)
 
-            cv2.imwrite(os.path.join(frames_dir, f"frame_{frame_idx:04d}.jpg"), annotated)
-            all_landmarks.append(frame_data)
-            frame_idx += 1
-
-    cap.release()
-
-    detection_rate = (detected_count / frame_idx * 100) if frame_idx > 0 else 0
-
-    # Compute average visibility for key golf landmarks
-    avg_visibility = {}
-    for name in GOLF_LANDMARKS:
-        visibilities = [
-            f["landmarks"][name]["visibility"]
-            for f in all_landmarks
-            if f["detected"] and name in f["landmarks"]
-        ]
-        avg_visibility[name] = round(np.mean(visibilities), 4) if visibilities else 0
+    # Average visibility for key golf landmarks over detected frames
+    if detected_count:
+        golf_vis = visibility_arr[detected_mask][:, GOLF_INDICES].mean(axis=0)
+        avg_visibility = {
+            name: round(float(v), 4) for name, v in zip(GOLF_LANDMARKS, golf_vis)
+        }
+    else:
+        avg_visibility = {name: 0 for name in GOLF_LANDMARKS}
 
     summary = {
         "video_file": os.path.basename(video_path),
@@ -225,16 +430,64 @@ def process_video(video_path, output_dir, label, model_path):
     }
 
     json_path = os.path.join(output_dir, f"{label}_landmarks.json")
-    with open(json_path, "w") as f:
-        json.dump(output, f, indent=2)
+    write_json(json_path, output, indent=pretty)
 
     print(f"\n  Landmarks saved to: {json_path}")
-    print(f"  Annotated frames saved to: {frames_dir}/")
+    if save_frames:
+        print(f"  Annotated frames saved to: {frames_dir}/")
 
     return output
 
 
+def _run_video(video_path, output_dir, label, model_path,
+               save_frames, save_every, pretty, inference_width, device,
+               hw_decode):
+    """
+    Extract one video's landmarks in a worker process. The printed report is
+    captured and returned as (summary, report) so concurrent videos don't
+    interleave; the frame data is already on disk, so it isn't sent back.
+    """
+    report = io.StringIO()
+    try:
+        with redirect_stdout(report):
+            output = process_video(
+                video_path, output_dir, label, model_path,
+                save_frames=save_frames, save_every=save_every, pretty=pretty,
+                inference_width=inference_width, device=device,
+                hw_decode=hw_decode,
+            )
+    except SystemExit:
+        # process_video exits on unreadable videos; keep its error message
+        print(report.getvalue(), end="")
+        raise
+    return output["summary"], report.getvalue()
+
+
 def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Extract MediaPipe pose landmarks from swing videos"
+    )
+    parser.add_argument("--save-frames", action="store_true",
+                        help="Write annotated frames as JPEGs for visual inspection")
+    parser.add_argument("--save-every", type=int, default=1,
+                        help="With --save-frames, only write every Nth frame (default: 1)")
+    parser.add_argument("--pretty", action="store_true",
+                        help="Indent the landmarks JSON for reading by hand")
+    parser.add_argument("--inference-width", type=int, default=0,
+                        help="Downscale wider frames to this width for pose "
+                             "detection (default: 0, full resolution)")
+    parser.add_argument("--device", choices=["cpu", "gpu", "auto"], default="cpu",
+                        help="MediaPipe delegate; auto tries the GPU and falls "
+                             "back to the CPU (default: cpu)")
+    parser.add_argument("--hw-decode", action="store_true",
+                        help="Decode video on the GPU when FFmpeg offers a "
+                             "hardware decoder (may change landmarks slightly)")
+    args = parser.parse_args()
+    if args.save_every < 1:
+        parser.error("--save-every must be at least 1")
+
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     output_dir = os.path.join(base_dir, "output")
     model_path = os.path.join(base_dir, "scripts", "pose_landmarker_heavy.task")
@@ -251,18 +504,36 @@ def main():
         "fo": "/Users/timraftis/Desktop/Tiger FO 2.mov",
     }
 
-    results = {}
+    video_paths = {}
     for label, path in videos.items():
         if not os.path.exists(path):
             print(f"WARNING: Video not found: {path}")
             continue
-        results[label] = process_video(path, output_dir, label, model_path)
+        video_paths[label] = path
+
+    # Each video gets its own process and PoseLandmarker; nothing is shared
+    summaries = {}
+    if video_paths:
+        with ProcessPoolExecutor(max_workers=len(video_paths)) as pool:
+            futures = {
+                label: pool.submit(
+                    _run_video, path, output_dir, label, model_path,
+                    args.save_frames, args.save_every, args.pretty,
+                    args.inference_width, args.device, args.hw_decode,
+                )
+                for label, path in video_paths.items()
+            }
+            outputs = {label: future.result() for label, future in futures.items()}
+
+        # Print each video's report in a fixed order once all are done
+        for label, (summary, report) in outputs.items():
+            print(report, end="")
+            summaries[label] = summary
 
     print(f"\n{'='*60}")
     print("EXTRACTION COMPLETE")
     print(f"{'='*60}")
-    for label, data in results.items():
-        s = data["summary"]
+    for label, s in summaries.items():
         print(f"  {label}: {s['detected_frames']}/{s['total_frames']} frames detected ({s['detection_rate_pct']}%)")
 
 